@@ -12,7 +12,9 @@ Other modules can then access new features via the `Main` instance.
 # Standard
 import os
 import sys
+import queue
 import ctypes
+import time
 import threading
 from typing import Optional
 
@@ -27,24 +29,39 @@ import nenotk as ntk
 from main.ui import interface
 from main.ui import listbox_logic
 from main.ui import interface_logic
-from main.utils import move_queue
-from main.utils import folder_watcher
+from main.ui.progress_driver import ProgressDriver
 from main.utils import duplicate_handler
-from main.utils import fast_discovery
+from main.utils import trash
+from main.utils import thumbnail_store
 from main.utils import settings_manager
 from main.utils import history_manager
 from main.utils import video_thumbnail
 from main.utils import tray_manager
+from main.utils import metrics
+from main.utils import move_queue
+from main.utils.funnel_engine import FunnelEngine, FunnelConfig
 
 
 #endregion
 #region - Main
 
 
-class Main:
+UI_POLL_MS = 15  # Poll interval while calls posted by the engine and workers keep arriving
+UI_IDLE_POLL_MS = 500  # Without a wake pipe (Windows), the poll backs off to this once idle
+EXIT_DRAIN_TIMEOUT_S = 30.0  # Longest exit waits for the last move-queue pass
+
+
+class Main(FunnelEngine):
     def __init__(self, root: tk.Tk):
         self.root = root
+        self._ui_calls: 'queue.SimpleQueue' = queue.SimpleQueue()  # Calls posted to Tk by other threads
+        self._ui_lock = threading.Lock()
+        self._ui_wake_pending = False  # A wakeup for the posted calls is already on its way
+        self._ui_wake_fd: Optional[int] = None
+        self._exiting = False
+        super().__init__(FunnelConfig(), name="gui")
         self.initialize_app_variables()
+        self._open_ui_wakeup()
 
 
 
@@ -58,7 +75,6 @@ class Main:
         self.last_working_directory: str = "" # Persisted working directory (loaded from settings, updated on selection)
         self._startup_reload_prompt_shown: bool = False # Startup state: ensure we only ask once per session
         self.status_label_var = tk.StringVar(value="Idle") # App status
-        self.status_state = "idle"  # Current status state
         self.foldercount_var = tk.StringVar(value="Folders: 0") # Folder count of source folder
         self.filecount_var = tk.StringVar(value="Files: 0") # File count of source folder
         self.movecount_var = tk.StringVar(value="Moved: 0") # Number of files moved to source folder
@@ -66,10 +82,14 @@ class Main:
         self.queuecount_var = tk.StringVar(value="Queue: 0") # Number of files in the move queue
         self.dupe_handle_mode_var = tk.StringVar(value="Move") # Method for handling duplicates ("Delete", "Move")
         self.dupe_filter_mode_var = tk.StringVar(value="Flexible") # Method for finding similar files to check ("Flexible", "Strict")
-        self.dupe_check_mode_var = tk.StringVar(value="Similar") # Additional MD5 check criteria ("Similar", "Single")
+        self.dupe_check_mode_var = tk.StringVar(value="Similar") # Additional MD5 check criteria ("Similar", "Single", "Global")
         self.dupe_max_files_var = tk.IntVar(value=75) # Max files to check for duplicates
         self.dupe_use_partial_hash_var = tk.BooleanVar(value=True) # Use partial hash for faster initial comparison
         self.dupe_partial_hash_size_var = tk.IntVar(value=4096) # Size in bytes for partial hash (default 4KB)
+        self.dupe_partial_hash_mode_var = tk.StringVar(value="head_tail") # Partial hash reads ("head_tail", "sampled")
+        self.dupe_partial_hash_samples_var = tk.IntVar(value=8) # Evenly spaced blocks read in "sampled" mode
+        self.dupe_hash_on_ingest_var = tk.BooleanVar(value=False) # Hash moved files and keep the record in the hash index
+        self.delete_to_trash_var = tk.BooleanVar(value=True) # Send deleted duplicates to the trash instead of removing them
         self.move_queue_length_var = tk.IntVar(value=1000) # Timer length (ms) for move queue
         self.text_log_wrap_var = tk.BooleanVar(value=True) # Wrap text in log window
         self.log_verbosity_var = tk.IntVar(value=1) # Log verbosity level (1-4): 1=Essential, 2=Extended, 3=Detailed, 4=Debug
@@ -86,6 +106,11 @@ class Main:
         self.minimize_to_tray_show_close_tip_var = tk.BooleanVar(value=True) # When minimize-to-tray is enabled, optionally show a one-time tip on first close.
         self._minimize_to_tray_close_tip_shown: bool = False # Session flag for whether the close tip has been shown
 
+        # Performance metrics (default OFF). Collection is near-free while disabled.
+        self.metrics_enabled_var = tk.BooleanVar(value=False)
+        self.metrics_enabled_var.trace_add("write", lambda *_: metrics.set_enabled(self.metrics_enabled_var.get()))
+        self.metrics_window: Optional[tk.Toplevel] = None
+
         # Desktop notifications (default ON). Independent of minimize-to-tray.
         self.notifications_enabled_var = tk.BooleanVar(value=True)
         self._last_notification_ms: float = 0.0
@@ -122,10 +147,12 @@ class Main:
         self.history_zoom_current_path: str = ""
         self.file_menu: Optional[tk.Menu] = None
         self.queue_progressbar: Optional[ttk.Progressbar] = None
+        self.progress_driver = ProgressDriver(self.root)  # One frame loop for all progress bars; idle when nothing animates
 
         # Media thumbnails (video via ffmpeg)
         self.ffmpeg_available: bool = False
         self.ffmpeg_path: str = ""
+        self._video_thumb_backlog: list[str] = []  # Videos moved this batch; thumbnailed after it
 
         # Window geometry persistence
         self.window_geometry: str | None = None  # Persisted geometry string (e.g. "1000x480+10+10")
@@ -135,13 +162,6 @@ class Main:
         self.app_path = self.get_app_path() # The application folder
         self.icon_path = ""  # Path to the application icon
 
-        # Funnel and Duplicate Folders
-        self.funnel_dir = ""  # The funnel folder that will be watched
-        self.funnel_dir_name = ""  # The name of the funnel folder
-        self.funnel_name_prefix = "#FUNNEL#_"  # Prefix for the funnel folder name
-        self.duplicate_storage_path = ""  # The folder that will store moved duplicate files
-        self.duplicate_name_prefix = "#DUPLICATE#_"  # Prefix for duplicate storage folder name
-
         # Log
         self.messages = []  # Log message list
 
@@ -173,36 +193,52 @@ class Main:
         self.history_sort_column: str | None = "name"
         self.history_sort_desc: bool = False
 
-        # History items and count
+        # History items (counts, queue, observers and funnel paths live on FunnelEngine)
         self.move_history_items = {}  # Store history of moved files and their final path as {filename: {"path": source_path, "order": int}}
-        self.move_count = 0  # Files moved
-        self.duplicate_history_items = {}  # Store history of matched duplicate files as {filename: {"source": source_path, "duplicate": duplicate_path, "order": int}}
-        self.duplicate_count = 0  # Duplicate files detected
-        self.history_order_counter = 0  # Counter to track chronological order of history items
-
-        # Live folder/file counts (kept in sync incrementally)
-        self.folder_count = 0
-        self.file_count = 0
-
-        # Queue related variables
-        self.move_queue = []  # List of files waiting to be moved
-        self.queue_count = 0  # Number of files in the move queue
-        self.queue_timer_id = None  # Store timer ID for cancellation
-        self.queue_start_time = None  # Store when the queue timer started
-
-        # Observers for file watching
-        self.funnel_observer = None
-        self.source_observer = None
-
-        # Temporary filetypes
-        self.temp_filetypes = [".tmp", ".temp", ".part", ".crdownload", ".partial", ".bak"]
 
         # Stats
-        self.grand_move_count = 0  # Lifetime total of files moved
-        self.grand_duplicate_count = 0  # Lifetime total of duplicate files detected
         self.move_action_time = 6  # Estimated time saved per move action in seconds
         self.dupe_action_time = 11  # Estimated time saved per duplicate action in seconds
 
+        # Mirror the tk settings into the engine config read by the core modules
+        self.bind_funnel_config()
+
+
+    def bind_funnel_config(self):
+        """Keep `self.funnel_config` in sync with the matching tk variables."""
+        bindings = {
+            "source_dir": self.source_dir_var,
+            "dupe_handle_mode": self.dupe_handle_mode_var,
+            "dupe_filter_mode": self.dupe_filter_mode_var,
+            "dupe_check_mode": self.dupe_check_mode_var,
+            "dupe_max_files": self.dupe_max_files_var,
+            "dupe_use_partial_hash": self.dupe_use_partial_hash_var,
+            "dupe_partial_hash_size": self.dupe_partial_hash_size_var,
+            "dupe_partial_hash_mode": self.dupe_partial_hash_mode_var,
+            "dupe_partial_hash_samples": self.dupe_partial_hash_samples_var,
+            "dupe_hash_on_ingest": self.dupe_hash_on_ingest_var,
+            "delete_to_trash": self.delete_to_trash_var,
+            "move_queue_length": self.move_queue_length_var,
+            "log_verbosity": self.log_verbosity_var,
+            "ignore_firefox_temp_files": self.ignore_firefox_temp_files_var,
+            "ignore_temp_files": self.ignore_temp_files_var,
+            "auto_extract_zip": self.auto_extract_zip_var,
+            "auto_delete_zip": self.auto_delete_zip_var,
+            "overwrite_on_conflict": self.overwrite_on_conflict_var,
+            "fast_discovery_enabled": self.fast_discovery_enabled_var,
+        }
+
+        def _sync(field: str, var: tk.Variable) -> None:
+            try:
+                setattr(self.funnel_config, field, var.get())
+            except tk.TclError:
+                pass  # Transient invalid entry (e.g. empty spinbox); keep last good value
+        for field, var in bindings.items():
+            _sync(field, var)
+            var.trace_add("write", lambda *_, f=field, v=var: _sync(f, v))
+        # Queued on the engine thread, so it runs after the config above is updated
+        self.dupe_check_mode_var.trace_add("write", lambda *_: self.sync_content_index())
+
 
 #endregion
 #region - Interface Logic
@@ -215,12 +251,17 @@ class Main:
         interface_logic.open_folder(self, path)
 
     def log(self, message, mode="simple", verbose=1):
+        if self._defer_to_ui(self.log, message, mode, verbose):
+            return
         interface_logic.log(self, message, mode, verbose)
 
     def clear_log(self):
         interface_logic.clear_log(self)
 
     def set_status(self, state: str, message: str | None = None):
+        if self._defer_to_ui(self.set_status, state, message):
+            return
+        super().set_status(state, message)
         interface_logic.set_status(self, state, message)
         # Cache for tray thread (avoid reading Tk vars from pystray thread)
         try:
@@ -232,6 +273,8 @@ class Main:
         interface_logic.toggle_text_wrap(self)
 
     def toggle_widgets_state(self, state="idle"):
+        if self._defer_to_ui(self.toggle_widgets_state, state):
+            return
         interface_logic.toggle_widgets_state(self, state)
 
     def open_help_window(self):
@@ -240,12 +283,60 @@ class Main:
     def open_stats_popup(self):
         interface_logic.open_stats_popup(self)
 
+    def open_metrics_window(self):
+        interface_logic.open_metrics_window(self)
+
     def update_duplicate_count(self):
+        if self._defer_to_ui(self.update_duplicate_count):
+            return
         interface_logic.update_duplicate_count(self)
 
     def update_queue_count(self):
+        if self._defer_to_ui(self.update_queue_count):
+            return
         interface_logic.update_queue_count(self)
 
+    def update_move_count(self):
+        if self._defer_to_ui(self.update_move_count):
+            return
+        self.movecount_var.set(f"Moved: {ntk.number_commas(self.move_count)}")
+
+    def batch_complete(self):
+        if self._defer_to_ui(self.batch_complete):
+            return
+        listbox_logic.prefetch_history_video_thumbnails(self)
+
+    def set_counts(self, folder_count: int, file_count: int):
+        # Store immediately (adjust_counts reads them back on the engine thread); labels follow on Tk
+        super().set_counts(folder_count, file_count)
+        self._refresh_count_labels()
+
+    def _refresh_count_labels(self):
+        if self._defer_to_ui(self._refresh_count_labels):
+            return
+        self.foldercount_var.set(f"Folders: {ntk.number_commas(self.folder_count)}")
+        self.filecount_var.set(f"Files: {ntk.number_commas(self.file_count)}")
+
+    def set_queue_progress(self, value: float):
+        if self._defer_to_ui(self.set_queue_progress, value):
+            return
+        if self.queue_progressbar:
+            self.queue_progressbar['value'] = value
+
+    def show_error(self, title: str, message: str):
+        if self._defer_to_ui(self.show_error, title, message):
+            return
+        ntk.showinfo(title, message)
+
+    def ask_ok_cancel(self, title: str, message: str) -> bool:
+        return self._ask_on_ui(ntk.askokcancel, title, message)
+
+    def ask_yes_no(self, title: str, message: str) -> bool:
+        return self._ask_on_ui(ntk.askyesno, title, message)
+
+    def ask_yes_no_cancel(self, title: str, prompt: str, detail: str = ""):
+        return self._ask_on_ui(ntk.askyesnocancel, title, prompt=prompt, detail=detail)
+
     def apply_main_pane_layout(self, user_action: bool = False):
         interface_logic.apply_main_pane_layout(self, user_action=user_action)
 
@@ -258,12 +349,19 @@ class Main:
 
 
     def clear_history(self):
+        if self._defer_to_ui(self.clear_history):
+            return
         interface_logic.clear_history(self)
 
     def add_history_moved(self, dest_path: str, rel_path: str, action: str = "Moved"):
+        if self._defer_to_ui(self.add_history_moved, dest_path, rel_path, action):
+            return
         history_manager.add_moved(self, dest_path=dest_path, rel_path=rel_path, action=action)
+        listbox_logic.queue_history_video_thumbnail(self, dest_path)
 
     def add_history_duplicate(self, rel_path: str, source_path: str, duplicate_path: str, action: str):
+        if self._defer_to_ui(self.add_history_duplicate, rel_path, source_path, duplicate_path, action):
+            return
         history_manager.add_duplicate(self, rel_path=rel_path, source_path=source_path, duplicate_path=duplicate_path, action=action)
 
     def remove_history_entry(self, entry_id: str):
@@ -318,6 +416,8 @@ class Main:
         listbox_logic.delete_selected_file_smart(self)
 
     def reset_status_row(self):
+        if self._defer_to_ui(self.reset_status_row):
+            return
         interface_logic.reset_status_row(self)
 
     def toggle_history_preview(self):
@@ -341,138 +441,114 @@ class Main:
         duplicate_handler.show_duplicate_scanner(self)
 
 
-#endregion
-#region - Folder Watcher Logic
-
-
-    def start_folder_watcher(self, auto_start=False):
-        folder_watcher.start_folder_watcher(self, auto_start)
-
-    def stop_folder_watcher(self):
-        return folder_watcher.stop_folder_watcher(self)
-
-    def sync_funnel_folders(self, silent=False):
-        folder_watcher.sync_funnel_folders(self, silent)
+    def review_saved_scan(self):
+        duplicate_handler.review_saved_scan(self)
 
 
 #endregion
-#region - Move/Queue Logic
-
+#region - Threading
 
-    def queue_move_file(self, source_path):
-        move_queue.queue_move_file(self, source_path)
 
-    def process_move_queue(self):
-        move_queue.process_move_queue(self)
+    # Core timers and queue work run off the Tk thread (FunnelEngine's asyncio loop + engine worker).
+    # UI hooks called from those threads are posted to a queue the Tk thread drains: a Tk call made
+    # from another thread waits for the Tk thread, so other threads never make one.
+    # The poster wakes Tk through a pipe Tk watches (no Tk call); where Tk can't watch a pipe
+    # (Windows), Tk polls instead, backing off while nothing is posted.
 
-    def handle_rename_event(self, old_path, new_path):
-        move_queue.handle_rename_event(self, old_path, new_path)
 
-    def process_pending_moves(self):
-        move_queue.process_pending_moves(self)
+    def animate_progress(self, key: str, sample, on_done=None):
+        """Progress animation stays on the Tk loop, driven by the shared ProgressDriver."""
+        if self._defer_to_ui(self.animate_progress, key, sample, on_done):
+            return
+        self.progress_driver.add(key, sample, self.set_queue_progress, on_done=on_done)
 
 
-#endregion
-#region - File Logic
+    def stop_progress(self, key: str):
+        if self._defer_to_ui(self.stop_progress, key):  # Keeps order with a deferred animate_progress
+            return
+        self.progress_driver.remove(key)
 
 
-    def check_working_dir_exists(self):
-        """Check if the source folder exists."""
-        path = self.source_dir_var.get()
-        if not path:
-            ntk.showinfo("Error", "No folder selected")
+    def _defer_to_ui(self, fn, *args, **kwargs) -> bool:
+        """Queue fn on the Tk thread when called from another thread; returns True if deferred."""
+        if threading.current_thread() is threading.main_thread():
             return False
-        elif not os.path.exists(path):
-            ntk.showinfo("Error", "Selected folder does not exist")
-            return False
-        return path
+        self._post_ui_call(lambda: fn(*args, **kwargs))
+        return True
 
 
-    def count_folders_and_files(self):
-        """Count the number of folders and files in the source folder.
+    def _post_ui_call(self, call) -> None:
+        self._ui_calls.put(call)
+        with self._ui_lock:
+            if self._ui_wake_pending:
+                return  # Tk has not run the calls posted before this one yet; it will run this too
+            self._ui_wake_pending = True
+        if self._ui_wake_fd is not None:
+            try:
+                os.write(self._ui_wake_fd, b"\0")
+            except OSError:
+                pass
 
-        Thread safety:
-            - This starts a background worker.
-            - UI updates are marshaled via root.after().
 
-        Notes:
-            Folder-Funnel relies on counts for informational UI; the live observers
-            maintain deltas via adjust_counts().
-        """
-        if getattr(self, '_counting_in_progress', False):
-            return
-        source_path = (self.source_dir_var.get() or "").strip()
-        if not source_path or not os.path.exists(source_path):
+    def _open_ui_wakeup(self) -> None:
+        """Watch a pipe for wakeups; fall back to polling where Tk has no file handlers."""
+        try:
+            read_fd, write_fd = os.pipe()
+            os.set_blocking(read_fd, False)
+            os.set_blocking(write_fd, False)
+            self.root.tk.createfilehandler(read_fd, tk.READABLE, lambda fd, _mask: self._on_ui_wakeup(fd))
+        except (AttributeError, OSError, tk.TclError):
+            self.root.after(UI_POLL_MS, self._poll_ui_calls, UI_POLL_MS)
             return
-        self._counting_in_progress = True
-
-        def _ui_set_counts(folder_count: int, file_count: int) -> None:
-            self.folder_count = int(folder_count)
-            self.file_count = int(file_count)
-            self.foldercount_var.set(f"Folders: {ntk.number_commas(self.folder_count)}")
-            self.filecount_var.set(f"Files: {ntk.number_commas(self.file_count)}")
+        self._ui_wake_fd = write_fd
 
-        def _ui_done() -> None:
-            self._counting_in_progress = False
-
-        def _worker() -> None:
-            try:
-                if self.fast_discovery_enabled_var.get() and self.fast_discovery_available(path=source_path):
-                    folder_count, file_count = fast_discovery.get_counts_via_mft(source_path)
-                    self.root.after(0, lambda: _ui_set_counts(folder_count, file_count))
-                else:
-                    # Safe, portable scan with periodic UI updates.
-                    folder_count = 0
-                    file_count = 0
-                    i = 0
-                    for _root_dir, dirs, files in os.walk(source_path):
-                        folder_count += len(dirs)
-                        file_count += len(files)
-                        i += 1
-                        if i % 50 == 0:
-                            self.root.after(0, lambda fc=folder_count, fic=file_count: _ui_set_counts(fc, fic))
-                    self.root.after(0, lambda: _ui_set_counts(folder_count, file_count))
-            finally:
-                self.root.after(0, _ui_done)
 
-        threading.Thread(target=_worker, daemon=True).start()
+    def _on_ui_wakeup(self, read_fd: int) -> None:
+        try:
+            os.read(read_fd, 4096)
+        except OSError:
+            pass
+        self._run_ui_calls()
 
 
-    def fast_discovery_available(self, path: str | None = None) -> bool:
-        """Return True when a fast discovery backend is available for path."""
-        try:
-            target = (path or self.source_dir_var.get() or "").strip()
-            if not target:
-                return False
-            mode = fast_discovery.detect_volume_support(target)
-            return mode != "unsupported"
-        except Exception:
-            return False
+    def _poll_ui_calls(self, delay_ms: int) -> None:
+        ran = self._run_ui_calls()
+        delay_ms = UI_POLL_MS if ran else min(UI_IDLE_POLL_MS, delay_ms * 2)
+        self.root.after(delay_ms, self._poll_ui_calls, delay_ms)
 
 
-    def enumerate_with_fast_discovery(self, root_path: str, on_batch, include_dirs: bool = True, batch_size: int = 1000):
-        """Enumerate paths on a worker thread and deliver batches on the UI thread."""
-        def _worker() -> None:
+    def _run_ui_calls(self) -> bool:
+        """Run calls posted by other threads (Tk thread only); returns True if there were any."""
+        with self._ui_lock:
+            self._ui_wake_pending = False  # Cleared first: anything posted from here on wakes Tk again
+        ran = False
+        while True:
             try:
-                fast_discovery.enumerate_paths_via_mft(root_path, include_dirs=include_dirs, batch_size=batch_size, batch_callback=lambda batch: self.root.after(0, lambda b=batch: on_batch(b)))
-            except Exception:
-                # Fail safe: nothing to enumerate.
-                return
-        threading.Thread(target=_worker, daemon=True).start()
+                call = self._ui_calls.get_nowait()
+            except queue.Empty:
+                return ran
+            ran = True
+            try:
+                call()
+            except Exception as e:
+                self.log(f"Error in UI callback: {e}", mode="error", verbose=1)
 
 
-    def adjust_counts(self, folder_delta=0, file_delta=0):
-        """Incrementally adjust cached counts and update UI labels."""
-        if threading.current_thread() is not threading.main_thread():
-            # Marshal to main thread to avoid Tk updates from watcher threads
-            self.root.after(0, lambda: self.adjust_counts(folder_delta, file_delta))
-            return
-        if folder_delta:
-            self.folder_count = max(0, self.folder_count + folder_delta)
-        if file_delta:
-            self.file_count = max(0, self.file_count + file_delta)
-        self.foldercount_var.set(f"Folders: {ntk.number_commas(self.folder_count)}")
-        self.filecount_var.set(f"Files: {ntk.number_commas(self.file_count)}")
+    def _ask_on_ui(self, dialog_fn, *args, **kwargs):
+        """Show a blocking dialog on the Tk thread and return its answer to the calling thread."""
+        if threading.current_thread() is threading.main_thread():
+            return dialog_fn(*args, **kwargs)
+        done = threading.Event()
+        answer = {}
+
+        def _show():
+            try:
+                answer["value"] = dialog_fn(*args, **kwargs)
+            finally:
+                done.set()
+        self._post_ui_call(_show)
+        done.wait()
+        return answer.get("value")
 
 
 #endregion
@@ -483,6 +559,33 @@ class Main:
         settings_manager.load_settings(self)
         settings_manager.apply_settings_to_ui(self)
         self.check_ffmpeg()
+        self.open_hash_index()
+        self.open_trash()
+        self.open_thumbnail_store()
+
+
+    def open_hash_index(self):
+        """Keep file hashes across runs so previously funneled files are never re-read."""
+        try:
+            duplicate_handler.open_hash_index(os.path.join(self.get_data_path(), 'hash_index.sqlite'))
+        except Exception as e:
+            self.log(f"Hash index unavailable, using the memory cache only: {str(e)}", mode="warning", verbose=2)
+
+
+    def open_trash(self):
+        """Journal trashed files so deletes can be undone; a background purger keeps the trash bounded."""
+        try:
+            trash.open_trash(os.path.join(self.get_data_path(), 'trash_journal.jsonl'), fallback_dir=os.path.join(self.get_data_path(), 'Trash'))
+        except Exception as e:
+            self.log(f"Trash journal unavailable, trashed files can't be restored in bulk: {str(e)}", mode="warning", verbose=2)
+
+
+    def open_thumbnail_store(self):
+        """Keep previews (images and video frames) on disk so they survive restarts."""
+        try:
+            thumbnail_store.open_store(os.path.join(self.get_data_path(), 'thumbnails'))
+        except Exception as e:
+            self.log(f"Thumbnail store unavailable, previews are cached in memory only: {str(e)}", mode="warning", verbose=2)
 
 
     def save_settings(self):
@@ -574,14 +677,50 @@ class Main:
 
 
     def exit_application(self):
-        """Fully exit the application."""
-        self.process_pending_moves()
+        """Fully exit the application, after one last pass over the move queue.
+
+        The pass runs on the engine thread while Tk keeps running (its hooks and prompts need Tk),
+        and is given EXIT_DRAIN_TIMEOUT_S before exit goes ahead without it.
+        """
+        if self._exiting:
+            return
+        self._exiting = True
+        done = threading.Event()
+
+        def _drain():
+            try:
+                move_queue.process_pending_moves(self)
+            finally:
+                done.set()
+        self.run_on_engine(_drain)
+        deadline = time.monotonic() + EXIT_DRAIN_TIMEOUT_S
+
+        def _wait_for_drain():
+            if not done.is_set() and time.monotonic() < deadline:
+                self.root.after(50, _wait_for_drain)
+                return
+            if not done.is_set():
+                self.log("Exit: queue pass still running; exiting without waiting for it", mode="warning", verbose=1)
+            self._run_ui_calls()
+            self._exiting = False
+            self._finish_exit()
+        _wait_for_drain()
+
+
+    def _finish_exit(self):
         if not self.stop_folder_watcher():
             return
         if not duplicate_handler.confirm_duplicate_storage_removal(self):
             return
         self.save_settings()
         self.stop_tray_icon()
+        self.progress_driver.stop()
+        self.close()
+        duplicate_handler.close_hash_index()
+        trash.close_trash()
+        video_thumbnail.shutdown_worker(self)
+        listbox_logic.close_history_thumbnails(self)
+        thumbnail_store.close_store()
         self.root.quit()
 
 
@@ -594,6 +733,8 @@ class Main:
 
 
     def notify(self, message: str, title: str = "Folder-Funnel") -> None:
+        if self._defer_to_ui(self.notify, message, title):
+            return
         tray_manager.notify(self, message=message, title=title)
 
 
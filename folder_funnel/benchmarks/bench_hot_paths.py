@@ -0,0 +1,450 @@
+"""Headless benchmarks for the duplicate-detection and move hot paths.
+
+Generates a synthetic source tree + funnel, then times:
+    - duplicate_handler.get_md5 (partial and full, cold cache)
+    - duplicate_handler.find_similar_files
+    - duplicate_handler.are_files_identical
+    - the scanner ScanStage pipeline (Size -> Partial Hash -> Full MD5)
+    - move_queue._move_file on a headless FunnelEngine
+
+Results (throughput + peak traced memory) are written as JSON so later runs can
+be compared against them.
+
+Usage (from the folder_funnel directory):
+    python benchmarks/bench_hot_paths.py
+    python benchmarks/bench_hot_paths.py --files 5000 --dupe-ratio 0.3 --sizes mixed
+    python benchmarks/bench_hot_paths.py --compare benchmarks/results/<previous>.json --fail-on-regression
+"""
+
+
+#region - Imports
+
+
+# Standard
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Make `main.*` importable when run as a script
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+# Custom
+from main.utils import duplicate_handler
+from main.utils import move_queue
+from main.utils import metrics
+from main.utils.funnel_engine import FunnelEngine, FunnelConfig
+
+
+#endregion
+#region - Constants
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# name -> (min_bytes, max_bytes) used for uniform picks; "mixed" is log-uniform over the union
+SIZE_DISTRIBUTIONS = {
+    "small": (1 * 1024, 64 * 1024),
+    "medium": (64 * 1024, 1024 * 1024),
+    "large": (1024 * 1024, 16 * 1024 * 1024),
+    "mixed": (1 * 1024, 16 * 1024 * 1024),
+}
+
+# Collision suffix patterns as produced by browsers, OS copy dialogs, and _get_unique_filename
+COLLISION_PATTERNS = ("{base}_{n}{ext}", "{base} ({n}){ext}", "{base}-{n}{ext}", "{base}({n}){ext}")
+
+EXTENSIONS = (".jpg", ".png", ".mp4", ".zip", ".txt")
+
+
+#endregion
+#region - Headless app
+
+
+class _Var:
+    """Minimal stand-in for tk.Variable (get/set only)."""
+    def __init__(self, value):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+
+def make_engine(source_dir: str, funnel_dir: str, partial_hash_size: int = 4096) -> FunnelEngine:
+    """A headless FunnelEngine pointed at the synthetic tree; errors are collected on `.errors`."""
+    config = FunnelConfig(source_dir=source_dir, dupe_use_partial_hash=partial_hash_size > 0, dupe_partial_hash_size=partial_hash_size)
+    engine = FunnelEngine(config, name="bench")
+    engine.funnel_dir = funnel_dir
+    engine.errors = []
+    engine.on_log = lambda message, mode, verbose: engine.errors.append(message) if mode == "error" else None
+    return engine
+
+
+class _StubDialog:
+    """Runs `after()` callbacks inline so scanner progress code works headless."""
+    def after(self, _ms, fn=None, *args):
+        if fn is not None:
+            fn(*args)
+        return None
+
+
+def _make_headless_scanner(app: FunnelEngine):
+    """Build a DuplicateScannerDialog without creating any Tk widgets."""
+    from main.ui.interactive_duplicate_scanner import duplicate_scanner_dialog as dsd
+    scanner = dsd.DuplicateScannerDialog.__new__(dsd.DuplicateScannerDialog)
+    scanner.app = app
+    scanner.dialog = _StubDialog()
+    scanner._scan_lock = threading.Lock()
+    scanner._is_scanning = True
+    scanner._hash_executor = None
+    scanner._eta_tracker = None
+    scanner._live_lock = threading.Lock()
+    scanner._live = {}
+    scanner._pulse_frame = 0
+    scanner.progress_var = _Var(0.0)
+    scanner.status_var = _Var("")
+    scanner.analysis_start_time = time.time()
+    return dsd, scanner
+
+
+#endregion
+#region - Synthetic trees
+
+
+def _pick_size(rng: random.Random, dist: str) -> int:
+    low, high = SIZE_DISTRIBUTIONS[dist]
+    if dist == "mixed":
+        # Log-uniform: many small files, a long tail of large ones
+        import math
+        return int(math.exp(rng.uniform(math.log(low), math.log(high))))
+    return rng.randint(low, high)
+
+
+def generate_tree(root: str, file_count: int, dupe_ratio: float, collision_ratio: float, sizes: str, dirs: int, seed: int) -> Dict[str, object]:
+    """Create `file_count` files under root/source and a matching incoming set under root/funnel.
+
+    - `dupe_ratio`: share of incoming files whose content already exists in the source tree.
+    - `collision_ratio`: share of incoming files that reuse an existing name (plus `_1`/`(2)` style
+      variants in the source tree) so the duplicate checker has to inspect similar names.
+    """
+    rng = random.Random(seed)
+    source_dir = os.path.join(root, "source")
+    funnel_dir = os.path.join(root, "funnel")
+    subdirs = [f"dir_{i:03d}" for i in range(max(1, dirs))]
+    for sub in subdirs:
+        os.makedirs(os.path.join(source_dir, sub), exist_ok=True)
+        os.makedirs(os.path.join(funnel_dir, sub), exist_ok=True)
+    existing: List[Tuple[str, str, bytes]] = []  # (subdir, filename, content)
+    total_bytes = 0
+    for i in range(file_count):
+        sub = subdirs[i % len(subdirs)]
+        ext = EXTENSIONS[i % len(EXTENSIONS)]
+        name = f"file_{i:06d}{ext}"
+        content = rng.randbytes(_pick_size(rng, sizes))
+        with open(os.path.join(source_dir, sub, name), "wb") as f:
+            f.write(content)
+        total_bytes += len(content)
+        existing.append((sub, name, content))
+        # Collision variants in the source tree (different content, similar names)
+        if rng.random() < collision_ratio:
+            base, ext = os.path.splitext(name)
+            for n in range(1, rng.randint(2, 4)):
+                pattern = rng.choice(COLLISION_PATTERNS)
+                variant = pattern.format(base=base, n=n, ext=ext)
+                # Same size, different tail: forces partial/full hash work
+                variant_content = content[:-16] + rng.randbytes(16) if len(content) > 16 else rng.randbytes(len(content))
+                with open(os.path.join(source_dir, sub, variant), "wb") as f:
+                    f.write(variant_content)
+                total_bytes += len(variant_content)
+    incoming = 0
+    incoming_dupes = 0
+    incoming_collisions = 0
+    for i, (sub, name, content) in enumerate(existing):
+        roll = rng.random()
+        if roll < dupe_ratio:
+            # Same name, same content -> duplicate
+            data = content
+            incoming_dupes += 1
+        elif roll < dupe_ratio + collision_ratio:
+            # Same name, different content -> renamed on move
+            data = rng.randbytes(len(content))
+            incoming_collisions += 1
+        else:
+            name = f"new_{i:06d}{os.path.splitext(name)[1]}"
+            data = rng.randbytes(_pick_size(rng, sizes))
+        with open(os.path.join(funnel_dir, sub, name), "wb") as f:
+            f.write(data)
+        incoming += 1
+    return {
+        "source_dir": source_dir,
+        "funnel_dir": funnel_dir,
+        "source_bytes": total_bytes,
+        "incoming": incoming,
+        "incoming_dupes": incoming_dupes,
+        "incoming_collisions": incoming_collisions,
+    }
+
+
+def _list_files(root: str) -> List[Tuple[str, int]]:
+    out = []
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            out.append((path, os.path.getsize(path)))
+    return out
+
+
+#endregion
+#region - Benchmarks
+
+
+def _bench_get_md5(tree: dict, partial_size: int, samples: int = 0) -> Tuple[int, int]:
+    """samples > 0 benchmarks the sampled partial mode (K blocks of partial_size)."""
+    duplicate_handler.clear_hash_cache()
+    files = _list_files(tree["source_dir"])
+    partial_mode = duplicate_handler.sampled_mode(samples) if samples else "head_tail"
+    nbytes = 0
+    for path, size in files:
+        duplicate_handler.get_md5(path, partial_size=partial_size, partial_mode=partial_mode)
+        nbytes += min(size, (samples or 2) * partial_size) if partial_size else size
+    return len(files), nbytes
+
+
+def _bench_find_similar(tree: dict) -> Tuple[int, int]:
+    duplicate_handler.invalidate_dir_cache()
+    funnel_files = _list_files(tree["funnel_dir"])
+    for path, size in funnel_files:
+        rel = os.path.relpath(path, tree["funnel_dir"])
+        target_dir = os.path.dirname(os.path.join(tree["source_dir"], rel))
+        duplicate_handler.find_similar_files(path, target_dir, "Flexible", 75, source_size=size)
+    return len(funnel_files), 0
+
+
+def _bench_are_files_identical(tree: dict, partial_size: int) -> Tuple[int, int]:
+    duplicate_handler.clear_hash_cache()
+    duplicate_handler.invalidate_dir_cache()
+    funnel_files = _list_files(tree["funnel_dir"])
+    nbytes = 0
+    for path, size in funnel_files:
+        rel = os.path.relpath(path, tree["funnel_dir"])
+        dest = os.path.join(tree["source_dir"], rel)
+        duplicate_handler.are_files_identical(path, dest, check_mode="Similar", method="Flexible", max_files=75, partial_hash_size=partial_size)
+        nbytes += size
+    return len(funnel_files), nbytes
+
+
+def _bench_scan_pipeline(tree: dict, partial_size: int) -> Tuple[int, int]:
+    duplicate_handler.clear_hash_cache()
+    app = make_engine(tree["source_dir"], tree["funnel_dir"], partial_size)
+    dsd, scanner = _make_headless_scanner(app)
+    files = _list_files(tree["source_dir"])
+    table = dsd.FileTable()
+    for path, size in files:
+        table.append_path(path, size)
+    stages = [dsd.SizeStage(scanner, 1, 3), dsd.PartialHashStage(scanner, 2, 3, partial_size=partial_size or 4096), dsd.FullMD5Stage(scanner, 3, 3)]
+    groups = dsd.RowGroups.single(table.all_indices())
+    for stage in stages:
+        groups = stage.process(table, groups)
+        if scanner._hash_executor:
+            scanner._hash_executor.shutdown(wait=True)
+            scanner._hash_executor = None
+        if not groups:
+            break
+    return len(files), sum(size for _, size in files)
+
+
+def _bench_move_file(tree: dict, partial_size: int) -> Tuple[int, int]:
+    duplicate_handler.clear_hash_cache()
+    duplicate_handler.invalidate_dir_cache()
+    app = make_engine(tree["source_dir"], tree["funnel_dir"], partial_size)
+    app.duplicate_storage_path = os.path.join(os.path.dirname(tree["source_dir"]), "duplicates")
+    os.makedirs(app.duplicate_storage_path, exist_ok=True)
+    funnel_files = _list_files(tree["funnel_dir"])
+    # Prime the stability check (first pass always defers)
+    for path, _size in funnel_files:
+        move_queue._is_file_stable(app, path)
+    moved = 0
+    nbytes = 0
+    for path, size in funnel_files:
+        if move_queue._move_file(app, path):
+            moved += 1
+            nbytes += size
+    if app.errors:
+        raise RuntimeError(f"_move_file reported {len(app.errors)} errors, first: {app.errors[0]}")
+    return moved, nbytes
+
+
+BENCHMARKS: Dict[str, Tuple[Callable[[dict, int], Tuple[int, int]], bool]] = {
+    # name: (fn(tree, partial_size), mutates_tree)
+    "get_md5.partial": (lambda tree, ps: _bench_get_md5(tree, ps or 4096), False),
+    "get_md5.sampled": (lambda tree, ps: _bench_get_md5(tree, ps or 4096, samples=duplicate_handler.DEFAULT_SAMPLE_COUNT), False),
+    "get_md5.full": (lambda tree, ps: _bench_get_md5(tree, 0), False),
+    "find_similar_files": (lambda tree, ps: _bench_find_similar(tree), False),
+    "are_files_identical": (_bench_are_files_identical, False),
+    "scan_pipeline": (_bench_scan_pipeline, False),
+    "move_file": (_bench_move_file, True),
+}
+
+
+#endregion
+#region - Runner
+
+
+def _run_one(fn, tree: dict, partial_size: int, trace_memory: bool) -> Dict[str, float]:
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    items, nbytes = fn(tree, partial_size)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace_memory:
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"seconds": elapsed, "items": items, "bytes": nbytes, "peak_kb": peak / 1024.0}
+
+
+def run_benchmarks(args) -> Dict[str, object]:
+    selected = [name for name in BENCHMARKS if not args.only or name in args.only]
+    results: Dict[str, Dict[str, float]] = {}
+    work_root = tempfile.mkdtemp(prefix="ff_bench_", dir=args.workdir)
+    try:
+        tree_params = dict(file_count=args.files, dupe_ratio=args.dupe_ratio, collision_ratio=args.collision_ratio, sizes=args.sizes, dirs=args.dirs, seed=args.seed)
+
+        def _fresh_tree(tag: str) -> dict:
+            root = os.path.join(work_root, tag)
+            os.makedirs(root, exist_ok=True)
+            return generate_tree(root, **tree_params)
+
+        shared_tree = _fresh_tree("shared")
+        print(f"Tree: {args.files:,} source files ({shared_tree['source_bytes'] / 1024 / 1024:,.1f} MB), {shared_tree['incoming']:,} incoming ({shared_tree['incoming_dupes']:,} dupes, {shared_tree['incoming_collisions']:,} name collisions)")
+        for name in selected:
+            fn, mutates = BENCHMARKS[name]
+            runs = []
+            for i in range(args.repeat):
+                tree = _fresh_tree(f"{name}_{i}") if mutates else shared_tree
+                metrics.reset()
+                metrics.set_enabled(True)
+                runs.append(_run_one(fn, tree, args.partial_size, trace_memory=False))
+                metrics.set_enabled(False)
+                op_metrics = metrics.snapshot()["operations"]
+                if mutates:
+                    shutil.rmtree(os.path.dirname(tree["source_dir"]), ignore_errors=True)
+            best = min(runs, key=lambda r: r["seconds"])
+            peak_kb = 0.0
+            if not args.no_memory:
+                tree = _fresh_tree(f"{name}_mem") if mutates else shared_tree
+                peak_kb = _run_one(fn, tree, args.partial_size, trace_memory=True)["peak_kb"]
+                if mutates:
+                    shutil.rmtree(os.path.dirname(tree["source_dir"]), ignore_errors=True)
+            seconds = best["seconds"]
+            results[name] = {
+                "seconds": seconds,
+                "items": best["items"],
+                "bytes": best["bytes"],
+                "files_per_s": best["items"] / seconds if seconds > 0 else 0.0,
+                "mb_per_s": best["bytes"] / 1024 / 1024 / seconds if seconds > 0 else 0.0,
+                "peak_kb": peak_kb,
+                "operations": {op: {"p50_ms": v["p50_ms"], "p95_ms": v["p95_ms"], "calls": v["calls"]} for op, v in op_metrics.items()},
+            }
+            r = results[name]
+            print(f"  {name:<22} {r['seconds']:8.3f}s  {r['files_per_s']:10,.1f} files/s  {r['mb_per_s']:8,.1f} MB/s  peak {r['peak_kb']:10,.0f} KB")
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("compare", "output", "workdir")},
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Print per-benchmark deltas and return a list of regressions beyond threshold (fraction)."""
+    regressions: List[str] = []
+    base_results = baseline.get("results", {})
+    print(f"\nCompared with {baseline.get('meta', {}).get('timestamp', '?')}:")
+    for name, cur in current["results"].items():
+        base = base_results.get(name)
+        if not base:
+            print(f"  {name:<22} (no baseline)")
+            continue
+        speed_delta = (cur["files_per_s"] / base["files_per_s"] - 1.0) if base.get("files_per_s") else 0.0
+        mem_delta = (cur["peak_kb"] / base["peak_kb"] - 1.0) if base.get("peak_kb") and cur.get("peak_kb") else 0.0
+        flag = ""
+        if speed_delta < -threshold:
+            flag = "  <-- slower"
+            regressions.append(f"{name}: throughput {speed_delta:+.1%}")
+        elif mem_delta > threshold:
+            flag = "  <-- more memory"
+            regressions.append(f"{name}: peak memory {mem_delta:+.1%}")
+        print(f"  {name:<22} throughput {speed_delta:+7.1%}  memory {mem_delta:+7.1%}{flag}")
+    return regressions
+
+
+def _latest_result_file() -> Optional[str]:
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    files = sorted(f for f in os.listdir(RESULTS_DIR) if f.endswith(".json"))
+    return os.path.join(RESULTS_DIR, files[-1]) if files else None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Folder-Funnel hot-path benchmarks")
+    parser.add_argument("--files", type=int, default=1000, help="Source files to generate (default: 1000)")
+    parser.add_argument("--dirs", type=int, default=10, help="Subfolders to spread files across (default: 10)")
+    parser.add_argument("--sizes", choices=sorted(SIZE_DISTRIBUTIONS), default="small", help="File size distribution (default: small)")
+    parser.add_argument("--dupe-ratio", type=float, default=0.25, help="Share of incoming files that are duplicates (default: 0.25)")
+    parser.add_argument("--collision-ratio", type=float, default=0.25, help="Share of names with _1/(2) style collisions (default: 0.25)")
+    parser.add_argument("--partial-size", type=int, default=4096, help="Partial hash size in bytes, 0 disables (default: 4096)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per benchmark; best is kept (default: 3)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--workdir", default=None, help="Where to generate trees (default: system temp)")
+    parser.add_argument("--output", default=None, help="Result JSON path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to compare against ('latest' = newest in results/)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold as a fraction (default: 0.10)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 when a regression is detected")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    baseline_path = _latest_result_file() if args.compare == "latest" else args.compare
+    current = run_benchmarks(args)
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nSaved: {output}")
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(current, baseline, args.threshold)
+        if regressions and args.fail_on_regression:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+#endregion
@@ -0,0 +1,315 @@
+"""
+Headless / daemon entry point for Folder-Funnel.
+
+Runs one or more funnels from an INI config file without creating any Tk
+windows. All funnels share one scheduler thread, one worker pool and the
+process-wide hash cache. Logs go to files, and SIGTERM/SIGINT flushes pending
+moves before exiting.
+
+Usage:
+    python cli.py --config funnels.ini
+    python cli.py --example-config > funnels.ini
+
+Config format:
+    [daemon]
+    log_dir = /var/log/folder-funnel    ; one <name>.log per funnel + daemon.log
+    log_level = INFO
+    workers = 4                         ; shared worker pool size
+    startup_timeout = 600               ; seconds to wait for each funnel's initial sync
+    keep_funnel = false                 ; keep #FUNNEL#_ folders on exit
+    hash_index = ./hash_index.sqlite    ; persistent hash store (empty = memory cache only)
+    trash_journal = ./trash_journal.jsonl ; record of trashed duplicates, purged after 30 days / 10 GB
+                                        ; defaults to <log_dir>/trash_journal.jsonl; with neither set,
+                                        ; Delete mode removes files permanently (nothing would purge the trash)
+
+    [funnel:photos]                     ; one section per funnel
+    source_dir = /srv/photos
+    dupe_handle_mode = Move             ; any FunnelConfig field can be set here
+"""
+
+
+#region - Imports
+
+
+# Standard
+import os
+import sys
+import signal
+import logging
+import argparse
+import threading
+import configparser
+from dataclasses import fields
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+# Custom
+from main.utils.funnel_engine import FunnelEngine, FunnelConfig
+from main.utils.async_scheduler import AsyncScheduler
+from main.utils import duplicate_handler
+from main.utils import trash
+
+
+#endregion
+#region - Constants
+
+
+DAEMON_SECTION = "daemon"
+FUNNEL_SECTION_PREFIX = "funnel:"
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+EXAMPLE_CONFIG = """\
+[daemon]
+log_dir = ./logs
+log_level = INFO
+workers = 4
+startup_timeout = 600
+keep_funnel = false
+hash_index = ./hash_index.sqlite
+trash_journal = ./trash_journal.jsonl
+
+[funnel:downloads]
+source_dir = /srv/library/downloads
+dupe_handle_mode = Move
+dupe_filter_mode = Flexible
+dupe_check_mode = Similar
+move_queue_length = 2000
+
+[funnel:photos]
+source_dir = /srv/library/photos
+dupe_handle_mode = Delete
+"""
+
+
+#endregion
+#region - Config
+
+
+class ConfigError(Exception):
+    """Raised for invalid daemon config files."""
+
+
+def _parse_funnel_section(name: str, section: configparser.SectionProxy) -> FunnelConfig:
+    """Build a FunnelConfig from one [funnel:<name>] section, coercing values by field type."""
+    config = FunnelConfig()
+    known = {f.name: f for f in fields(FunnelConfig)}
+    for key in section:
+        if key not in known:
+            if key in section.parser.defaults():
+                continue
+            raise ConfigError(f"[{FUNNEL_SECTION_PREFIX}{name}] unknown option '{key}'")
+        default = getattr(config, key)
+        try:
+            if isinstance(default, bool):
+                value = section.getboolean(key)
+            elif isinstance(default, int):
+                value = section.getint(key)
+            else:
+                value = section.get(key)
+        except ValueError as exc:
+            raise ConfigError(f"[{FUNNEL_SECTION_PREFIX}{name}] {key}: {exc}") from exc
+        setattr(config, key, value)
+    if not config.source_dir:
+        raise ConfigError(f"[{FUNNEL_SECTION_PREFIX}{name}] source_dir is required")
+    config.source_dir = os.path.normpath(os.path.expanduser(config.source_dir))
+    return config
+
+
+def load_config(path: str) -> tuple[Dict[str, str], Dict[str, FunnelConfig]]:
+    """Return (daemon_options, {funnel_name: FunnelConfig})."""
+    parser = configparser.ConfigParser(inline_comment_prefixes=(";", "#"))
+    if not parser.read(path, encoding="utf-8"):
+        raise ConfigError(f"Could not read config file: {path}")
+    daemon = dict(parser[DAEMON_SECTION]) if parser.has_section(DAEMON_SECTION) else {}
+    for key, cast, minimum in (("workers", int, 1), ("startup_timeout", float, 0)):
+        raw = str(daemon.get(key, "") or "").strip()
+        if not raw:
+            continue
+        try:
+            value = cast(raw)
+        except ValueError as exc:
+            raise ConfigError(f"[{DAEMON_SECTION}] {key}: {exc}") from exc
+        if value < minimum:
+            raise ConfigError(f"[{DAEMON_SECTION}] {key}: must be at least {minimum}")
+    funnels: Dict[str, FunnelConfig] = {}
+    seen_sources: Dict[str, str] = {}
+    for section_name in parser.sections():
+        if not section_name.startswith(FUNNEL_SECTION_PREFIX):
+            continue
+        name = section_name[len(FUNNEL_SECTION_PREFIX):].strip()
+        if not name:
+            raise ConfigError(f"[{section_name}] funnel name is empty")
+        config = _parse_funnel_section(name, parser[section_name])
+        key = os.path.normcase(config.source_dir)
+        if key in seen_sources:
+            raise ConfigError(f"Funnels '{seen_sources[key]}' and '{name}' watch the same source_dir")
+        seen_sources[key] = name
+        funnels[name] = config
+    if not funnels:
+        raise ConfigError(f"No [{FUNNEL_SECTION_PREFIX}<name>] sections found in {path}")
+    return daemon, funnels
+
+
+#endregion
+#region - Logging
+
+
+def setup_logging(log_dir: str, level: str, funnel_names: List[str], to_console: bool) -> None:
+    """daemon.log gets everything; each funnel also gets its own <name>.log."""
+    formatter = logging.Formatter(LOG_FORMAT)
+    base = logging.getLogger("folder_funnel")
+    base.setLevel(getattr(logging, level.upper(), logging.INFO))
+    base.propagate = False
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        daemon_handler = logging.FileHandler(os.path.join(log_dir, "daemon.log"), encoding="utf-8")
+        daemon_handler.setFormatter(formatter)
+        base.addHandler(daemon_handler)
+        for name in funnel_names:
+            handler = logging.FileHandler(os.path.join(log_dir, f"{name}.log"), encoding="utf-8")
+            handler.setFormatter(formatter)
+            logging.getLogger(f"folder_funnel.{name}").addHandler(handler)
+    if to_console or not log_dir:
+        console = logging.StreamHandler(sys.stderr)
+        console.setFormatter(formatter)
+        base.addHandler(console)
+
+
+#endregion
+#region - Daemon
+
+
+class FunnelDaemon:
+    """Owns the shared scheduler/pool and the set of running engines."""
+    def __init__(self, funnels: Dict[str, FunnelConfig], workers: int = 4, keep_funnel: bool = False):
+        self.logger = logging.getLogger("folder_funnel.daemon")
+        self.keep_funnel = keep_funnel
+        self.scheduler = AsyncScheduler(name="funnel-scheduler", on_error=lambda exc: self.logger.error("Scheduler callback failed: %s", exc))
+        self.executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="funnel-worker")
+        self.engines: Dict[str, FunnelEngine] = {name: FunnelEngine(config, name=name, scheduler=self.scheduler, executor=self.executor) for name, config in funnels.items()}
+        self._stop_event = threading.Event()
+
+
+    def start(self, timeout: Optional[float] = None) -> int:
+        """Start every funnel (initial syncs run in parallel); returns how many are running."""
+        self.scheduler.start()
+        starting = []
+        for name, engine in self.engines.items():
+            self.logger.info("Starting funnel '%s': %s", name, engine.funnel_config.source_dir)
+            if engine.start(wait=False):
+                starting.append(name)
+            else:
+                self.logger.error("Funnel '%s' failed to start", name)
+        running = 0
+        for name in starting:
+            if self.engines[name].wait_until_ready(timeout):
+                running += 1
+            else:
+                self.logger.error("Funnel '%s' did not finish starting within %ss", name, timeout)
+        return running
+
+
+    def request_stop(self, signum=None, _frame=None) -> None:
+        if signum is not None:
+            self.logger.info("Received signal %s, shutting down", signum)
+        self._stop_event.set()
+
+
+    def wait(self) -> None:
+        # Short waits keep the main thread responsive to signals on all platforms
+        while not self._stop_event.wait(1.0):
+            pass
+
+
+    def shutdown(self) -> None:
+        """Flush pending moves, stop observers, then stop shared workers."""
+        for name, engine in self.engines.items():
+            try:
+                pending = len(engine.move_queue)
+                if pending:
+                    self.logger.info("Funnel '%s': processing %d pending file(s) before exit", name, pending)
+                engine.stop(process_pending=True, remove_funnel=not self.keep_funnel)
+            except Exception as exc:
+                self.logger.error("Funnel '%s' did not stop cleanly: %s", name, exc)
+        self.scheduler.stop()
+        self.executor.shutdown(wait=True)
+        duplicate_handler.close_hash_index()
+        trash.close_trash()
+        self.logger.info("Stopped")
+
+
+#endregion
+#region - Entry Point
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run Folder-Funnel headless with one or more funnels.")
+    parser.add_argument("--config", "-c", help="Path to the daemon INI config")
+    parser.add_argument("--console", action="store_true", help="Also log to stderr")
+    parser.add_argument("--example-config", action="store_true", help="Print an example config and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.example_config:
+        sys.stdout.write(EXAMPLE_CONFIG)
+        return 0
+    if not args.config:
+        print("error: --config is required", file=sys.stderr)
+        return 2
+    try:
+        daemon_opts, funnels = load_config(args.config)
+    except ConfigError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    log_dir = daemon_opts.get("log_dir", "")
+    if log_dir and not os.path.isabs(log_dir):
+        log_dir = os.path.join(os.path.dirname(os.path.abspath(args.config)), log_dir)
+    setup_logging(log_dir, daemon_opts.get("log_level", "INFO"), list(funnels), args.console)
+    keep_funnel = str(daemon_opts.get("keep_funnel", "false")).strip().lower() in ("1", "true", "yes", "on")
+    hash_index = str(daemon_opts.get("hash_index", "") or "").strip()
+    if hash_index:
+        if not os.path.isabs(hash_index):
+            hash_index = os.path.join(os.path.dirname(os.path.abspath(args.config)), hash_index)
+        try:
+            duplicate_handler.open_hash_index(hash_index)
+        except Exception as exc:
+            logging.getLogger("folder_funnel.daemon").warning("Hash index unavailable, using the memory cache only: %s", exc)
+    trash_journal = str(daemon_opts.get("trash_journal", "") or "").strip()
+    if trash_journal and not os.path.isabs(trash_journal):
+        trash_journal = os.path.join(os.path.dirname(os.path.abspath(args.config)), trash_journal)
+    elif not trash_journal and log_dir:
+        trash_journal = os.path.join(log_dir, "trash_journal.jsonl")
+    trash_opened = False
+    if trash_journal:
+        try:
+            trash.open_trash(trash_journal)
+            trash_opened = True
+        except Exception as exc:
+            logging.getLogger("folder_funnel.daemon").warning("Trash journal unavailable: %s", exc)
+    if not trash_opened:
+        # Nothing would ever purge an unjournaled trash, so a long-running daemon deletes outright instead.
+        for config in funnels.values():
+            config.delete_to_trash = False
+        logging.getLogger("folder_funnel.daemon").info("No trash journal; duplicates in Delete mode are removed permanently")
+    daemon = FunnelDaemon(funnels, workers=int(daemon_opts.get("workers", 4) or 4), keep_funnel=keep_funnel)
+    signal.signal(signal.SIGINT, daemon.request_stop)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, daemon.request_stop)
+    try:
+        if daemon.start(timeout=float(daemon_opts.get("startup_timeout", 600) or 600)) == 0:
+            daemon.logger.error("No funnels could be started")
+            return 1
+        daemon.logger.info("Watching %d funnel(s)", sum(1 for e in daemon.engines.values() if e.is_running))
+        daemon.wait()
+    finally:
+        daemon.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+#endregion
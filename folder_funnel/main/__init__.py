@@ -1,2 +1 @@
-from . import ui
 from . import utils
@@ -13,6 +13,11 @@ from tkinter import ttk, filedialog
 # Third-party
 import nenotk as ntk
 from nenotk import ToolTip as Tip
+from PIL import ImageTk
+
+# Custom
+from main.utils import trash
+from main.utils.thumbnail_cache import ThumbnailCache
 
 
 #endregion
@@ -36,6 +41,7 @@ class InteractiveDuplicateReviewDialog:
         }
         self.current_preview_size = tk.StringVar(value="Large")
         self.fast_delete_var = tk.BooleanVar(value=False)
+        self.thumbnails = ThumbnailCache()  # Decoded previews, shared by every group shown in this dialog
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Interactive Duplicate Review")
         self.dialog.geometry("1000x700")
@@ -153,19 +159,61 @@ class InteractiveDuplicateReviewDialog:
                 self.create_file_card(self.grid_frame, file_path, idx).grid(row=row, column=col, padx=8, pady=8, sticky="n")
         self.grid_frame.update_idletasks()
         self.canvas.yview_moveto(0)
+        self._prefetch_neighbor_groups()
+
+
+    def _preview_dimensions(self, group):
+        """Thumbnail size used for the images of group (side-by-side pairs get the larger one)."""
+        if len(group) == 2 and all(self.is_image_file(fp) for fp in group):
+            dialog_width = self.dialog.winfo_width() or 1000
+            dialog_height = self.dialog.winfo_height() or 700
+            # Account for UI elements (top bar ~50px, bottom bar ~60px, padding ~50px) and file info/buttons
+            return max(1, (dialog_width - 40 - 30) // 2), max(1, dialog_height - 160 - 150)
+        return self.preview_sizes[self.current_preview_size.get()]
+
+
+    def _prefetch_neighbor_groups(self):
+        """Decode the next and previous groups' previews in the background, next group first."""
+        items = []
+        for index in (self.current_group_index + 1, self.current_group_index - 1, self.current_group_index + 2):
+            if 0 <= index < len(self.duplicate_groups):
+                group = self.duplicate_groups[index]
+                width, height = self._preview_dimensions(group)
+                items.extend((fp, width, height) for fp in group if self.is_image_file(fp))
+        self.thumbnails.prefetch(items)
+
+
+    def _create_thumbnail_label(self, parent, file_path, width, height):
+        """Label showing file_path's preview: from the cache now, or as soon as a worker has decoded it."""
+        image_label = ttk.Label(parent, text="Loading...", foreground="gray", anchor="center", cursor="hand2")
+        image_label.bind("<Button-1>", lambda e: self.open_image_file(file_path))
+        image = self.thumbnails.get(file_path, width, height)
+        if image is not None:
+            self._show_thumbnail(image_label, image)
+        else:
+            def _on_decoded(decoded):
+                # _show_thumbnail skips cards destroyed meanwhile; a cache hit calls back on the Tk thread
+                if not self.app._defer_to_ui(self._show_thumbnail, image_label, decoded):
+                    self._show_thumbnail(image_label, decoded)
+            self.thumbnails.request(file_path, width, height, _on_decoded)
+        return image_label
+
+
+    def _show_thumbnail(self, image_label, image):
+        if not image_label.winfo_exists():
+            return  # Card was rebuilt or the group changed
+        if image is None:
+            image_label.configure(text="Preview Error", foreground="red")
+            return
+        photo = ImageTk.PhotoImage(image)
+        image_label.configure(image=photo, text="")
+        image_label.image = photo  # Keep a reference; Tk does not
 
 
     def create_side_by_side_comparison(self, file_paths):
         """Create a side-by-side comparison layout for exactly 2 images."""
-        # Calculate available space
-        dialog_width = self.dialog.winfo_width() or 1000
-        dialog_height = self.dialog.winfo_height() or 700
-        # Account for UI elements (top bar ~50px, bottom bar ~60px, padding ~50px)
-        available_height = dialog_height - 160
-        available_width = dialog_width - 40  # Account for padding and scrollbar
-        # Each image gets half the width minus some padding
-        max_image_width = (available_width - 30) // 2  # 30px for spacing between images
-        max_image_height = available_height - 150  # Reserve space for file info and buttons
+        # Each image gets half the available width
+        max_image_width, max_image_height = self._preview_dimensions(file_paths)
         # Create main container
         comparison_frame = ttk.Frame(self.grid_frame)
         comparison_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -178,17 +226,7 @@ class InteractiveDuplicateReviewDialog:
             # Image preview with dynamic sizing
             image_frame = ttk.Frame(side_frame)
             image_frame.grid(row=0, column=0, sticky="nsew", pady=(0, 10))
-            try:
-                image_label = ntk.ImageScale(image_frame, width=max_image_width, height=max_image_height, keep_aspect=True)
-                image_label.pack(expand=True, fill="both")
-                image_label.set_image(file_path)
-                image_label.configure(cursor="hand2")
-                image_label.bind("<Button-1>", lambda e, fp=file_path: self.open_image_file(fp))
-                if hasattr(image_label, 'label'):
-                    image_label.label.configure(cursor="hand2")
-                    image_label.label.bind("<Button-1>", lambda e, fp=file_path: self.open_image_file(fp))
-            except Exception:
-                ttk.Label(image_frame, text="Preview Error", foreground="red").pack()
+            self._create_thumbnail_label(image_frame, file_path, max_image_width, max_image_height).pack(expand=True, fill="both")
             # File info
             info_frame = ttk.Frame(side_frame)
             info_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
@@ -247,18 +285,12 @@ class InteractiveDuplicateReviewDialog:
 
 
     def create_image_preview_compact(self, parent, file_path):
-        try:
-            width, height = self.preview_sizes[self.current_preview_size.get()]
-            image_label = ntk.ImageScale(parent, width=width, height=height, keep_aspect=True)
-            image_label.pack()
-            image_label.set_image(file_path)
-            image_label.configure(cursor="hand2")
-            image_label.bind("<Button-1>", lambda e: self.open_image_file(file_path))
-            if hasattr(image_label, 'label'):
-                image_label.label.configure(cursor="hand2")
-                image_label.label.bind("<Button-1>", lambda e: self.open_image_file(file_path))
-        except Exception:
-            pass
+        width, height = self.preview_sizes[self.current_preview_size.get()]
+        # Fixed-size frame so cards don't jump while their image loads
+        holder = ttk.Frame(parent, width=width, height=height)
+        holder.pack()
+        holder.pack_propagate(False)
+        self._create_thumbnail_label(holder, file_path, width, height).pack(expand=True, fill="both")
 
 
     def create_action_buttons_compact(self, parent, file_path):
@@ -297,11 +329,17 @@ class InteractiveDuplicateReviewDialog:
         return os.path.splitext(file_path.lower())[1] in image_extensions
 
 
+    def _remove(self, file_path):
+        """Delete a file, to the trash unless Delete to Trash is turned off."""
+        use_trash = getattr(getattr(self.app, "funnel_config", None), "delete_to_trash", True)
+        trash.remove(file_path, use_trash=use_trash)
+
+
     def delete_file(self, file_path):
         filename = os.path.basename(file_path)
         if self.fast_delete_var.get():
             try:
-                os.remove(file_path)
+                self._remove(file_path)
                 self.remove_file_from_group(file_path)
                 self.app.log(f"Deleted duplicate: {filename}", verbose=1)
             except Exception as e:
@@ -310,7 +348,7 @@ class InteractiveDuplicateReviewDialog:
         else:
             if ntk.askyesno("Confirm Delete", prompt= "Delete file:", detail=filename, parent=self.dialog):
                 try:
-                    os.remove(file_path)
+                    self._remove(file_path)
                     self.remove_file_from_group(file_path)
                     self.app.log(f"Deleted duplicate: {filename}", verbose=1)
                     ntk.showinfo("Success", f"Deleted: {filename}", parent=self.dialog)
@@ -365,7 +403,7 @@ class InteractiveDuplicateReviewDialog:
             errors = []
             for file_path in files_to_delete[:]:
                 try:
-                    os.remove(file_path)
+                    self._remove(file_path)
                     current_group.remove(file_path)
                     deleted_count += 1
                     self.app.log(f"Deleted duplicate: {os.path.basename(file_path)}", verbose=1)
@@ -386,7 +424,7 @@ class InteractiveDuplicateReviewDialog:
                 errors = []
                 for file_path in files_to_delete[:]:
                     try:
-                        os.remove(file_path)
+                        self._remove(file_path)
                         current_group.remove(file_path)
                         deleted_count += 1
                         self.app.log(f"Deleted duplicate: {os.path.basename(file_path)}", verbose=1)
@@ -443,6 +481,7 @@ class InteractiveDuplicateReviewDialog:
 
 
     def on_close(self):
+        self.thumbnails.close()
         self.dialog.destroy()
 
 
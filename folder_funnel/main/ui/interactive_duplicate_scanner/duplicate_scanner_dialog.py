@@ -4,16 +4,16 @@
 # Standard
 import os
 import time
-import shutil
+import queue
 import threading
+from array import array
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 # Standard GUI
 import tkinter as tk
 from tkinter import ttk, filedialog
-from tkinter import scrolledtext
 
 # Third-party
 import nenotk as ntk
@@ -22,9 +22,17 @@ from nenotk import ToolTip as Tip
 # Local imports
 from .duplicate_review_dialog import InteractiveDuplicateReviewDialog
 from main.utils.duplicate_handler import get_md5 as cached_get_md5
+from main.utils.duplicate_handler import sampled_mode, DEFAULT_SAMPLE_COUNT
+from main.utils.file_table import FileTable, RowGroups, group_rows, np
+from main.utils import metrics
+from main.utils import fast_discovery
+from main.utils import dedup_links
+from main.utils import bulk_actions
+from main.utils import scan_results
+from main.utils.scan_results import GroupSummary
 
 # Type checking
-from typing import TYPE_CHECKING, List, Dict, Tuple, Union
+from typing import TYPE_CHECKING, Callable, List, Dict, Tuple, Union
 if TYPE_CHECKING:
     from app import Main
 
@@ -37,7 +45,7 @@ class ScanStage(ABC):
     """
     Abstract base class for modular scan pipeline stages.
 
-    Each stage takes groups of files and refines them by adding criteria to the grouping key.
+    Each stage takes groups of file-table row indices and splits them further by one criterion.
     Stages can be chained in any order to create custom scanning pipelines.
     """
     name: str = "Base Stage"
@@ -51,23 +59,86 @@ class ScanStage(ABC):
 
 
     @abstractmethod
-    def process(self, groups: Dict[tuple, List[Tuple[str, int]]]) -> Dict[tuple, List[Tuple[str, int]]]:
+    def process(self, table: FileTable, groups: RowGroups) -> RowGroups:
         """
         Process file groups and return refined groups.
 
         Args:
-            groups: Dict mapping group key tuples to lists of (filepath, size) tuples.
-                   Initial input is {(): [(filepath, size), ...]} containing all files.
+            table: The scanned files; group members are row indices into it.
+            groups: Row-index groups.
+                   Initial input is RowGroups.single(table.all_indices()) containing all files.
 
         Returns:
-            Dict with refined group keys, filtering out singleton groups.
+            Refined groups, without singleton groups.
         """
         pass
 
 
-    def _filter_singletons(self, groups: Dict[tuple, List[Tuple[str, int]]]) -> Dict[tuple, List[Tuple[str, int]]]:
+    def _filter_singletons(self, groups: RowGroups) -> RowGroups:
         """Remove groups with only one file (not duplicates)."""
-        return {key: files for key, files in groups.items() if len(files) > 1}
+        new_groups = RowGroups()
+        for group in groups:
+            if len(group) > 1:
+                new_groups.rows.extend(group)
+                new_groups.ends.append(len(new_groups.rows))
+        return new_groups
+
+
+    def _regroup(self, groups: RowGroups, key_of: Callable[[int], object], unit: str) -> RowGroups:
+        """Split every group by key_of(row); rows whose key is None are dropped."""
+        new_groups = RowGroups()
+        total_files = groups.row_count
+        processed = 0
+        unique_keys = 0
+        start_time = time.time()
+        last_update_time = start_time
+        for group in groups:
+            if not self.scanner.is_scanning:
+                break
+            buckets: Dict[object, array] = {}
+            for i in group:
+                key = key_of(i)
+                if key is not None:
+                    bucket = buckets.get(key)
+                    if bucket is None:
+                        buckets[key] = bucket = array("I")
+                    bucket.append(i)
+            unique_keys += len(buckets)
+            for bucket in buckets.values():
+                if len(bucket) > 1:
+                    new_groups.rows.extend(bucket)
+                    new_groups.ends.append(len(new_groups.rows))
+            processed += len(group)
+            # Time-based progress throttling (every 200ms)
+            current_time = time.time()
+            if current_time - last_update_time >= 0.2:
+                self.scanner.update_progress(processed, total_files, start_time, f"{self._get_status_prefix()} | {unique_keys:,} unique {unit} |")
+                last_update_time = current_time
+        return new_groups
+
+
+    def _regroup_vectorized(self, groups: RowGroups, keys: list, valid=None) -> RowGroups:
+        """NumPy version of _regroup for numeric key columns: one sort instead of a per-row loop."""
+        total_files = groups.row_count
+        start_time = time.time()
+        new_groups = group_rows(groups, keys, valid)
+        self.scanner.update_progress(total_files, total_files, start_time, f"{self._get_status_prefix()} | {len(new_groups):,} groups |")
+        return new_groups
+
+
+    def _regroup_by_hash(self, table: FileTable, groups: RowGroups, column: str) -> RowGroups:
+        """Split groups by a FileTable hash column; rows that could not be hashed are dropped."""
+        if np is None:
+            return self._regroup(groups, lambda i: table.get_hash(column, i), "hashes")
+        hashes = table.hash_array(column)
+        if hashes is None:
+            return RowGroups()
+        return self._regroup_vectorized(groups, [hashes[:, 0], hashes[:, 1]], valid=(hashes[:, 0] | hashes[:, 1]) != 0)
+
+
+    def hash_job(self) -> Union[Tuple[str, int, str], None]:
+        """(column, partial_size, partial_mode) for stages that hash files; None for the rest."""
+        return None
 
 
     def _get_status_prefix(self) -> str:
@@ -84,29 +155,10 @@ class SizeStage(ScanStage):
     name = "Size"
     key_prefix = "size"
 
-    def process(self, groups: Dict[tuple, List[Tuple[str, int]]]) -> Dict[tuple, List[Tuple[str, int]]]:
-        new_groups = defaultdict(list)
-        total_files = sum(len(files) for files in groups.values())
-        processed = 0
-        start_time = time.time()
-        last_update_time = start_time
-        for base_key, files in groups.items():
-            if not self.scanner.is_scanning:
-                break
-            for filepath, size in files:
-                if not self.scanner.is_scanning:
-                    break
-                # Append size to existing key
-                new_key = base_key + (self.key_prefix, size)
-                new_groups[new_key].append((filepath, size))
-                processed += 1
-                # Time-based progress throttling (every 200ms)
-                current_time = time.time()
-                if current_time - last_update_time >= 0.2:
-                    unique_groups = len(new_groups)
-                    self.scanner.update_progress(processed, total_files, start_time, f"{self._get_status_prefix()} | {unique_groups:,} unique sizes |")
-                    last_update_time = current_time
-        return self._filter_singletons(dict(new_groups))
+    def process(self, table: FileTable, groups: RowGroups) -> RowGroups:
+        if np is not None:
+            return self._regroup_vectorized(groups, [table.size_array()])
+        return self._regroup(groups, table.sizes.__getitem__, "sizes")
 
 
 #endregion
@@ -119,28 +171,8 @@ class NameStage(ScanStage):
     key_prefix = "name"
 
 
-    def process(self, groups: Dict[tuple, List[Tuple[str, int]]]) -> Dict[tuple, List[Tuple[str, int]]]:
-        new_groups = defaultdict(list)
-        total_files = sum(len(files) for files in groups.values())
-        processed = 0
-        start_time = time.time()
-        last_update_time = start_time
-        for base_key, files in groups.items():
-            if not self.scanner.is_scanning:
-                break
-            for filepath, size in files:
-                if not self.scanner.is_scanning:
-                    break
-                filename = os.path.basename(filepath).lower()
-                new_key = base_key + (self.key_prefix, filename)
-                new_groups[new_key].append((filepath, size))
-                processed += 1
-                current_time = time.time()
-                if current_time - last_update_time >= 0.2:
-                    unique_groups = len(new_groups)
-                    self.scanner.update_progress(processed, total_files, start_time, f"{self._get_status_prefix()} | {unique_groups:,} unique names |")
-                    last_update_time = current_time
-        return self._filter_singletons(dict(new_groups))
+    def process(self, table: FileTable, groups: RowGroups) -> RowGroups:
+        return self._regroup(groups, lambda i: table.name(i).lower(), "names")
 
 
 #endregion
@@ -158,26 +190,50 @@ class PartialHashStage(ScanStage):
         self.partial_size = partial_size
 
 
-    def process(self, groups: Dict[tuple, List[Tuple[str, int]]]) -> Dict[tuple, List[Tuple[str, int]]]:
-        # Flatten groups to get files to hash
-        files_to_hash = []
-        for base_key, files in groups.items():
-            for filepath, size in files:
-                files_to_hash.append((base_key, filepath, size))
-        if not files_to_hash:
-            return {}
+    def hash_job(self) -> Tuple[str, int, str]:
+        return f"{self.key_prefix}:{self.partial_size}", self.partial_size, "head_tail"
+
+
+    def process(self, table: FileTable, groups: RowGroups) -> RowGroups:
+        count = groups.row_count
+        if not count:
+            return RowGroups()
         partial_size_str = self.scanner.format_file_size(self.partial_size)
-        self.scanner._update_status(f"{self._get_status_prefix()} | Hashing {len(files_to_hash):,} files (first {partial_size_str})...")
-        # Use parallel hashing
-        hash_input = [((base_key, size), filepath) for base_key, filepath, size in files_to_hash]
-        hash_results = self.scanner._hash_files_parallel(hash_input, partial_size=self.partial_size, status_prefix=f"{self._get_status_prefix()} |")
-        # Group by hash
-        new_groups = defaultdict(list)
-        for filepath, (context, hash_value) in hash_results.items():
-            base_key, size = context
-            new_key = base_key + (self.key_prefix, self.partial_size, hash_value)
-            new_groups[new_key].append((filepath, size))
-        return self._filter_singletons(dict(new_groups))
+        self.scanner._update_status(f"{self._get_status_prefix()} | Hashing {count:,} files (first {partial_size_str})...")
+        column, partial_size, partial_mode = self.hash_job()
+        self.scanner._hash_table_parallel(table, groups, column, partial_size=partial_size, status_prefix=f"{self._get_status_prefix()} |", partial_mode=partial_mode)
+        return self._regroup_by_hash(table, groups, column)
+
+
+#endregion
+#region SampledHashStage
+
+
+class SampledHashStage(ScanStage):
+    """Group files by MD5 of K evenly spaced blocks (catches files sharing headers/trailers)."""
+    name = "Sampled Hash"
+    key_prefix = "sampled"
+
+
+    def __init__(self, scanner: 'DuplicateScannerDialog', step_num: int, total_steps: int, block_size: int = 4096, samples: int = DEFAULT_SAMPLE_COUNT):
+        super().__init__(scanner, step_num, total_steps)
+        self.block_size = block_size
+        self.samples = samples
+
+
+    def hash_job(self) -> Tuple[str, int, str]:
+        return f"{self.key_prefix}:{self.block_size}:{self.samples}", self.block_size, sampled_mode(self.samples)
+
+
+    def process(self, table: FileTable, groups: RowGroups) -> RowGroups:
+        count = groups.row_count
+        if not count:
+            return RowGroups()
+        block_size_str = self.scanner.format_file_size(self.block_size)
+        self.scanner._update_status(f"{self._get_status_prefix()} | Hashing {count:,} files ({self.samples} × {block_size_str})...")
+        column, partial_size, partial_mode = self.hash_job()
+        self.scanner._hash_table_parallel(table, groups, column, partial_size=partial_size, status_prefix=f"{self._get_status_prefix()} |", partial_mode=partial_mode)
+        return self._regroup_by_hash(table, groups, column)
 
 
 #endregion
@@ -190,44 +246,141 @@ class FullMD5Stage(ScanStage):
     key_prefix = "md5"
 
 
-    def process(self, groups: Dict[tuple, List[Tuple[str, int]]]) -> Dict[tuple, List[Tuple[str, int]]]:
-        # Flatten groups to get files to hash
-        files_to_hash = []
-        total_size = 0
-        for base_key, files in groups.items():
-            for filepath, size in files:
-                files_to_hash.append((base_key, filepath, size))
-                total_size += size
-        if not files_to_hash:
-            return {}
-        total_size_str = self.scanner.format_file_size(total_size)
-        self.scanner._update_status(f"{self._get_status_prefix()} | Hashing {len(files_to_hash):,} files ({total_size_str})...")
-        # Use parallel hashing with partial_size=0 for full hash
-        hash_input = [((base_key, size), filepath) for base_key, filepath, size in files_to_hash]
-        hash_results = self.scanner._hash_files_parallel(hash_input, partial_size=0, status_prefix=f"{self._get_status_prefix()} |")
-        # Group by hash
-        new_groups = defaultdict(list)
-        for filepath, (context, hash_value) in hash_results.items():
-            base_key, size = context
-            new_key = base_key + (self.key_prefix, hash_value)
-            new_groups[new_key].append((filepath, size))
-        return self._filter_singletons(dict(new_groups))
+    def hash_job(self) -> Tuple[str, int, str]:
+        # partial_size=0 for full hash
+        return self.key_prefix, 0, "head_tail"
 
 
+    def process(self, table: FileTable, groups: RowGroups) -> RowGroups:
+        count = groups.row_count
+        if not count:
+            return RowGroups()
+        total_size = table.total_size(groups.rows[:count])
+        total_size_str = self.scanner.format_file_size(total_size)
+        self.scanner._update_status(f"{self._get_status_prefix()} | Hashing {count:,} files ({total_size_str})...")
+        column, partial_size, partial_mode = self.hash_job()
+        self.scanner._hash_table_parallel(table, groups, column, partial_size=partial_size, status_prefix=f"{self._get_status_prefix()} |", partial_mode=partial_mode)
+        return self._regroup_by_hash(table, groups, column)
+
 # Registry of available scan stages
 SCAN_STAGE_REGISTRY: Dict[str, type] = {
     "None": None,
     "Size": SizeStage,
     "Filename": NameStage,
     "Partial Hash": PartialHashStage,
+    "Sampled Hash": SampledHashStage,
     "Full MD5": FullMD5Stage,
 }
 
 
+#endregion
+#region StreamingHashFeeder
+
+
+class StreamingHashFeeder:
+    """
+    Hashes size buckets while discovery is still walking the tree.
+
+    Discovery hands every new row to add(). The first file of a size (of a folder and
+    size in same-folder mode) is held back; once a second one shows up the bucket is
+    released, and its files and every later one are hashed for the pipeline's first
+    hash stage. Digests land in that stage's FileTable column, so the stage only
+    hashes what is left when it runs, and the walk and the hashing overlap.
+    """
+    def __init__(self, scanner: 'DuplicateScannerDialog', table: FileTable, stage: ScanStage, same_folder: bool = False):
+        self.scanner = scanner
+        self.table = table
+        self.stage = stage
+        self.column, self.partial_size, self.partial_mode = stage.hash_job()
+        self.same_folder = same_folder
+        self.submitted = 0
+        self.hashed = 0
+        self._first: Dict[object, int] = {}  # Bucket key -> its only row so far
+        self._released = set()
+        self._links = set()  # Inodes already seen: later hard links are never hashed
+        self._queue = deque()  # Released rows waiting for a worker
+        self._done = queue.SimpleQueue()  # (row, future) from worker threads
+        self._in_flight = 0
+        # Dynamic thread pool sizing based on CPU count (I/O bound, so more than CPU count)
+        max_workers = min(32, (os.cpu_count() or 4) + 4)
+        self._window = max_workers * 4
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        scanner._hash_executor = self._executor
+
+
+    def add(self, row: int) -> None:
+        """Called by discovery for every new row (on the scan thread)."""
+        link = self.table.link_key(row, self.same_folder)
+        if link is not None:
+            if link in self._links:
+                return
+            self._links.add(link)
+        size = self.table.sizes[row]
+        key = (self.table.dir_ids[row], size) if self.same_folder else size
+        if key in self._released:
+            self._queue.append(row)
+        else:
+            first = self._first.pop(key, None)
+            if first is None:
+                self._first[key] = row
+            else:
+                self._released.add(key)
+                self._queue.append(first)
+                self._queue.append(row)
+        self._pump()
+
+
+    def finish(self) -> None:
+        """Hash the rest of the released rows once discovery is over."""
+        self._first.clear()
+        start_time = time.time()
+        status_prefix = f"{self.stage._get_status_prefix()} | Hashing while discovering |"
+        last_update_time = 0.0
+        self._pump()
+        while (self._queue or self._in_flight) and self.scanner.is_scanning:
+            try:
+                self._store(*self._done.get(timeout=0.2))
+            except queue.Empty:
+                pass
+            self._pump()
+            # Time-based progress throttling (every 200ms)
+            current_time = time.time()
+            if current_time - last_update_time >= 0.2 and self.submitted:
+                self.scanner.update_progress(self.hashed, self.submitted + len(self._queue), start_time, status_prefix)
+                last_update_time = current_time
+        self._executor.shutdown(wait=False)
+
+
+    def _pump(self) -> None:
+        while not self._done.empty():
+            self._store(*self._done.get())
+        while self._queue and self._in_flight < self._window:
+            row = self._queue.popleft()
+            future = self._executor.submit(self.scanner._compute_hash_safe, self.table.path(row), self.partial_size, self.partial_mode)
+            future.add_done_callback(lambda f, row=row: self._done.put((row, f)))
+            self._in_flight += 1
+            self.submitted += 1
+
+
+    def _store(self, row: int, future) -> None:
+        # Runs on the scan thread only: FileTable columns are not thread-safe
+        self._in_flight -= 1
+        self.hashed += 1
+        try:
+            hash_value = future.result()
+            if hash_value:
+                self.table.set_hash(self.column, row, hash_value)
+        except Exception as e:
+            self.scanner.app.log(f"Error hashing {self.table.path(row)}: {e}", mode="warning", verbose=3)
+
+
 #endregion
 #region DuplicateScannerDialog
 
 
+RESULTS_PAGE_SIZE = 200  # Groups per page of the results view
+
+
 class DuplicateScannerDialog:
     """Dialog for comprehensive duplicate file scanning with configurable options."""
     def __init__(self, parent, app: 'Main'):
@@ -240,8 +393,23 @@ class DuplicateScannerDialog:
         self.scan_results = {}
         self.selected_folder = ""
         self.duplicate_groups = {}
+        self.hardlink_paths = set()  # Result paths that are extra hard links of another listed path
+        self.group_summaries: List[GroupSummary] = []  # One per duplicate group, largest waste first
+        self.result_table: Union[FileTable, None] = None  # Table behind the current results (scanned or imported)
+        self.result_rows: Dict[tuple, array] = {}  # Group key -> result_table rows, in duplicate_groups order
+        self.result_hash_job: Union[Tuple[str, int, str], None] = None  # hash_job() of the last hash stage behind the results
+        self.scanned_file_count = 0  # Files the current results were found among
+        self._visible_summaries: List[GroupSummary] = []  # group_summaries after the filter, in display order
+        self._results_page = 0
+        self._results_sort = ("wasted", True)  # (column, descending)
+        self._page_groups: Dict[str, GroupSummary] = {}  # Tree item id -> group, for the page shown
+        self._action_job = None  # Running BulkActionJob, if any
+        self.skipped_hardlinks = 0  # Files left out of the pipeline as extra hard links
         self._hash_executor = None  # ThreadPoolExecutor for parallel hashing
         self._eta_tracker = None  # Rolling ETA tracker for accurate estimates
+        self._live_lock = threading.Lock()  # Guards _live (written by the scan thread, read by the progress driver)
+        self._live = {}  # Latest progress/status values from the scan thread
+        self._pulse_frame = 0  # Frame counter for the indeterminate animation
         self.create_dialog()
 
 
@@ -327,7 +495,7 @@ class DuplicateScannerDialog:
         pipeline_frame.grid(row=0, column=0, columnspan=4, sticky="ew", pady=(0, 8))
         ttk.Label(pipeline_frame, text="Scan Pipeline:").grid(row=0, column=0, sticky="w", padx=(0, 10))
         # Available stage options
-        self.stage_options = list(SCAN_STAGE_REGISTRY.keys())  # ["None", "Size", "Filename", "Partial Hash", "Full MD5"]
+        self.stage_options = list(SCAN_STAGE_REGISTRY.keys())  # ["None", "Size", "Filename", "Partial Hash", "Sampled Hash", "Full MD5"]
         # Create 4 step variables and comboboxes
         self.step_vars: List[tk.StringVar] = []
         self.step_combos: List[ttk.Combobox] = []
@@ -395,19 +563,27 @@ class DuplicateScannerDialog:
         ttk.Label(config_frame, text="Partial Hash Size:").grid(row=4, column=0, sticky="w", padx=(0, 10), pady=(8, 0))
         self.partial_size_combo = ttk.Combobox(config_frame, textvariable=self.partial_size_var, values=self.partial_size_labels, state="readonly", width=20)
         self.partial_size_combo.grid(row=4, column=1, sticky="w", pady=(8, 0))
-        Tip(widget=self.partial_size_combo, text="Partial hash size for 'Partial Hash' stages in the pipeline", tooltip_anchor="sw", pady=-2)
+        Tip(widget=self.partial_size_combo, text="Partial hash size for 'Partial Hash' stages, and block size for 'Sampled Hash' stages", tooltip_anchor="sw", pady=-2)
+        # --- Sampled Hash Block Count ---
+        self.sample_count_var = tk.IntVar(value=DEFAULT_SAMPLE_COUNT)
+        ttk.Label(config_frame, text="Sampled Blocks:").grid(row=4, column=2, sticky="w", padx=(0, 10), pady=(8, 0))
+        self.sample_count_spin = ttk.Spinbox(config_frame, from_=2, to=64, textvariable=self.sample_count_var, width=6)
+        self.sample_count_spin.grid(row=4, column=3, sticky="w", pady=(8, 0))
+        Tip(widget=self.sample_count_spin, text="Number of evenly spaced blocks read by 'Sampled Hash' stages", tooltip_anchor="sw", pady=-2)
         # Initial update of partial hash size visibility
         self._on_pipeline_change()
 
 
     def _on_pipeline_change(self, *args):
         """Update UI when pipeline configuration changes (e.g., show/hide partial hash size)."""
-        # Check if any step uses Partial Hash
-        uses_partial_hash = any(var.get() == "Partial Hash" for var in self.step_vars)
+        # Check if any step uses Partial Hash / Sampled Hash
+        uses_sampled_hash = any(var.get() == "Sampled Hash" for var in self.step_vars)
+        uses_partial_hash = uses_sampled_hash or any(var.get() == "Partial Hash" for var in self.step_vars)
         if uses_partial_hash:
             self.partial_size_combo.config(state="readonly")
         else:
             self.partial_size_combo.config(state="disabled")
+        self.sample_count_spin.config(state="normal" if uses_sampled_hash else "disabled")
 
 
     def _get_active_stages(self) -> List[str]:
@@ -428,6 +604,12 @@ class DuplicateScannerDialog:
                 continue
             if stage_class == PartialHashStage:
                 stage = stage_class(self, i, total_steps, partial_size=partial_size)
+            elif stage_class == SampledHashStage:
+                try:
+                    samples = max(2, int(self.sample_count_var.get()))
+                except (tk.TclError, ValueError):
+                    samples = DEFAULT_SAMPLE_COUNT
+                stage = stage_class(self, i, total_steps, block_size=partial_size, samples=samples)
             else:
                 stage = stage_class(self, i, total_steps)
             pipeline.append(stage)
@@ -454,10 +636,20 @@ class DuplicateScannerDialog:
         Tip(widget=self.scan_button, text="Start scanning for duplicate files", tooltip_anchor="sw", pady=-2)
         self.cancel_button = ttk.Button(scan_frame, text="Cancel", command=self.cancel_scan, state="disabled")
         self.cancel_button.pack(side="left", padx=(0, 8))
-        Tip(widget=self.cancel_button, text="Cancel the current scan", tooltip_anchor="sw", pady=-2)
+        Tip(widget=self.cancel_button, text="Cancel the current scan or file action", tooltip_anchor="sw", pady=-2)
+        self.undo_button = ttk.Button(scan_frame, text="Undo Last Action", command=self.undo_last_action, state="disabled")
+        self.undo_button.pack(side="left", padx=(0, 8))
+        Tip(widget=self.undo_button, text="Put back the files of the last Move Duplicates or Delete Duplicates (to trash) action", tooltip_anchor="sw", pady=-2)
+        self._update_undo_button()
         self.close_button = ttk.Button(scan_frame, text="Close", command=self.on_close)
         self.close_button.pack(side="right")
         Tip(widget=self.close_button, text="Close this dialog", tooltip_anchor="sw", pady=-2)
+        self.export_button = ttk.Button(scan_frame, text="Export Results...", command=self.export_scan_results, state="disabled")
+        self.export_button.pack(side="right", padx=(0, 8))
+        Tip(widget=self.export_button, text="Save the duplicate groups (paths, sizes, hashes) as JSONL, CSV or SQLite", tooltip_anchor="sw", pady=-2)
+        self.import_button = ttk.Button(scan_frame, text="Import Results...", command=self.import_scan_results)
+        self.import_button.pack(side="right", padx=(0, 8))
+        Tip(widget=self.import_button, text="Load saved scan results to review or act on them without scanning again", tooltip_anchor="sw", pady=-2)
         # Progress Bar Row
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(control_frame, variable=self.progress_var, mode='determinate')
@@ -469,20 +661,27 @@ class DuplicateScannerDialog:
         # Action Buttons Row
         action_frame = ttk.Frame(control_frame)
         action_frame.grid(row=4, column=0, sticky="ew")
-        action_frame.grid_columnconfigure(3, weight=1)
+        action_frame.grid_columnconfigure(4, weight=1)
         self.delete_button = ttk.Button(action_frame, text="Delete Duplicates", command=self.delete_duplicates, state="disabled")
         self.delete_button.grid(row=0, column=0, padx=(0, 8))
         Tip(widget=self.delete_button, text="Delete all but one file in each duplicate group", tooltip_anchor="sw", pady=-2)
         self.move_button = ttk.Button(action_frame, text="Move Duplicates", command=self.move_duplicates, state="disabled")
         self.move_button.grid(row=0, column=1, padx=(0, 8))
         Tip(widget=self.move_button, text="Move duplicate files to a separate folder", tooltip_anchor="sw", pady=-2)
+        self.link_button = ttk.Menubutton(action_frame, text="Link Duplicates", state="disabled")
+        link_menu = tk.Menu(self.link_button, tearoff=False)
+        link_menu.add_command(label="Replace with Hard Links", command=lambda: self.link_duplicates("hardlink"))
+        link_menu.add_command(label="Replace with Reflinks (Copy-on-Write)", command=lambda: self.link_duplicates("reflink"))
+        self.link_button.config(menu=link_menu)
+        self.link_button.grid(row=0, column=2, padx=(0, 8))
+        Tip(widget=self.link_button, text="Reclaim space without deleting any path: duplicates become hard links or reflinks (Btrfs/XFS) of the first file in each group", tooltip_anchor="sw", pady=-2)
         self.interactive_button = ttk.Button(action_frame, text="Interactive Review", command=self.open_interactive_review, state="disabled")
-        self.interactive_button.grid(row=0, column=2, padx=(0, 15))
+        self.interactive_button.grid(row=0, column=3, padx=(0, 15))
         Tip(widget=self.interactive_button, text="Review and process duplicates interactively", tooltip_anchor="sw", pady=-2)
         # Action status info
         self.action_info_var = tk.StringVar(value="Scan for duplicates first")
         action_info_label = ttk.Label(action_frame, textvariable=self.action_info_var, foreground="gray")
-        action_info_label.grid(row=0, column=3, sticky="w")
+        action_info_label.grid(row=0, column=4, sticky="w")
 
 
     # --- Results Frame ---
@@ -491,18 +690,40 @@ class DuplicateScannerDialog:
         results_frame.grid(row=3, column=0, sticky="nsew")
         results_frame.grid_rowconfigure(1, weight=1)
         results_frame.grid_columnconfigure(0, weight=1)
-        # Results text
-        self.results_text = scrolledtext.ScrolledText(results_frame, wrap=tk.WORD, height=12, padx=4, pady=4, state="normal")
-        self.results_text.grid(row=1, column=0, sticky="nsew")
-        Tip(widget=self.results_text, text="Results of the duplicate scan", tooltip_anchor="sw", pady=-2)
-        # Search
-        text_search = ntk.FindReplaceEntry(results_frame, self.results_text, show_replace=False)
-        text_search.grid(row=0, column=0, sticky="ew")
-        text_search.grid_remove()
-        # Bind keyboard shortcuts from the text widget to the find/replace widget
-        self.results_text.bind("<Control-f>", text_search.show_widget)
-        self.results_text.bind("<KeyRelease>", text_search.perform_search)
-        self.results_text.bind("<Escape>", text_search.hide_widget)
+        # Summary + filter row
+        header_frame = ttk.Frame(results_frame)
+        header_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 4))
+        header_frame.grid_columnconfigure(0, weight=1)
+        self.results_summary_var = tk.StringVar(value="")
+        ttk.Label(header_frame, textvariable=self.results_summary_var).grid(row=0, column=0, sticky="w")
+        self.results_filter_var = tk.StringVar()
+        self.results_filter_entry = ttk.Entry(header_frame, textvariable=self.results_filter_var, width=24)
+        self.results_filter_entry.grid(row=0, column=1, sticky="e")
+        self.results_filter_entry.bind("<Return>", lambda event: self._apply_results_filter())
+        self.results_filter_entry.bind("<Escape>", lambda event: (self.results_filter_var.set(""), self._apply_results_filter()))
+        Tip(widget=self.results_filter_entry, text="Filter: show only groups with a path containing this text (Enter to apply, Esc to clear)", tooltip_anchor="sw", pady=-2)
+        # Results tree: one row per group on the current page, files are added when a group is expanded
+        self.results_tree = ttk.Treeview(results_frame, columns=("size", "wasted"), show="tree headings", selectmode="browse", height=12)
+        self.results_tree.grid(row=1, column=0, sticky="nsew")
+        vscroll = ttk.Scrollbar(results_frame, orient="vertical", command=self.results_tree.yview)
+        vscroll.grid(row=1, column=1, sticky="ns")
+        self.results_tree.configure(yscrollcommand=vscroll.set)
+        self.results_tree.column("#0", width=420, stretch=True, anchor="w")
+        self.results_tree.column("size", width=90, stretch=False, anchor="e")
+        self.results_tree.column("wasted", width=90, stretch=False, anchor="e")
+        self._update_results_headings()
+        self.results_tree.bind("<<TreeviewOpen>>", self._on_result_group_open)
+        self.results_tree.bind("<Control-f>", lambda event: self.results_filter_entry.focus_set())
+        Tip(widget=self.results_tree, text="Results of the duplicate scan: expand a group to list its files, click a heading to sort", tooltip_anchor="sw", pady=-2)
+        # Pager
+        pager_frame = ttk.Frame(results_frame)
+        pager_frame.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(4, 0))
+        self.prev_page_button = ttk.Button(pager_frame, text="◀ Prev", width=8, command=lambda: self._show_results_page(self._results_page - 1), state="disabled")
+        self.prev_page_button.pack(side="left")
+        self.results_page_var = tk.StringVar(value="")
+        ttk.Label(pager_frame, textvariable=self.results_page_var, foreground="gray").pack(side="left", padx=8)
+        self.next_page_button = ttk.Button(pager_frame, text="Next ▶", width=8, command=lambda: self._show_results_page(self._results_page + 1), state="disabled")
+        self.next_page_button.pack(side="left")
 
 
     # --- Status Bar ---
@@ -549,7 +770,7 @@ class DuplicateScannerDialog:
         self._set_scan_buttons_state(scanning=True)
         self._set_action_buttons_state(enabled=False)
         self.action_info_var.set("Scanning in progress...")
-        self.results_text.delete(1.0, tk.END)
+        self._clear_results()
         self.progress_var.set(0)
         self.scan_start_time = time.time()
         self._eta_tracker = None  # Reset ETA tracker for new scan
@@ -557,13 +778,20 @@ class DuplicateScannerDialog:
         self.overall_progress_bar.grid_remove()
         self.overall_eta_label.grid_remove()
         self.progress_bar.config(mode='indeterminate')
-        self.progress_bar.start(10)
+        with self._live_lock:
+            self._live = {"pulse": True}
+        # Scan-thread updates are rendered by the shared progress driver, one frame at a time
+        self.app.progress_driver.add(self._progress_key, self._sample_live, self._render_live)
         # Start scan in separate thread
         self.scan_thread = threading.Thread(target=self.perform_scan, daemon=True)
         self.scan_thread.start()
 
 
     def cancel_scan(self):
+        if self._action_job is not None:
+            self._action_job.cancel()
+            self.status_var.set("Cancelling action...")
+            return
         self.is_scanning = False
         self.status_var.set("Cancelling scan...")
 
@@ -572,16 +800,25 @@ class DuplicateScannerDialog:
         try:
             self.scan_start_time = time.time()
             self._update_status("Discovering files...")
-            # Get all files with cached sizes: List[(filepath, size)]
-            files_with_sizes = self.get_all_files()
+            # Get all files with cached sizes as a columnar FileTable
+            file_table = FileTable()
+            feeder = self._make_stream_feeder(file_table)
+            with metrics.timer("scan.discover") as t:
+                self.get_all_files(file_table, on_row=feeder.add if feeder else None)
+                t.items = len(file_table)
+            if feeder is not None:
+                with metrics.timer("scan.stream_hash") as t:
+                    feeder.finish()
+                    t.items = feeder.hashed
             # Stop indeterminate animation and switch to determinate mode
+            self._publish(pulse=False)
             self.dialog.after(0, self._switch_to_determinate_progress)
-            if not files_with_sizes:
+            if not len(file_table):
                 self.dialog.after(0, lambda: self.scan_complete("No files found to scan."))
                 return
-            total_files = len(files_with_sizes)
+            total_files = len(file_table)
             # Calculate total size from cached sizes (no extra stat calls)
-            total_size = sum(size for _, size in files_with_sizes)
+            total_size = file_table.total_size()
             total_size_str = self.format_file_size(total_size)
             # Get pipeline description for status
             active_stages = self._get_active_stages()
@@ -592,7 +829,7 @@ class DuplicateScannerDialog:
                 self.dialog.after(0, self.overall_progress_bar.grid)
                 self.dialog.after(0, self.overall_eta_label.grid)
                 # Count unique folders for same-folder mode
-                unique_folders = len(set(os.path.dirname(fp) for fp, _ in files_with_sizes))
+                unique_folders = len(file_table.dirs)
                 self._update_status(f"Analyzing {total_files:,} files across {unique_folders:,} folders...")
             else:
                 self.dialog.after(0, self.overall_progress_bar.grid_remove)
@@ -600,7 +837,7 @@ class DuplicateScannerDialog:
             # Reset analysis start time for accurate ETA during duplicate finding
             self.analysis_start_time = time.time()
             # Group files and find duplicates using the modular pipeline
-            duplicates = self.find_duplicates(files_with_sizes)
+            duplicates = self.find_duplicates(file_table)
             if not self.is_scanning:
                 self.dialog.after(0, lambda: self.scan_complete("Scan cancelled."))
                 return
@@ -616,6 +853,15 @@ class DuplicateScannerDialog:
                 self._hash_executor = None
 
 
+    def _make_stream_feeder(self, table: FileTable) -> Union[StreamingHashFeeder, None]:
+        """Stream discovery into hashing when the pipeline starts with Size followed by a hash stage."""
+        pipeline = self._build_pipeline()
+        if len(pipeline) < 2 or not isinstance(pipeline[0], SizeStage) or pipeline[1].hash_job() is None:
+            return None
+        same_folder = bool(getattr(self, "same_folder_only_var", None) and self.same_folder_only_var.get())
+        return StreamingHashFeeder(self, table, pipeline[1], same_folder=same_folder)
+
+
     def _switch_to_determinate_progress(self) -> None:
         """Switch progress bar from indeterminate to determinate mode."""
         self.progress_bar.stop()
@@ -623,24 +869,57 @@ class DuplicateScannerDialog:
         self.progress_var.set(0)
 
 
+    @property
+    def _progress_key(self) -> str:
+        return f"scanner-{id(self)}"
+
+
+    def _publish(self, **values) -> None:
+        """Thread-safe: store the latest values; the progress driver renders them on its next frame."""
+        with self._live_lock:
+            self._live.update(values)
+
+
+    def _sample_live(self):
+        """Progress driver sample: a snapshot of the latest values, or None once the scan has ended."""
+        if not self.is_scanning:
+            return None
+        with self._live_lock:
+            live = dict(self._live)
+        if live.get("pulse"):
+            self._pulse_frame += 1
+            live["frame"] = self._pulse_frame
+        return tuple(sorted(live.items()))
+
+
+    def _render_live(self, snapshot) -> None:
+        live = dict(snapshot)
+        if live.get("pulse"):
+            self.progress_bar.step(5)
+        elif "progress" in live:
+            self.progress_var.set(live["progress"])
+        if "status" in live:
+            self.status_var.set(live["status"])
+        if "overall" in live:
+            self.overall_progress_var.set(live["overall"])
+        if "eta" in live:
+            self.overall_eta_var.set(live["eta"])
+
+
     def _update_status(self, message: str) -> None:
-        """Thread-safe status update via dialog.after()."""
-        self.dialog.after(0, lambda: self.status_var.set(message))
+        self._publish(status=message)
 
 
     def _update_progress(self, value: float) -> None:
-        """Thread-safe progress update via dialog.after()."""
-        self.dialog.after(0, lambda: self.progress_var.set(value))
+        self._publish(progress=value)
 
 
     def _update_overall_progress(self, value: float) -> None:
-        """Thread-safe overall progress update via dialog.after()."""
-        self.dialog.after(0, lambda: self.overall_progress_var.set(value))
+        self._publish(overall=value)
 
 
     def _update_overall_eta(self, message: str) -> None:
-        """Thread-safe overall ETA update via dialog.after()."""
-        self.dialog.after(0, lambda: self.overall_eta_var.set(message))
+        self._publish(eta=message)
 
 
     def _validate_file_exists(self, filepath: str) -> bool:
@@ -658,6 +937,7 @@ class DuplicateScannerDialog:
         self.scan_button.config(state=scan_state)
         self.cancel_button.config(state=cancel_state)
         self.browse_button.config(state=scan_state)
+        self.import_button.config(state=scan_state)
 
 
     def _set_action_buttons_state(self, enabled: bool) -> None:
@@ -665,7 +945,9 @@ class DuplicateScannerDialog:
         state = "normal" if enabled else "disabled"
         self.delete_button.config(state=state)
         self.move_button.config(state=state)
+        self.link_button.config(state=state)
         self.interactive_button.config(state=state)
+        self.export_button.config(state=state)
 
 
     def _group_files_by_size(self, files_with_sizes: List[Tuple[str, int]], total_files: int, status_prefix: str, progress_weight: float = 1.0) -> Dict[int, List[str]]:
@@ -686,7 +968,7 @@ class DuplicateScannerDialog:
         return dict(size_groups)
 
 
-    def _hash_files_parallel(self, files_with_context: List[tuple], partial_size: int, status_prefix: str) -> Dict[str, tuple]:
+    def _hash_files_parallel(self, files_with_context: List[tuple], partial_size: int, status_prefix: str, partial_mode: str = "head_tail") -> Dict[str, tuple]:
         """
         Hash files in parallel using ThreadPoolExecutor.
 
@@ -694,6 +976,7 @@ class DuplicateScannerDialog:
             files_with_context: List of (context_data, filepath) tuples. Context is returned with hash result.
             partial_size: Bytes to hash (0 for full hash).
             status_prefix: Status message prefix for progress updates.
+            partial_mode: Partial hash mode for partial_size > 0 ("head_tail" or "sampled:<K>").
 
         Returns:
             Dict of {filepath: (context_data, hash_value)} for successful hashes.
@@ -710,7 +993,7 @@ class DuplicateScannerDialog:
                 break
             if not self._validate_file_exists(filepath):
                 continue
-            future = self._hash_executor.submit(self._compute_hash_safe, filepath, partial_size)
+            future = self._hash_executor.submit(self._compute_hash_safe, filepath, partial_size, partial_mode)
             futures[future] = (context_data, filepath)
         hash_start_time = time.time()
         last_update_time = hash_start_time
@@ -737,6 +1020,61 @@ class DuplicateScannerDialog:
         return hash_results
 
 
+    def _hash_table_parallel(self, table: FileTable, groups: RowGroups, column: str, partial_size: int, status_prefix: str, partial_mode: str = "head_tail") -> None:
+        """
+        Hash every row in groups in parallel and store the digests in a FileTable column.
+
+        Only a bounded window of hashes is in flight, so memory does not grow with the
+        number of files. Rows that already have a digest in the column (hashed while
+        discovering) are skipped; rows that can't be hashed keep an empty digest.
+        """
+        total_to_hash = groups.row_count
+        if not total_to_hash:
+            return
+        # Dynamic thread pool sizing based on CPU count (I/O bound, so more than CPU count)
+        max_workers = min(32, (os.cpu_count() or 4) + 4)
+        self._hash_executor = ThreadPoolExecutor(max_workers=max_workers)
+        in_flight = {}
+        window = max_workers * 4
+        hash_start_time = time.time()
+        last_update_time = hash_start_time
+        processed = 0
+        unique_hashes = set()
+
+        def _collect(done) -> None:
+            nonlocal processed, last_update_time
+            for future in done:
+                i = in_flight.pop(future)
+                try:
+                    hash_value = future.result()
+                    if hash_value:
+                        table.set_hash(column, i, hash_value)
+                        unique_hashes.add(hash_value)
+                except Exception as e:
+                    self.app.log(f"Error hashing {table.path(i)}: {e}", mode="warning", verbose=3)
+                processed += 1
+            # Time-based progress throttling (every 200ms)
+            current_time = time.time()
+            if current_time - last_update_time >= 0.2:
+                self.update_progress(processed, total_to_hash, hash_start_time, f"{status_prefix} {len(unique_hashes):,} unique |")
+                last_update_time = current_time
+
+        for i in groups.rows[:total_to_hash]:
+            if not self.is_scanning:
+                break
+            if table.get_hash(column, i) is not None:
+                processed += 1
+                continue
+            if len(in_flight) >= window:
+                done, _pending = wait(in_flight, return_when=FIRST_COMPLETED)
+                _collect(done)
+            future = self._hash_executor.submit(self._compute_hash_safe, table.path(i), partial_size, partial_mode)
+            in_flight[future] = i
+        while in_flight and self.is_scanning:
+            done, _pending = wait(in_flight, return_when=FIRST_COMPLETED)
+            _collect(done)
+
+
     def scan_complete(self, message: str, is_error: bool = False):
         self.is_scanning = False
         self._set_scan_buttons_state(scanning=False)
@@ -767,17 +1105,24 @@ class DuplicateScannerDialog:
                     self.scan_thread.join(timeout=1.0)
             else:
                 return
+        if self._action_job is not None:
+            if not ntk.askyesno("Cancel Action", "A file action is in progress.\n\nStop it and close?", detail="Files already processed stay processed; moves can be undone later."):
+                return
+            self._action_job.cancel()
+            self._action_job.wait(timeout=2.0)
+            self._action_job = None
+        self.app.progress_driver.remove(self._progress_key)
+        self.app.progress_driver.remove(self._action_progress_key)
         self.dialog.destroy()
 
 
     # --- File Gathering ---
-    def get_all_files(self) -> List[Tuple[str, int]]:
-        """Gather all files with their sizes. Returns List[(filepath, size)]."""
-        files = []  # List of (filepath, size) tuples
+    def get_all_files(self, files: Union[FileTable, None] = None, on_row: Union[Callable[[int], None], None] = None) -> FileTable:
+        """Gather all files with their sizes and mtimes into a FileTable; on_row(i) is called for every new row."""
+        files = files if files is not None else FileTable()
         min_size_bytes = self.min_size_var.get() * 1024  # Min in KB -> bytes
         max_size_mb = self.max_size_var.get()
         max_size_bytes = max_size_mb * 1024 * 1024 if max_size_mb > 0 else None  # Max in MB -> bytes
-        file_count = 0
         folder_count = 0
         error_count = 0
         last_update_time = time.time()
@@ -792,148 +1137,104 @@ class DuplicateScannerDialog:
                 if not ext.startswith('.'):
                     ext = '.' + ext
                 allowed_exts.add(ext.lower())
-        if self.include_subfolders_var.get():
-            # Initialize counters for recursive scan
-            self._folder_count = 0
-            self._error_count = 0
-            # Use os.scandir recursively for better performance
-            self._scan_directory_recursive(self.selected_folder, files, min_size_bytes, max_size_bytes,
-                                           filter_enabled, allowed_exts, last_update_time)
-            file_count = len(files)
-            error_count = self._error_count
-        else:
-            # Single folder scan using os.scandir
-            try:
-                with os.scandir(self.selected_folder) as entries:
-                    for entry in entries:
-                        if not self.is_scanning:
-                            break
-                        if entry.is_file(follow_symlinks=False):
-                            # Check extension BEFORE stat call to avoid unnecessary I/O
-                            if filter_enabled:
-                                ext = os.path.splitext(entry.name)[1].lower()
-                                if ext not in allowed_exts:
-                                    continue
-                            try:
-                                # Use cached stat from DirEntry
-                                stat_info = entry.stat(follow_symlinks=False)
-                                size = stat_info.st_size
-                                if size >= min_size_bytes and (max_size_bytes is None or size <= max_size_bytes):
-                                    files.append((entry.path, size))
-                                    file_count += 1
-                                    # Update status periodically
-                                    current_time = time.time()
-                                    if current_time - last_update_time >= 0.1:
-                                        self._update_status(f"Discovering: {file_count:,} files")
-                                        last_update_time = current_time
-                            except (OSError, IOError) as e:
-                                error_count += 1
-                                self.app.log(f"Error accessing file {entry.path}: {e}", mode="warning", verbose=4)
-                                continue
-            except (OSError, IOError) as e:
-                self.app.log(f"Error reading directory {self.selected_folder}: {e}", mode="error", verbose=2)
+        # Directories are listed on a small thread pool; filters run on each DirEntry before any stat
+        listings = fast_discovery.scan_files(
+            self.selected_folder,
+            recursive=self.include_subfolders_var.get(),
+            extensions=allowed_exts if filter_enabled else None,
+            min_size=min_size_bytes,
+            max_size=max_size_bytes,
+            cancelled=lambda: not self.is_scanning,
+        )
+        for listing in listings:
+            folder_count += 1
+            for path, e in listing.errors:
+                if path == listing.path:
+                    self.app.log(f"Error reading directory {path}: {e}", mode="warning", verbose=3)
+                    continue
+                error_count += 1
+                self.app.log(f"Error accessing {path}: {e}", mode="warning", verbose=4)
+            if listing.files:
+                dir_id = files.add_dir(listing.path)
+                for name, size, mtime, link in listing.files:
+                    row = files.append(dir_id, name, size, mtime, link)
+                    if on_row is not None:
+                        on_row(row)
+            # Update status periodically
+            current_time = time.time()
+            if current_time - last_update_time >= 0.1:
+                self._update_status(f"Discovering: {len(files):,} files | {folder_count:,} folders | {os.path.basename(listing.path)}")
+                last_update_time = current_time
         if error_count > 0:
             self.app.log(f"Scan encountered {error_count} file access errors", mode="warning", verbose=2)
         # Final status update with total counts
         elapsed = time.time() - self.scan_start_time
-        folder_count = getattr(self, '_folder_count', 1)
         self._update_status(f"Found {len(files):,} files in {folder_count:,} folders ({elapsed:.1f}s)")
         return files
 
 
-    def _scan_directory_recursive(self, directory: str, files: List[Tuple[str, int]],
-                                   min_size_bytes: int, max_size_bytes: Union[int, None],
-                                   filter_enabled: bool, allowed_exts: set,
-                                   last_update_time: float) -> float:
-        """Recursively scan directory using os.scandir. Returns updated last_update_time."""
-        folder_count = getattr(self, '_folder_count', 0)
-        error_count = getattr(self, '_error_count', 0)
-        try:
-            with os.scandir(directory) as entries:
-                subdirs = []
-                for entry in entries:
-                    if not self.is_scanning:
-                        break
-                    try:
-                        if entry.is_dir(follow_symlinks=False):
-                            subdirs.append(entry.path)
-                        elif entry.is_file(follow_symlinks=False):
-                            # Check extension BEFORE stat call to avoid unnecessary I/O
-                            if filter_enabled:
-                                ext = os.path.splitext(entry.name)[1].lower()
-                                if ext not in allowed_exts:
-                                    continue
-                            # Use cached stat from DirEntry
-                            stat_info = entry.stat(follow_symlinks=False)
-                            size = stat_info.st_size
-                            if size >= min_size_bytes and (max_size_bytes is None or size <= max_size_bytes):
-                                files.append((entry.path, size))
-                    except (OSError, IOError) as e:
-                        error_count += 1
-                        self.app.log(f"Error accessing {entry.path}: {e}", mode="warning", verbose=4)
-                        continue
-                folder_count += 1
-                self._folder_count = folder_count
-                self._error_count = error_count
-                # Update status periodically
-                current_time = time.time()
-                if current_time - last_update_time >= 0.1:
-                    rel_path = os.path.relpath(directory, self.selected_folder)
-                    if rel_path == '.':
-                        display_path = os.path.basename(self.selected_folder)
-                    else:
-                        display_path = rel_path if len(rel_path) <= 40 else "..." + rel_path[-37:]
-                    self._update_status(f"Discovering: {len(files):,} files | {folder_count:,} folders | {display_path}")
-                    last_update_time = current_time
-                # Recurse into subdirectories
-                for subdir in subdirs:
-                    if not self.is_scanning:
-                        break
-                    last_update_time = self._scan_directory_recursive(
-                        subdir, files, min_size_bytes, max_size_bytes,
-                        filter_enabled, allowed_exts, last_update_time
-                    )
-        except (OSError, IOError) as e:
-            self.app.log(f"Error reading directory {directory}: {e}", mode="warning", verbose=3)
-        return last_update_time
-
-
     # --- Duplicate Finding (Pipeline-based) ---
-    def find_duplicates(self, files_with_sizes: List[Tuple[str, int]]) -> Dict[tuple, List[str]]:
+    def find_duplicates(self, table: FileTable) -> Dict[tuple, List[str]]:
         """
         Find duplicate files using the modular pipeline system.
 
         The pipeline processes files through a series of stages, each refining
         the groupings. Files that end up in groups with >1 member are duplicates.
         """
-        total_files = len(files_with_sizes)
-        # Check for same-folder mode
-        if getattr(self, "same_folder_only_var", None) and self.same_folder_only_var.get():
-            duplicates = self._find_duplicates_same_folder_pipeline(files_with_sizes)
+        same_folder = bool(getattr(self, "same_folder_only_var", None) and self.same_folder_only_var.get())
+        # Extra hard links of an inode are the same file: group by (st_dev, st_ino) first and keep
+        # them out of the pipeline, so they are never hashed
+        aliases = table.hardlink_aliases(same_folder)
+        skip = set()
+        for rows in aliases.values():
+            skip.update(rows)
+        if same_folder:
+            duplicates = self._find_duplicates_same_folder_pipeline(table, skip)
         else:
-            duplicates = self._run_pipeline(files_with_sizes)
-        # Convert from Dict[tuple, List[Tuple[str, int]]] to Dict[tuple, List[str]]
-        # (strip size info for final result)
-        result = {}
-        for key, files in duplicates.items():
-            file_paths = [fp for fp, _ in files]
-            if len(file_paths) > 1:
-                result[key] = file_paths
-        return result
-
-
-    def _run_pipeline(self, files_with_sizes: List[Tuple[str, int]]) -> Dict[tuple, List[Tuple[str, int]]]:
+            rows = array("I", (i for i in range(len(table)) if i not in skip)) if skip else table.all_indices()
+            duplicates = {("group", n): group for n, group in enumerate(self._run_pipeline(table, RowGroups.single(rows)))}
+        # Resolve row indices to paths only for the (few) duplicate groups; hard links follow their inode.
+        # Sizes come from the table, so the results view never has to stat a file.
+        results = {}
+        result_rows = {}
+        summaries = []
+        self.hardlink_paths = set()
+        for key, group in duplicates.items():
+            if len(group) < 2:
+                continue
+            paths = []
+            rows = array("I")
+            for i in group:
+                paths.append(table.path(i))
+                rows.append(int(i))
+                for alias in aliases.get(int(i), ()):
+                    alias_path = table.path(alias)
+                    paths.append(alias_path)
+                    rows.append(alias)
+                    self.hardlink_paths.add(alias_path)
+            results[key] = paths
+            result_rows[key] = rows
+            summaries.append(scan_results.summarize(key, table, rows, len(rows) - len(group)))
+        summaries.sort(key=lambda summary: summary.wasted, reverse=True)
+        self.group_summaries = summaries
+        self.result_table = table
+        self.result_rows = result_rows
+        self.skipped_hardlinks = len(skip)
+        return results
+
+
+    def _run_pipeline(self, table: FileTable, groups: RowGroups) -> RowGroups:
         """
-        Run the modular scan pipeline on the given files.
+        Run the modular scan pipeline on the given row-index groups.
 
-        Returns Dict[tuple, List[Tuple[str, int]]] with groups of (filepath, size) tuples.
+        Returns the surviving groups of row indices.
         """
         # Build the pipeline from user configuration
         pipeline = self._build_pipeline()
         if not pipeline:
-            return {}
-        # Initialize with all files in a single group (empty key tuple)
-        groups: Dict[tuple, List[Tuple[str, int]]] = {(): files_with_sizes}
+            return RowGroups()
+        hash_jobs = [stage.hash_job() for stage in pipeline if stage.hash_job() is not None]
+        self.result_hash_job = hash_jobs[-1] if hash_jobs else None  # The most specific hash, exported with results
         # Run each stage in sequence
         for stage in pipeline:
             if not self.is_scanning:
@@ -941,38 +1242,45 @@ class DuplicateScannerDialog:
             # Reset ETA tracker for each stage
             self._eta_tracker = None
             self.analysis_start_time = time.time()
-            groups = stage.process(groups)
+            with metrics.timer(f"scan.{stage.key_prefix}") as t:
+                if metrics.enabled:
+                    t.items = groups.row_count
+                groups = stage.process(table, groups)
             # Early exit if no potential duplicates remain
             if not groups:
                 break
         return groups
 
 
-    def _find_duplicates_same_folder_pipeline(self, files_with_sizes: List[Tuple[str, int]]) -> Dict[tuple, List[Tuple[str, int]]]:
+    def _find_duplicates_same_folder_pipeline(self, table: FileTable, skip: frozenset = frozenset()) -> Dict[tuple, array]:
         """
         Find duplicates within same folder only, using the modular pipeline.
 
         Groups files by folder first, then runs the pipeline on each folder's files separately.
+        Rows in skip are left out.
         """
-        # Group files by their parent folder
-        folder_groups = defaultdict(list)
-        for filepath, size in files_with_sizes:
-            folder = os.path.dirname(filepath)
-            folder_groups[folder].append((filepath, size))
+        # Group row indices by their parent folder
+        folder_groups: Dict[int, array] = {}
+        for i, dir_id in enumerate(table.dir_ids):
+            if i in skip:
+                continue
+            group = folder_groups.get(dir_id)
+            if group is None:
+                folder_groups[dir_id] = group = array("I")
+            group.append(i)
         all_duplicates = {}
         total_folders = len(folder_groups)
         overall_start_time = time.time()
-        for folder_idx, (folder, folder_files) in enumerate(folder_groups.items()):
+        for folder_idx, (dir_id, folder_files) in enumerate(folder_groups.items()):
             if not self.is_scanning:
                 break
             # Update overall progress
             self.update_overall_progress(folder_idx, total_folders, overall_start_time)
-            # Run pipeline on this folder's files
-            folder_duplicates = self._run_pipeline(folder_files)
-            # Prefix keys with folder to avoid collisions
-            for key, files in folder_duplicates.items():
-                prefixed_key = (folder,) + key
-                all_duplicates[prefixed_key] = files
+            if len(folder_files) < 2:
+                continue
+            # Run pipeline on this folder's files; prefix keys with folder to avoid collisions
+            for n, group in enumerate(self._run_pipeline(table, RowGroups.single(folder_files))):
+                all_duplicates[(table.dirs[dir_id], n)] = group
         # Final progress update
         self.update_overall_progress(total_folders, total_folders, overall_start_time)
         return all_duplicates
@@ -1048,12 +1356,12 @@ class DuplicateScannerDialog:
         return md5_groups
 
 
-    def _compute_hash_safe(self, filepath: str, partial_size: int = 0) -> str:
+    def _compute_hash_safe(self, filepath: str, partial_size: int = 0, partial_mode: str = "head_tail") -> str:
         """Safely compute hash with error handling. Returns empty string on error."""
         try:
             if not os.path.exists(filepath):
                 return ""
-            return cached_get_md5(filepath, partial_size=partial_size)
+            return cached_get_md5(filepath, partial_size=partial_size, partial_mode=partial_mode)
         except (OSError, IOError) as e:
             self.app.log(f"Error hashing {filepath}: {e}", mode="warning", verbose=3)
             return ""
@@ -1136,50 +1444,118 @@ class DuplicateScannerDialog:
 
 
     def display_results(self, duplicates: Dict[tuple, List[str]], total_files: int):
-        self.results_text.delete(1.0, tk.END)
         self.duplicate_groups = duplicates
+        self.scanned_file_count = total_files
+        self.results_filter_var.set("")
         if not duplicates:
-            self.results_text.insert(tk.END, f"No duplicate files found!\n\n")
-            self.results_text.insert(tk.END, f"Scanned {total_files} files in total.\n")
+            self._clear_results()
+            self.results_summary_var.set(f"No duplicate files found. Scanned {total_files:,} files in total.")
             self.scan_complete("Scan completed - no duplicates found.")
             self.update_action_buttons(False)
             return
-        duplicate_files = sum(len(group) for group in duplicates.values())
-        duplicate_groups = len(duplicates)
-        self.results_text.insert(tk.END, f"DUPLICATE FILES FOUND:\n")
-        self.results_text.insert(tk.END, f"{'='*50}\n\n")
-        self.results_text.insert(tk.END, f"Found {duplicate_files} duplicate files in {duplicate_groups} groups.\n")
-        self.results_text.insert(tk.END, f"Scanned {total_files} files total.\n\n")
-        group_num = 1
-        total_wasted_space = 0
-        for key, file_group in duplicates.items():
-            if len(file_group) <= 1:
-                continue
-            self.results_text.insert(tk.END, f"Group {group_num} ({len(file_group)} files):\n")
-            self.results_text.insert(tk.END, f"{'-'*30}\n")
-            # Calculate wasted space (size of duplicates beyond the first)
-            try:
-                file_size = os.path.getsize(file_group[0])
-                wasted_space = file_size * (len(file_group) - 1)
-                total_wasted_space += wasted_space
-                self.results_text.insert(tk.END, f"File size: {self.format_file_size(file_size)}\n")
-                self.results_text.insert(tk.END, f"Wasted space: {self.format_file_size(wasted_space)}\n\n")
-            except (OSError, IOError):
-                self.results_text.insert(tk.END, f"File size: Unable to determine\n\n")
-            for filepath in file_group:
-                rel_path = os.path.relpath(filepath, self.selected_folder)
-                self.results_text.insert(tk.END, f"  {rel_path}\n")
-            self.results_text.insert(tk.END, f"\n")
-            group_num += 1
-        self.results_text.insert(tk.END, f"{'='*50}\n")
-        self.results_text.insert(tk.END, f"SUMMARY:\n")
-        self.results_text.insert(tk.END, f"Total wasted space: {self.format_file_size(total_wasted_space)}\n")
+        duplicate_files = sum(summary.count for summary in self.group_summaries)
+        duplicate_groups = len(self.group_summaries)
+        total_wasted_space = sum(summary.wasted for summary in self.group_summaries)
+        summary_text = f"{duplicate_files:,} duplicate files in {duplicate_groups:,} groups, {self.format_file_size(total_wasted_space)} wasted. Scanned {total_files:,} files."
+        if self.skipped_hardlinks:
+            summary_text += f" {self.skipped_hardlinks:,} extra hard links not hashed."
+        self.results_summary_var.set(summary_text)
+        self._results_sort = ("wasted", True)  # group_summaries is already in this order
+        self._visible_summaries = list(self.group_summaries)
+        self._update_results_headings()
+        self._show_results_page(0)
         pipeline_desc = " → ".join(self._get_active_stages())
-        self.results_text.insert(tk.END, f"Pipeline used: {pipeline_desc}\n")
+        self.app.log(f"Duplicate scan: {duplicate_groups} groups, {self.format_file_size(total_wasted_space)} wasted (pipeline: {pipeline_desc})", mode="info", verbose=2)
         self.scan_complete(f"Scan completed - found {duplicate_groups} duplicate groups")
         self.update_action_buttons(True, duplicate_files - duplicate_groups)
 
 
+    # --- Results View ---
+    def _clear_results(self) -> None:
+        self.results_tree.delete(*self.results_tree.get_children())
+        self._page_groups = {}
+        self._visible_summaries = []
+        self.results_summary_var.set("")
+        self.results_page_var.set("")
+        self.prev_page_button.config(state="disabled")
+        self.next_page_button.config(state="disabled")
+
+
+    def _show_results_page(self, page: int) -> None:
+        """Show one page of groups; each starts collapsed with a placeholder child so it can be expanded."""
+        page_count = max(1, -(-len(self._visible_summaries) // RESULTS_PAGE_SIZE))
+        page = max(0, min(page, page_count - 1))
+        self._results_page = page
+        tree = self.results_tree
+        tree.delete(*tree.get_children())
+        self._page_groups = {}
+        start = page * RESULTS_PAGE_SIZE
+        for position, summary in enumerate(self._visible_summaries[start:start + RESULTS_PAGE_SIZE], start=start + 1):
+            paths = self.duplicate_groups.get(summary.key)
+            first = os.path.relpath(paths[0], self.selected_folder) if paths else ""
+            item = tree.insert("", "end", text=f"{position}. {summary.count} files: {first}", values=(self.format_file_size(summary.size), self.format_file_size(summary.wasted)))
+            tree.insert(item, "end")
+            self._page_groups[item] = summary
+        shown = len(self._visible_summaries)
+        if shown:
+            self.results_page_var.set(f"Page {page + 1} of {page_count} ({shown:,} groups)")
+        else:
+            self.results_page_var.set("No groups match the filter" if self.group_summaries else "")
+        self.prev_page_button.config(state="normal" if page > 0 else "disabled")
+        self.next_page_button.config(state="normal" if page < page_count - 1 else "disabled")
+        tree.yview_moveto(0)
+
+
+    def _on_result_group_open(self, event=None) -> None:
+        tree = self.results_tree
+        item = tree.focus()
+        summary = self._page_groups.get(item)
+        if summary is None:
+            return
+        children = tree.get_children(item)
+        if len(children) != 1 or tree.item(children[0], "text"):
+            return  # Already expanded once
+        tree.delete(children[0])
+        for path in self.duplicate_groups.get(summary.key, ()):
+            link_note = "  [hard link]" if path in self.hardlink_paths else ""
+            tree.insert(item, "end", text=f"{os.path.relpath(path, self.selected_folder)}{link_note}")
+
+
+    def _sort_results(self, column: str) -> None:
+        current, descending = self._results_sort
+        # Numbers read best largest first, so a new column starts descending
+        self._results_sort = (column, not descending if current == column else True)
+        self._order_visible_summaries()
+        self._update_results_headings()
+        self._show_results_page(0)
+
+
+    def _order_visible_summaries(self) -> None:
+        column, descending = self._results_sort
+        field = {"#0": "count", "size": "size", "wasted": "wasted"}[column]
+        self._visible_summaries.sort(key=lambda summary: getattr(summary, field), reverse=descending)
+
+
+    def _apply_results_filter(self) -> None:
+        query = self.results_filter_var.get().strip().casefold()
+        if query:
+            groups = self.duplicate_groups
+            self._visible_summaries = [summary for summary in self.group_summaries if any(query in path.casefold() for path in groups.get(summary.key, ()))]
+        else:
+            self._visible_summaries = list(self.group_summaries)
+        self._order_visible_summaries()
+        self._show_results_page(0)
+
+
+    def _update_results_headings(self) -> None:
+        labels = {"#0": "Group", "size": "File Size", "wasted": "Wasted"}
+        sort_column, descending = self._results_sort
+        for column, label in labels.items():
+            if column == sort_column:
+                label += " ▼" if descending else " ▲"
+            self.results_tree.heading(column, text=label, anchor="w" if column == "#0" else "e", command=lambda c=column: self._sort_results(c))
+
+
     def update_action_buttons(self, enable: bool, duplicate_count: int = 0):
         if enable and duplicate_count > 0:
             self._set_action_buttons_state(enabled=True)
@@ -1206,11 +1582,14 @@ class DuplicateScannerDialog:
             ntk.showinfo("No Action Needed", "No duplicate files to delete.")
             return
         # Confirm deletion
-        response = ntk.askyesno("Confirm Delete", f"This will permanently delete {len(files_to_delete)} duplicate files.\n\nContinue?", detail="The first file in each duplicate group will be kept.\nThis action cannot be undone.")
+        if self._use_trash():
+            response = ntk.askyesno("Confirm Delete", f"This will move {len(files_to_delete)} duplicate files to the trash.\n\nContinue?", detail="The first file in each duplicate group will be kept.\nUse Undo Last Action to restore them.")
+        else:
+            response = ntk.askyesno("Confirm Delete", f"This will permanently delete {len(files_to_delete)} duplicate files.\n\nContinue?", detail="The first file in each duplicate group will be kept.\nThis action cannot be undone.")
         if not response:
             return
         # Perform deletion
-        self.perform_file_action("delete", files_to_delete)
+        self.perform_file_action("trash" if self._use_trash() else "delete", files_to_delete)
 
 
     def move_duplicates(self):
@@ -1243,49 +1622,121 @@ class DuplicateScannerDialog:
         self.perform_file_action("move", files_to_move, storage_folder)
 
 
-    def perform_file_action(self, action: str, files: List[str], destination: str = None):
-        total_files = len(files)
-        success_count = 0
-        error_count = 0
-        errors = []
-        action_start_time = time.time()
-        # Disable buttons during action
+    def link_duplicates(self, mode: str):
+        """Replace every duplicate with a hard link ("hardlink") or reflink ("reflink") to the first file of its group."""
+        if not self.duplicate_groups:
+            ntk.showinfo("No Duplicates", "No duplicate files to link.")
+            return
+        pairs = [(group[0], path) for group in self.duplicate_groups.values() if len(group) > 1 for path in group[1:] if path not in self.hardlink_paths]
+        if not pairs:
+            ntk.showinfo("No Action Needed", "All duplicates are already hard links.")
+            return
+        if mode == "reflink" and not dedup_links.reflink_supported(self.selected_folder):
+            ntk.showinfo("Reflinks Unavailable", "This filesystem does not support reflinks.", detail="Reflinks need Linux and a copy-on-write filesystem such as Btrfs or XFS. Hard links work on most filesystems.")
+            return
+        if mode == "hardlink":
+            detail = "Every path is kept. Linked paths share one file: editing one changes all of them, and they take the first file's permissions and timestamps."
+        else:
+            detail = "Every path is kept as an independent file with its own permissions and timestamps; only the data blocks are shared until one copy is modified."
+        response = ntk.askyesno("Confirm Link", f"This will replace {len(pairs)} duplicate files with {'hard links' if mode == 'hardlink' else 'reflinks'} to the first file in their group.\n\nContinue?", detail=f"Contents are verified byte-for-byte first.\n{detail}")
+        if not response:
+            return
+        self.perform_file_action(mode, [dup for _keep, dup in pairs], originals=[keep for keep, _dup in pairs])
+
+
+    def perform_file_action(self, action: str, files: List[str], destination: str = None, originals: List[str] = None):
+        """Run a bulk action on a background job; progress is sampled by the progress driver."""
+        if action == "move" and destination:
+            # Preserve directory structure
+            items = [(path, os.path.join(destination, os.path.relpath(path, self.selected_folder))) for path in files]
+        elif action in ("hardlink", "reflink") and originals:
+            items = list(zip(files, originals))
+        else:
+            items = [(path, None) for path in files]
+        self._start_action_job(bulk_actions.BulkActionJob(action, items, log_path=self._new_action_log(action)))
+
+
+    def undo_last_action(self):
+        """Put back the files of the most recent (not yet undone) move or trash action."""
+        log_dir = self._action_log_dir()
+        log_path = bulk_actions.latest_undoable_log(log_dir) if log_dir else None
+        if not log_path:
+            ntk.showinfo("Nothing to Undo", "There is no move or delete action left to undo.")
+            self.undo_button.config(state="disabled")
+            return
+        action, items = bulk_actions.undo_items(log_path)
+        verb = "Restore" if action == "restore" else "Move"
+        if not ntk.askyesno("Confirm Undo", f"{verb} {len(items)} files back to where they were?", detail="Files that were moved again, purged from the trash, or whose original path is taken, are skipped."):
+            return
+        self._start_action_job(bulk_actions.BulkActionJob(action, items, log_path=self._new_action_log("undo"), undo_of=log_path))
+
+
+    def _use_trash(self) -> bool:
+        return getattr(getattr(self.app, "funnel_config", None), "delete_to_trash", True)
+
+
+    def _action_log_dir(self) -> Union[str, None]:
+        get_data_path = getattr(self.app, "get_data_path", None)
+        return os.path.join(get_data_path(), "action_logs") if get_data_path else None
+
+
+    def _new_action_log(self, action: str) -> Union[str, None]:
+        log_dir = self._action_log_dir()
+        return bulk_actions.new_log_path(log_dir, action) if log_dir else None
+
+
+    def _start_action_job(self, job: bulk_actions.BulkActionJob) -> None:
+        self._action_job = job
         self._set_action_buttons_state(enabled=False)
         self.scan_button.config(state="disabled")
-        try:
-            for i, filepath in enumerate(files):
-                try:
-                    if action == "delete":
-                        os.remove(filepath)
-                        self.app.log(f"Deleted duplicate: {os.path.basename(filepath)}", mode="info", verbose=1)
-                    elif action == "move" and destination:
-                        # Preserve directory structure
-                        rel_path = os.path.relpath(filepath, self.selected_folder)
-                        dest_path = os.path.join(destination, rel_path)
-                        dest_dir = os.path.dirname(dest_path)
-                        os.makedirs(dest_dir, exist_ok=True)
-                        shutil.move(filepath, dest_path)
-                        self.app.log(f"Moved duplicate: {os.path.basename(filepath)} -> {rel_path}", mode="info", verbose=1)
-                    success_count += 1
-                except Exception as e:
-                    error_count += 1
-                    error_msg = f"{os.path.basename(filepath)}: {str(e)}"
-                    errors.append(error_msg)
-                progress = (i + 1) / total_files * 100
-                self.progress_var.set(progress)
-                action_text = "Deleting" if action == "delete" else "Moving"
-                eta = self.get_eta(i + 1, total_files, action_start_time)
-                self.status_var.set(f"{action_text} files... {i+1}/{total_files} ({eta})")
-                self.action_info_var.set(f"{action_text}... {i+1}/{total_files} ({eta})")
-                self.app.root.update()
-        finally:
-            # Re-enable buttons
-            self._set_action_buttons_state(enabled=True)
-            self.scan_button.config(state="normal")
-            self.progress_var.set(0)
+        self.undo_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.app.log(f"Bulk action started: {job.action} {len(job.items)} files", mode="info", verbose=2)
+        job.start()
+        self.app.progress_driver.add(self._action_progress_key, self._sample_action, self._render_action, on_done=self._finish_file_action)
+
+
+    @property
+    def _action_progress_key(self) -> str:
+        return f"scanner-action-{id(self)}"
+
+
+    def _sample_action(self):
+        """Progress driver sample for the running bulk action; None once it has finished."""
+        job = self._action_job
+        if job is None:
+            return None
+        processed, total, errors, finished = job.snapshot()
+        return None if finished else (processed, total, errors)
+
+
+    def _render_action(self, snapshot) -> None:
+        processed, total, errors = snapshot
+        job = self._action_job
+        action_text = "Restoring" if job.undo_of else {"delete": "Deleting", "trash": "Moving to trash", "move": "Moving"}.get(job.action, "Linking")
+        eta = self.get_eta(processed, total, job.started_at) if processed else "..."
+        self.progress_var.set(processed / total * 100 if total else 0)
+        error_text = f", {errors} errors" if errors else ""
+        self.status_var.set(f"{action_text} files... {processed:,}/{total:,}{error_text} ({eta})")
+        self.action_info_var.set(f"{action_text}... {processed:,}/{total:,} ({eta})")
+
+
+    def _finish_file_action(self) -> None:
+        job, self._action_job = self._action_job, None
+        if job is None:
+            return
+        # Re-enable buttons
+        self.scan_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        self.progress_var.set(0)
+        success_count = job.completed
+        error_count = len(job.errors)
+        errors = [f"{os.path.basename(path)}: {message}" for path, message in job.errors]
+        for path, message in job.errors:
+            self.app.log(f"Bulk {job.action} failed for {path}: {message}", mode="warning", verbose=3)
         # Show results
-        action_past = "deleted" if action == "delete" else "moved"
-        message = f"Action completed!\n\n"
+        action_past = "restored" if job.undo_of else {"delete": "deleted", "trash": "trashed", "move": "moved"}.get(job.action, "linked")
+        message = "Action cancelled.\n\n" if job.cancelled else "Action completed!\n\n"
         message += f"Successfully {action_past}: {success_count} files\n"
         if error_count > 0:
             message += f"Errors: {error_count} files\n\n"
@@ -1297,13 +1748,118 @@ class DuplicateScannerDialog:
             ntk.showinfo("Action Completed with Errors", message)
         else:
             ntk.showinfo("Action Completed", message)
-        self.status_var.set(f"Action completed - {success_count} files {action_past}")
-        self.app.log(f"Bulk action complete: {success_count} files {action_past}, {error_count} errors", mode="info", verbose=1)
+        elapsed = job.finished_at - job.started_at
+        self.status_var.set(f"Action completed - {success_count} files {action_past} ({elapsed:.1f}s)")
+        self.app.log(f"Bulk action complete: {success_count} files {action_past}, {error_count} errors in {elapsed:.1f}s", mode="info", verbose=1)
+        self._update_undo_button()
+        if job.undo_of:
+            return
         # Clear duplicate groups since files have been processed
         self.duplicate_groups = {}
+        self.result_rows = {}
         self.update_action_buttons(False)
 
 
+    def _update_undo_button(self) -> None:
+        log_dir = self._action_log_dir()
+        undoable = bool(log_dir) and bulk_actions.latest_undoable_log(log_dir) is not None
+        self.undo_button.config(state="normal" if undoable else "disabled")
+
+
+    # --- Saved Results ---
+    def export_scan_results(self):
+        """Stream the current duplicate groups to a JSONL, CSV or SQLite file on a background thread."""
+        if not self.result_rows or self.result_table is None:
+            ntk.showinfo("No Results", "Scan for duplicates first.")
+            return
+        default_name = f"duplicates_{os.path.basename(os.path.normpath(self.selected_folder)) or 'scan'}.jsonl"
+        path = filedialog.asksaveasfilename(title="Export scan results", parent=self.dialog, initialfile=default_name, defaultextension=".jsonl",
+                                            filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv"), ("SQLite database", "*.sqlite *.db")])
+        if not path:
+            return
+        table, group_rows, hardlink_paths = self.result_table, self.result_rows, self.hardlink_paths
+        hash_column, partial_size, partial_mode = self.result_hash_job or (scan_results.HASH_COLUMN, 0, "full")
+        meta = {
+            "root": self.selected_folder,
+            "pipeline": " → ".join(self._get_active_stages()),
+            "total_files": self.scanned_file_count,
+            "same_folder": bool(getattr(self, "same_folder_only_var", None) and self.same_folder_only_var.get()),
+            "hash": scan_results.hash_meta(hash_column, partial_size, partial_mode),
+        }
+        self.export_button.config(state="disabled")
+        self.status_var.set(f"Exporting results to {os.path.basename(path)}...")
+        def worker():
+            started = time.time()
+            try:
+                count = scan_results.export_results(path, scan_results.iter_rows(table, group_rows, hardlink_paths, hash_column), meta)
+            except Exception as e:
+                error = str(e)
+                self.dialog.after(0, lambda: self._export_done(path, 0, error, 0.0))
+                return
+            elapsed = time.time() - started
+            self.dialog.after(0, lambda: self._export_done(path, count, None, elapsed))
+        threading.Thread(target=worker, name="funnel-scan-export", daemon=True).start()
+
+
+    def _export_done(self, path: str, count: int, error: Union[str, None], elapsed: float) -> None:
+        if self.result_rows:
+            self.export_button.config(state="normal")
+        if error:
+            self.status_var.set("Export failed")
+            self.app.log(f"Failed to export scan results to {path}: {error}", mode="error", verbose=1)
+            ntk.showinfo("Error", f"Could not export scan results:\n{error}")
+            return
+        self.status_var.set(f"Exported {count:,} files to {os.path.basename(path)} ({elapsed:.1f}s)")
+        self.app.log(f"Exported scan results: {count} files to {path}", mode="info", verbose=1)
+
+
+    def import_scan_results(self):
+        """Load saved results on a background thread; files changed since the export are dropped."""
+        path = filedialog.askopenfilename(title="Import scan results", parent=self.dialog,
+                                          filetypes=[("Scan results", "*.jsonl *.csv *.sqlite *.db"), ("All files", "*.*")])
+        if not path:
+            return
+        self.scan_button.config(state="disabled")
+        self.import_button.config(state="disabled")
+        self.status_var.set(f"Importing {os.path.basename(path)} (checking files on disk)...")
+        def worker():
+            try:
+                loaded = scan_results.import_results(path)
+            except Exception as e:
+                error = str(e)
+                self.dialog.after(0, lambda: self._import_done(path, None, error))
+                return
+            self.dialog.after(0, lambda: self._import_done(path, loaded, None))
+        threading.Thread(target=worker, name="funnel-scan-import", daemon=True).start()
+
+
+    def _import_done(self, path: str, loaded: Union[scan_results.LoadedScan, None], error: Union[str, None]) -> None:
+        self.scan_button.config(state="normal")
+        self.import_button.config(state="normal")
+        if error:
+            self.status_var.set("Import failed")
+            self.app.log(f"Failed to import scan results from {path}: {error}", mode="error", verbose=1)
+            ntk.showinfo("Error", f"Could not import scan results:\n{error}")
+            return
+        table = loaded.table
+        root = loaded.meta.get("root") or (os.path.commonpath(table.dirs) if table.dirs else "")
+        if root:
+            self.selected_folder = root
+            self.folder_var.set(root)
+        self.result_table = table
+        self.result_rows = loaded.group_rows
+        hash_kind = loaded.meta.get("hash") or scan_results.hash_meta(scan_results.HASH_COLUMN, 0, "full")
+        self.result_hash_job = (hash_kind["column"], hash_kind["partial_size"], hash_kind["mode"])
+        self.hardlink_paths = loaded.hardlink_paths
+        self.group_summaries = loaded.summaries
+        self.skipped_hardlinks = 0
+        groups = {key: table.paths(rows) for key, rows in loaded.group_rows.items()}
+        self.display_results(groups, loaded.meta.get("total_files") or len(table))
+        stale_text = f", {loaded.stale:,} changed or missing files dropped" if loaded.stale else ""
+        self.status_var.set(f"Imported {len(groups):,} duplicate groups from {os.path.basename(path)}{stale_text}")
+        self.app.log(f"Imported scan results: {len(groups)} groups from {path}{stale_text}", mode="info", verbose=1)
+
+
     # --- Utility ---
     def get_md5_hash(self, filepath: str, chunk_size: int = 8192) -> str:
         """Get full MD5 hash using cached version from duplicate_handler."""
@@ -73,6 +73,7 @@ def _create_edit_menu(app: 'Main', menubar: tk.Menu):
     edit_menu.add_command(label="Process Move Queue", command=app.process_move_queue)
     edit_menu.add_separator()
     edit_menu.add_command(label="Find Duplicate Files...", command=app.show_duplicate_scanner)
+    edit_menu.add_command(label="Review Saved Scan...", command=app.review_saved_scan)
     edit_menu.add_separator()
     edit_menu.add_command(label="Clear: Log", command=app.clear_log)
     edit_menu.add_command(label="Clear: History", command=app.clear_history)
@@ -158,6 +159,7 @@ def _create_options_menu(app: 'Main', menubar: tk.Menu):
     dupe_menu.add_command(label="Duplicate Checking Mode", state="disabled")
     dupe_menu.add_radiobutton(label="Similar", variable=app.dupe_check_mode_var, value="Similar")
     dupe_menu.add_radiobutton(label="Single", variable=app.dupe_check_mode_var, value="Single")
+    dupe_menu.add_radiobutton(label="Global", variable=app.dupe_check_mode_var, value="Global")
     dupe_menu.add_separator()
     # Max Files
     dupe_menu.add_command(label="Duplicate Check: Max Files", state="disabled")
@@ -170,6 +172,14 @@ def _create_options_menu(app: 'Main', menubar: tk.Menu):
     dupe_menu.add_radiobutton(label="500", variable=app.dupe_max_files_var, value=500)
     dupe_menu.add_radiobutton(label="1000", variable=app.dupe_max_files_var, value=1000)
     dupe_menu.add_radiobutton(label="10000", variable=app.dupe_max_files_var, value=10000)
+    dupe_menu.add_separator()
+    # Partial Hash Mode
+    dupe_menu.add_command(label="Partial Hash Mode", state="disabled")
+    dupe_menu.add_radiobutton(label="Head + Tail", variable=app.dupe_partial_hash_mode_var, value="head_tail")
+    dupe_menu.add_radiobutton(label="Sampled Blocks", variable=app.dupe_partial_hash_mode_var, value="sampled")
+    dupe_menu.add_separator()
+    dupe_menu.add_checkbutton(label="Hash Files on Ingest", variable=app.dupe_hash_on_ingest_var)
+    dupe_menu.add_checkbutton(label="Delete to Trash", variable=app.delete_to_trash_var)
 
 
 def _create_help_menu(app: 'Main', menubar: tk.Menu):
@@ -177,6 +187,7 @@ def _create_help_menu(app: 'Main', menubar: tk.Menu):
     menubar.add_cascade(label="Help", menu=help_menu)
     help_menu.add_command(label="Show Help", command=app.open_help_window)
     help_menu.add_command(label="Show Stats", command=app.open_stats_popup)
+    help_menu.add_command(label="Show Metrics", command=app.open_metrics_window)
 
 
 #endregion
@@ -7,7 +7,7 @@ import os
 import tkinter as tk
 
 # Standard GUI
-from tkinter import filedialog
+from tkinter import ttk, filedialog
 
 # Third-Party
 import nenotk as ntk
@@ -15,6 +15,7 @@ import nenotk as ntk
 # Custom
 from . import listbox_logic
 from main.utils import help_text
+from main.utils import metrics
 
 # Type checking
 from typing import TYPE_CHECKING
@@ -64,6 +65,7 @@ def open_folder(app: 'Main', path=None):
         app.log(f"Folder not found: {path}", mode="error", verbose=1)
 
 
+@metrics.timed("ui.log")
 def log(app: 'Main', message, mode="simple", verbose=1):
     """Add a message to the log with an optional mode prefix.
 
@@ -235,6 +237,86 @@ def open_stats_popup(app: 'Main'):
     )
 
 
+def open_metrics_window(app: 'Main'):
+    """Open (or focus) the live performance metrics window."""
+    existing = getattr(app, "metrics_window", None)
+    if existing is not None:
+        try:
+            if existing.winfo_exists():
+                existing.deiconify()
+                existing.lift()
+                return
+        except Exception:
+            pass
+    REFRESH_MS = 1000
+    window = tk.Toplevel(app.root)
+    window.title("Performance Metrics")
+    window.geometry("760x360")
+    window.transient(app.root)
+    app.metrics_window = window
+    window.grid_rowconfigure(1, weight=1)
+    window.grid_columnconfigure(0, weight=1)
+    # Controls
+    top = ttk.Frame(window, padding=(8, 6))
+    top.grid(row=0, column=0, sticky="ew")
+    top.grid_columnconfigure(2, weight=1)
+    ttk.Checkbutton(top, text="Collect metrics", variable=app.metrics_enabled_var).grid(row=0, column=0, sticky="w")
+    ttk.Button(top, text="Reset", command=metrics.reset).grid(row=0, column=1, sticky="w", padx=(8, 0))
+    elapsed_var = tk.StringVar(value="")
+    ttk.Label(top, textvariable=elapsed_var, foreground="gray").grid(row=0, column=2, sticky="e")
+    # Operations table
+    columns = ("op", "calls", "files_s", "mb_s", "p50", "p95", "total")
+    headings = {"op": "Operation", "calls": "Calls", "files_s": "Files/s", "mb_s": "MB/s", "p50": "p50 (ms)", "p95": "p95 (ms)", "total": "Total (s)"}
+    table_frame = ttk.Frame(window, padding=(8, 0))
+    table_frame.grid(row=1, column=0, sticky="nsew")
+    table_frame.grid_rowconfigure(0, weight=1)
+    table_frame.grid_columnconfigure(0, weight=1)
+    tree = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="none")
+    tree.grid(row=0, column=0, sticky="nsew")
+    vscroll = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+    vscroll.grid(row=0, column=1, sticky="ns")
+    tree.configure(yscrollcommand=vscroll.set)
+    for col in columns:
+        tree.heading(col, text=headings[col])
+        tree.column(col, width=200 if col == "op" else 80, stretch=(col == "op"), anchor="w" if col == "op" else "e")
+    # Cache hit rates + counters
+    caches_var = tk.StringVar(value="")
+    ttk.Label(window, textvariable=caches_var, foreground="gray", padding=(8, 6)).grid(row=2, column=0, sticky="ew")
+
+    def _refresh():
+        try:
+            if not window.winfo_exists():
+                return
+        except Exception:
+            return
+        snap = metrics.snapshot()
+        for child in tree.get_children(""):
+            tree.delete(child)
+        for name, op in sorted(snap["operations"].items()):
+            tree.insert("", "end", values=(
+                name,
+                ntk.number_commas(int(op["calls"])),
+                f"{op['files_per_s']:,.1f}",
+                f"{op['mb_per_s']:,.2f}" if op["bytes"] else "-",
+                f"{op['p50_ms']:,.2f}",
+                f"{op['p95_ms']:,.2f}",
+                f"{op['total_s']:,.2f}",
+            ))
+        parts = [f"{name}: {entry['hit_rate'] * 100:.1f}% hit ({ntk.number_commas(int(entry['hits']))}/{ntk.number_commas(int(entry['hits'] + entry['misses']))})" for name, entry in sorted(snap["caches"].items())]
+        parts += [f"{name}: {ntk.number_commas(int(value))}" for name, value in sorted(snap["counters"].items())]
+        caches_var.set("   ".join(parts) if parts else "No cache activity recorded")
+        state = "collecting" if metrics.is_enabled() else "paused"
+        elapsed_var.set(f"{state} • window {int(snap['elapsed_s'])}s")
+        window.after(REFRESH_MS, _refresh)
+
+    def _on_close():
+        app.metrics_window = None
+        window.destroy()
+
+    window.protocol("WM_DELETE_WINDOW", _on_close)
+    ntk.center_window(window, to="parent")
+    _refresh()
+
 
 def update_duplicate_count(app: 'Main'):
     """Update the duplicate count display."""
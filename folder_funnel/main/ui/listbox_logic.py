@@ -6,14 +6,15 @@ import io
 import os
 import re
 import subprocess
-import threading
 
 # Third-Party
 import nenotk as ntk
-from PIL import Image, UnidentifiedImageError
+from PIL import Image
 
 # Custom
 from . import interface
+from main.utils import metrics
+from main.utils import thumbnail_cache
 
 # Type checking
 from typing import TYPE_CHECKING
@@ -26,6 +27,9 @@ if TYPE_CHECKING:
 #region - Listbox Logic
 
 
+HOVER_PREVIEW_SIZE = 1024  # Longest side of history hover previews (the zoom popup still has detail to show)
+HOVER_CACHE_BYTES = 128 * 1024 * 1024  # Decoded hover previews kept in memory
+
 IMAGE_EXTENSIONS = {
     ".png",
     ".jpg",
@@ -71,6 +75,7 @@ def toggle_history_mode(app: 'Main'):
     refresh_history_listbox(app)
 
 
+@metrics.timed("ui.refresh_history")
 def refresh_history_listbox(app: 'Main'):
     """Clear and repopulate the history Treeview based on current display mode."""
     tree = app.history_listbox
@@ -571,77 +576,93 @@ def _is_video_file(path: str) -> bool:
     return ext in VIDEO_EXTENSIONS and os.path.isfile(path)
 
 
-def _load_preview_image(path: str):
-    """Return a safely loaded copy of the image for preview or None on failure."""
-    try:
-        with Image.open(path) as img:
-            return img.copy()
-    except (FileNotFoundError, PermissionError, UnidentifiedImageError):
-        return None
-    except Exception:
-        return None
+def _history_thumbnails(app: 'Main') -> thumbnail_cache.ThumbnailCache:
+    """Decoded hover previews, keyed by path and stat (created on first hover)."""
+    cache = getattr(app, "_history_thumbnails", None)
+    if cache is None:
+        cache = thumbnail_cache.ThumbnailCache(max_bytes=HOVER_CACHE_BYTES)
+        app._history_thumbnails = cache
+    return cache
 
 
-def _ensure_video_thumb_async(app: 'Main', video_path: str) -> None:
-    """Generate a video thumbnail in a background thread, then update PopUpZoom if still hovered."""
-    # Deduplicate work per-path
-    jobs = getattr(app, "_video_thumb_jobs", None)
-    if jobs is None:
-        jobs = {}
-        app._video_thumb_jobs = jobs
-    if jobs.get(video_path):
+def close_history_thumbnails(app: 'Main') -> None:
+    cache = getattr(app, "_history_thumbnails", None)
+    if cache is not None:
+        cache.close()
+        app._history_thumbnails = None
+
+
+def _show_hover_preview(app: 'Main', path: str, image) -> None:
+    """Show image in PopUpZoom if path is still the hovered one (runs on the Tk thread)."""
+    history_zoom: 'PopUpZoom' = getattr(app, "history_zoom", None)
+    if not history_zoom or not getattr(app, "history_image_preview_var", None) or not app.history_image_preview_var.get():
         return
-    jobs[video_path] = True
 
-    def _worker() -> None:
-        jpeg_bytes = None
-        try:
-            from main.utils import video_thumbnail
+    # Only update if the user is still hovering this path
+    if getattr(app, "history_zoom_current_path", "") != path:
+        return
 
-            jpeg_bytes = video_thumbnail.get_video_thumbnail_jpeg_bytes(app, video_path)
-        except Exception:
-            jpeg_bytes = None
+    if image is None:
+        if history_zoom.zoom_enabled.get():
+            history_zoom.zoom_enabled.set(False)
+        return
+    history_zoom.set_image(image)
+    if not history_zoom.zoom_enabled.get():
+        history_zoom.zoom_enabled.set(True)
 
+
+def _ensure_image_preview_async(app: 'Main', image_path: str) -> None:
+    """Decode an image preview on a worker thread, then update PopUpZoom if still hovered."""
+    def _on_done(image) -> None:
         def _on_main() -> None:
-            try:
-                jobs.pop(video_path, None)
-            except Exception:
-                pass
+            if image is None and getattr(app, "history_zoom_current_path", "") == image_path:
+                app.log(f"Preview unavailable for {os.path.basename(image_path)}", mode="warning", verbose=3)
+            _show_hover_preview(app, image_path, image.copy() if image is not None else None)
 
-            history_zoom: 'PopUpZoom' = getattr(app, "history_zoom", None)
-            if not history_zoom or not getattr(app, "history_image_preview_var", None) or not app.history_image_preview_var.get():
-                return
+        if not app._defer_to_ui(_on_main):  # A cache hit calls back on the Tk thread
+            _on_main()
 
-            # Only update if the user is still hovering this path
-            if getattr(app, "history_zoom_current_path", "") != video_path:
-                return
+    _history_thumbnails(app).request(image_path, HOVER_PREVIEW_SIZE, HOVER_PREVIEW_SIZE, _on_done)
 
-            if not jpeg_bytes:
-                if history_zoom.zoom_enabled.get():
-                    history_zoom.zoom_enabled.set(False)
-                return
 
+def _ensure_video_thumb_async(app: 'Main', video_path: str) -> None:
+    """Queue a video thumbnail on the shared ffmpeg pool, then update PopUpZoom if still hovered.
+
+    The pool serves the latest hover first and drops or cancels requests for rows the cursor has left.
+    """
+    from main.utils import video_thumbnail
+
+    def _on_done(jpeg_bytes) -> None:
+        def _on_main() -> None:
             image_copy = None
-            try:
-                with Image.open(io.BytesIO(jpeg_bytes)) as img:
-                    image_copy = img.copy()
-            except Exception:
-                image_copy = None
-            if not image_copy:
-                if history_zoom.zoom_enabled.get():
-                    history_zoom.zoom_enabled.set(False)
-                return
-            history_zoom.set_image(image_copy)
-            if not history_zoom.zoom_enabled.get():
-                history_zoom.zoom_enabled.set(True)
+            if jpeg_bytes:
+                try:
+                    with Image.open(io.BytesIO(jpeg_bytes)) as img:
+                        image_copy = img.copy()
+                except Exception:
+                    image_copy = None
+            _show_hover_preview(app, video_path, image_copy)
 
-        try:
-            app.root.after(0, _on_main)
-        except Exception:
-            pass
+        app._defer_to_ui(_on_main)  # Always called on a pool thread
+
+    video_thumbnail.request_thumbnail(app, video_path, _on_done)
 
-    t = threading.Thread(target=_worker, daemon=True)
-    t.start()
+
+def queue_history_video_thumbnail(app: 'Main', path: str) -> None:
+    """Remember a moved video so its hover thumbnail is generated after the batch."""
+    if not getattr(app, "ffmpeg_available", False) or not app.history_image_preview_var.get():
+        return
+    if os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS:
+        app._video_thumb_backlog.append(path)
+
+
+def prefetch_history_video_thumbnails(app: 'Main') -> None:
+    """Generate thumbnails for videos moved in the last batch, at low priority."""
+    backlog, app._video_thumb_backlog = app._video_thumb_backlog, []
+    if backlog:
+        from main.utils import video_thumbnail
+
+        video_thumbnail.prefetch_thumbnails(app, backlog)
 
 
 def _tree_row_under_cursor(tree, event) -> str | None:
@@ -693,22 +714,22 @@ def handle_history_hover(app: 'Main', event) -> None:
     # Only reload image if path changed
     if app.history_zoom_current_path != path:
         if is_image:
-            image_copy = _load_preview_image(path)
-            if not image_copy:
+            # Image: show a cached preview; otherwise decode it off the Tk thread.
+            app.history_zoom_current_path = path
+            cached = _history_thumbnails(app).get(path, HOVER_PREVIEW_SIZE, HOVER_PREVIEW_SIZE)
+            if cached is None:
                 if history_zoom.zoom_enabled.get():
                     history_zoom.zoom_enabled.set(False)
-                app.history_zoom_current_path = ""
-                app.log(f"Preview unavailable for {os.path.basename(path)}", mode="warning", verbose=3)
+                _ensure_image_preview_async(app, path)
                 return
-            history_zoom.set_image(image_copy)
-            app.history_zoom_current_path = path
+            history_zoom.set_image(cached.copy())
         else:
-            # Video: use ffmpeg thumbnail if present; otherwise generate asynchronously.
+            # Video: use a cached thumbnail if present; otherwise generate asynchronously.
             app.history_zoom_current_path = path
             try:
                 from main.utils import video_thumbnail
 
-                jpeg_bytes = video_thumbnail.get_video_thumbnail_jpeg_bytes(app, path)
+                jpeg_bytes = video_thumbnail.get_cached_thumbnail(app, path)
             except Exception:
                 jpeg_bytes = None
 
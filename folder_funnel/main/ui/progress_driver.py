@@ -0,0 +1,140 @@
+"""
+Single Tk animation loop for every progress indicator in the app.
+
+Consumers register a `sample` function (returns the value to show, or None when
+finished) and a `render` function. One `after()` chain samples all consumers at
+a capped frame rate, renders only values that changed, and disarms itself as
+soon as no consumer is left, so an idle or tray-minimized app schedules nothing.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Standard GUI
+import tkinter as tk
+
+
+#endregion
+#region - ProgressDriver
+
+
+_UNSET = object()
+
+
+class _Consumer:
+    __slots__ = ("sample", "render", "on_done", "last")
+
+    def __init__(self, sample: Callable[[], Any], render: Callable[[Any], None], on_done: Optional[Callable[[], None]]):
+        self.sample = sample
+        self.render = render
+        self.on_done = on_done
+        self.last = _UNSET
+
+
+class ProgressDriver:
+    """Frame-rate-capped animation driver shared by the queue timer, folder sync and the scanner."""
+    def __init__(self, root: tk.Misc, fps: int = 20):
+        self.root = root
+        self.frame_ms = max(1, int(1000 / max(1, fps)))
+        self._lock = threading.Lock()
+        self._consumers: Dict[str, _Consumer] = {}
+        self._after_id = None
+        self._armed = False
+        # Frames stop while the window is hidden; resume when it is shown again
+        self.root.bind("<Map>", lambda _e: self.kick(), add="+")
+
+
+    def add(self, key: str, sample: Callable[[], Any], render: Callable[[Any], None], on_done: Optional[Callable[[], None]] = None) -> None:
+        """Register (or replace) a consumer. Tk thread only (other threads use Main.animate_progress)."""
+        with self._lock:
+            self._consumers[key] = _Consumer(sample, render, on_done)
+        self.kick()
+
+
+    def remove(self, key: str) -> None:
+        """Drop a consumer without calling its on_done. Safe to call from any thread."""
+        with self._lock:
+            self._consumers.pop(key, None)
+
+
+    def is_active(self, key: Optional[str] = None) -> bool:
+        with self._lock:
+            return bool(self._consumers) if key is None else key in self._consumers
+
+
+    def kick(self) -> None:
+        """Arm the frame loop if it is idle (Tk thread only). At most one chain is ever pending."""
+        with self._lock:
+            if self._armed or not self._consumers:
+                return
+            self._armed = True
+        try:
+            self._after_id = self.root.after(0, self._frame)
+        except (RuntimeError, tk.TclError):
+            with self._lock:
+                self._armed = False
+
+
+    def stop(self) -> None:
+        with self._lock:
+            self._consumers.clear()
+            self._armed = False
+            after_id, self._after_id = self._after_id, None
+        if after_id:
+            try:
+                self.root.after_cancel(after_id)
+            except tk.TclError:
+                pass
+
+
+    def _is_visible(self) -> bool:
+        try:
+            return self.root.winfo_toplevel().state() not in ("withdrawn", "iconic")
+        except tk.TclError:
+            return False
+
+
+    def _frame(self) -> None:
+        started = time.perf_counter()
+        with self._lock:
+            items = list(self._consumers.items())
+        finished = []
+        for key, consumer in items:
+            try:
+                value = consumer.sample()
+            except Exception:
+                value = None
+            if value is None:
+                finished.append((key, consumer))
+                continue
+            if value != consumer.last:
+                consumer.last = value
+                try:
+                    consumer.render(value)
+                except Exception:
+                    pass
+        for key, consumer in finished:
+            with self._lock:
+                if self._consumers.get(key) is consumer:
+                    del self._consumers[key]
+            if consumer.on_done:
+                try:
+                    consumer.on_done()
+                except Exception:
+                    pass
+        with self._lock:
+            if not self._consumers or not self._is_visible():
+                self._armed = False
+                self._after_id = None
+                return
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        self._after_id = self.root.after(max(1, self.frame_ms - elapsed_ms), self._frame)
+
+
+#endregion
@@ -2,5 +2,5 @@ from . import duplicate_handler
 from . import event_handler
 from . import folder_watcher
 from . import move_queue
-from . import settings_manager
+from . import funnel_engine
 from . import help_text
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+asyncio-based timer service for funnel engines.
+
+An event loop runs in its own daemon thread and owns every core timer: event
+debounce, the queue batching window, and retry backoff. Timer callbacks are
+thin; real work is handed to executors (see `FunnelEngine.run_serial`), so
+timing stays accurate regardless of how busy the Tk loop or the workers are.
+
+All public methods are thread-safe and return immediately.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import time
+import asyncio
+import itertools
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+#endregion
+#region - AsyncScheduler
+
+
+class AsyncScheduler:
+    """Event loop thread with integer timer handles and keyed debouncing."""
+    def __init__(self, name: str = "funnel-scheduler", on_error: Optional[Callable[[BaseException], None]] = None):
+        self.name = name
+        self.on_error = on_error
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._timers: Dict[int, asyncio.TimerHandle] = {}  # Armed timers (loop thread only)
+        self._cancelled: set = set()  # Handles cancelled before they were armed
+        self._debounce: Dict[Hashable, int] = {}  # key -> current handle
+        self._running = False
+
+
+#endregion
+#region - Lifecycle
+
+
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            ready = threading.Event()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run_loop, args=(ready,), name=self.name, daemon=True)
+            self._running = True
+            self._thread.start()
+        ready.wait()
+
+
+    def stop(self, wait: bool = True, timeout: float = 5.0) -> None:
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            loop, thread = self._loop, self._thread
+            self._debounce.clear()
+        try:
+            loop.call_soon_threadsafe(self._shutdown_loop)
+        except RuntimeError:
+            pass
+        if wait and thread and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+
+    def in_scheduler_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(ready.set)
+        try:
+            self._loop.run_forever()
+        finally:
+            try:
+                pending = asyncio.all_tasks(self._loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            except Exception:
+                pass
+            self._loop.close()
+
+
+    def _shutdown_loop(self) -> None:
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._cancelled.clear()
+        self._loop.stop()
+
+
+#endregion
+#region - Timers
+
+
+    def call_later(self, delay_ms: int, callback: Callable, *args) -> int:
+        """Run callback(*args) on the loop thread after delay_ms; returns a handle for cancel()."""
+        handle = next(self._seq)
+        self._schedule(handle, delay_ms, callback, args)
+        return handle
+
+
+    def call_soon(self, callback: Callable, *args) -> int:
+        return self.call_later(0, callback, *args)
+
+
+    def cancel(self, handle: Optional[int]) -> None:
+        if handle is None or not self._running:
+            return
+        with self._lock:
+            self._cancelled.add(handle)
+        try:
+            self._loop.call_soon_threadsafe(self._disarm, handle)
+        except RuntimeError:
+            pass
+
+
+    def debounce(self, key: Hashable, delay_ms: int, callback: Callable, *args) -> int:
+        """(Re)start the timer for key: any pending callback under the same key is dropped."""
+        handle = next(self._seq)
+        with self._lock:
+            previous = self._debounce.get(key)
+            self._debounce[key] = handle
+        if previous is not None:
+            self.cancel(previous)
+        self._schedule(handle, delay_ms, self._fire_debounced, (key, handle, callback, args))
+        return handle
+
+
+    def cancel_debounce(self, key: Hashable) -> None:
+        with self._lock:
+            handle = self._debounce.pop(key, None)
+        self.cancel(handle)
+
+
+    def is_pending(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._debounce
+
+
+    def _schedule(self, handle: int, delay_ms: int, callback: Callable, args: tuple) -> None:
+        if not self._running:
+            self.start()
+        due = time.monotonic() + max(0, int(delay_ms)) / 1000.0
+        try:
+            self._loop.call_soon_threadsafe(self._arm, handle, due, callback, args)
+        except RuntimeError:
+            pass  # Loop closed during shutdown; drop the timer
+
+
+    def _arm(self, handle: int, due: float, callback: Callable, args: tuple) -> None:
+        with self._lock:
+            if handle in self._cancelled:
+                self._cancelled.discard(handle)
+                return
+        # asyncio's default clock is time.monotonic(), so `due` can be used directly
+        self._timers[handle] = self._loop.call_at(due, self._fire, handle, callback, args)
+
+
+    def _disarm(self, handle: int) -> None:
+        # Runs after _arm for the same handle (both are queued FIFO on the loop)
+        timer = self._timers.pop(handle, None)
+        if timer is not None:
+            timer.cancel()
+        with self._lock:
+            self._cancelled.discard(handle)
+
+
+    def _fire_debounced(self, key: Hashable, handle: int, callback: Callable, args: tuple) -> None:
+        with self._lock:
+            # A cancel can reach the loop before the _arm it targets (debounce() schedules
+            # after releasing the lock), so only the key's current handle may fire
+            if self._debounce.get(key) != handle:
+                return
+            self._debounce.pop(key, None)
+        callback(*args)
+
+
+    def _fire(self, handle: int, callback: Callable, args: tuple) -> None:
+        self._timers.pop(handle, None)
+        with self._lock:
+            if handle in self._cancelled:
+                self._cancelled.discard(handle)
+                return
+        try:
+            callback(*args)
+        except Exception as exc:
+            if self.on_error:
+                try:
+                    self.on_error(exc)
+                except Exception:
+                    pass
+
+
+#endregion
+#region - Coroutines / Executors
+
+
+    def submit(self, coro) -> Future:
+        """Run a coroutine on the loop from any thread; returns a concurrent Future."""
+        if not self._running:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+
+    async def run_in_executor(self, executor: Optional[Executor], fn: Callable, *args) -> Any:
+        """Await a blocking file operation on an executor (None = the loop's default pool)."""
+        return await self._loop.run_in_executor(executor, fn, *args)
+
+
+#endregion
@@ -0,0 +1,66 @@
+"""
+Compact probabilistic set membership.
+
+A Bloom filter answers "definitely not present" or "possibly present" using
+about 10 bits per item at a 1% false-positive rate. Items cannot be removed, so
+deleted entries only cost a few extra false positives until the filter is rebuilt.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import math
+import hashlib
+import threading
+
+
+#endregion
+#region - BloomFilter
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over bytes keys (double hashing on one BLAKE2b digest)."""
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+
+    def _positions(self, item: bytes):
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+
+    def add(self, item: bytes) -> None:
+        positions = self._positions(item)
+        with self._lock:
+            for pos in positions:
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+            self.count += 1
+
+
+    def __contains__(self, item: bytes) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+    @property
+    def is_full(self) -> bool:
+        """True once more items were added than the filter was sized for."""
+        return self.count > self.capacity
+
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+#endregion
@@ -0,0 +1,297 @@
+"""
+Background engine for bulk file actions (delete, trash, move, hard link, reflink).
+
+A BulkActionJob runs off the Tk thread on a small pool per volume: one slow or
+remote disk can't starve the others, and no disk gets more concurrent requests
+than it can use. Moves within a volume are a single os.rename.
+
+Every operation is written to a JSONL action log before it runs and marked done
+or failed after, so the log is valid even if the process dies mid-job.
+`undo_items` turns a log of moves or trashed files back into the job that
+restores it. Progress is
+exposed as counters for the UI to sample, not as per-file events.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import os
+import json
+import time
+import shutil
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Custom
+from . import trash
+from . import dedup_links
+
+
+#endregion
+#region - BulkActionJob
+
+
+ACTIONS = ("delete", "trash", "restore", "move", "hardlink", "reflink")
+UNDOABLE = ("move", "trash")
+
+# (path, argument): destination for "move", file to keep for "hardlink"/"reflink",
+# original path for "restore" (path is the trashed file), None for "delete"/"trash"
+Item = Tuple[str, Optional[str]]
+
+
+def _volume_of(path: str, cache: Dict[str, int]) -> int:
+    """st_dev of the nearest existing folder of path (cached per folder)."""
+    directory = os.path.dirname(path)
+    dev = cache.get(directory)
+    if dev is None:
+        probe = directory
+        while True:
+            try:
+                dev = os.stat(probe).st_dev
+                break
+            except OSError:
+                parent = os.path.dirname(probe)
+                if parent == probe:
+                    dev = -1
+                    break
+                probe = parent
+        cache[directory] = dev
+    return dev
+
+
+class BulkActionJob:
+    """Apply one action to many files on background threads, with an undo log."""
+    def __init__(self, action: str, items: List[Item], log_path: Optional[str] = None, workers_per_volume: int = 4, max_workers: int = 16, undo_of: Optional[str] = None):
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown bulk action: {action}")
+        self.action = action
+        self.items = list(items)
+        self.log_path = log_path
+        self.workers_per_volume = max(1, workers_per_volume)
+        self.max_workers = max(1, max_workers)
+        self.undo_of = undo_of  # Log this job reverses (undo jobs are not offered for undo themselves)
+        self.batch = trash.Trash.new_batch() if action == "trash" else None  # Trash journal batch id
+        self.completed = 0
+        self.errors: List[Tuple[str, str]] = []  # (path, message)
+        self.started_at = 0.0
+        self.finished_at = 0.0
+        self._lock = threading.Lock()
+        self._log = None
+        self._seq = 0
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._dev_cache: Dict[str, int] = {}
+        self._restored: List[str] = []  # Trashed paths put back (their journal entries go in one rewrite)
+
+
+    def start(self) -> 'BulkActionJob':
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name=f"funnel-bulk-{self.action}", daemon=True)
+        self._thread.start()
+        return self
+
+
+    def cancel(self) -> None:
+        """Stop after the operations already running; finished ones stay done (and logged)."""
+        self._cancelled.set()
+
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+
+    def snapshot(self) -> Tuple[int, int, int, bool]:
+        """(processed, total, errors, finished) - cheap enough to sample every frame."""
+        with self._lock:
+            return self.completed + len(self.errors), len(self.items), len(self.errors), self._finished.is_set()
+
+
+#endregion
+#region - Worker
+
+
+    def _run(self) -> None:
+        try:
+            self._open_log()
+            by_volume: Dict[int, deque] = {}
+            for index, (path, _arg) in enumerate(self.items):
+                by_volume.setdefault(_volume_of(path, self._dev_cache), deque()).append(index)
+            per_volume = max(1, min(self.workers_per_volume, self.max_workers // max(1, len(by_volume))))
+            threads = []
+            for dev, queue in by_volume.items():
+                for n in range(min(per_volume, len(queue))):
+                    thread = threading.Thread(target=self._drain, args=(queue,), name=f"funnel-bulk-{dev}-{n}", daemon=True)
+                    thread.start()
+                    threads.append(thread)
+            for thread in threads:
+                thread.join()
+            if self._restored:
+                trash.get_trash().forget(self._restored)
+        finally:
+            self.finished_at = time.time()
+            self._close_log()
+            self._finished.set()
+
+
+    def _drain(self, queue: deque) -> None:
+        while not self._cancelled.is_set():
+            try:
+                index = queue.popleft()
+            except IndexError:
+                return
+            path, arg = self.items[index]
+            seq = self._write({"op": self.action, "src": path, "arg": arg})
+            try:
+                result = self._apply(path, arg)
+            except Exception as e:
+                self._write({"seq": seq, "error": str(e)})
+                with self._lock:
+                    self.errors.append((path, str(e)))
+                continue
+            self._write({"seq": seq, "ok": True, "dst": result} if result else {"seq": seq, "ok": True})
+            with self._lock:
+                self.completed += 1
+                if self.action == "restore":
+                    self._restored.append(path)
+
+
+    def _apply(self, path: str, arg: Optional[str]) -> Optional[str]:
+        """Run one operation; returns where the file went when that isn't known up front (trash)."""
+        if self.action == "delete":
+            os.remove(path)
+        elif self.action == "trash":
+            return trash.get_trash().send(path, self.batch)
+        elif self.action == "restore":
+            trash.get_trash().restore(path, arg, update_journal=False)
+        elif self.action == "move":
+            os.makedirs(os.path.dirname(arg), exist_ok=True)
+            if os.path.lexists(arg):
+                raise FileExistsError(f"Destination exists: {arg}")
+            if _volume_of(path, self._dev_cache) == _volume_of(arg, self._dev_cache):
+                os.rename(path, arg)  # Same volume: metadata-only
+            else:
+                shutil.move(path, arg)
+        elif self.action == "hardlink":
+            dedup_links.hardlink_duplicate(arg, path)
+        elif self.action == "reflink":
+            dedup_links.reflink_duplicate(arg, path)
+        return None
+
+
+#endregion
+#region - Action Log
+
+
+    def _open_log(self) -> None:
+        if not self.log_path:
+            return
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        self._log = open(self.log_path, "a", encoding="utf-8")
+        self._write({"job": self.action, "started": self.started_at, "total": len(self.items), "undoable": self.action in UNDOABLE and not self.undo_of, "undo_of": self.undo_of})
+
+
+    def _write(self, record: dict) -> int:
+        """Append one record (flushed before the operation runs); returns its sequence number."""
+        with self._lock:
+            self._seq += 1
+            if self._log is not None:
+                record.setdefault("seq", self._seq)
+                self._log.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._log.flush()
+            return self._seq
+
+
+    def _close_log(self) -> None:
+        with self._lock:
+            log, self._log = self._log, None
+        if log is None:
+            return
+        try:
+            summary = {"done": True, "completed": self.completed, "errors": len(self.errors), "cancelled": self.cancelled}
+            log.write(json.dumps(summary) + "\n")
+            log.flush()
+            os.fsync(log.fileno())
+        finally:
+            log.close()
+
+
+#endregion
+#region - Undo
+
+
+def read_action_log(log_path: str) -> List[dict]:
+    """Operation records of a log (a torn last line from a crash is ignored)."""
+    records = []
+    try:
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        return []
+    return records
+
+
+def undo_items(log_path: str) -> Tuple[str, List[Item]]:
+    """(action, items) of the job that reverses a logged one, newest operation first.
+
+    A move log is undone by moves back; a trash log by restores. Operations are
+    checked against the disk rather than their logged outcome, so a move interrupted
+    between running and being marked done is still undone; files that were moved
+    again, purged or replaced since are left alone.
+    """
+    records = read_action_log(log_path)
+    results = {record["seq"]: record.get("dst") for record in records if record.get("ok") and "seq" in record}
+    action = "move"
+    items = []
+    for record in reversed(records):
+        op = record.get("op")
+        src = record.get("src")
+        if op == "move":
+            dst = record.get("arg")
+        elif op == "trash":
+            action = "restore"
+            dst = results.get(record.get("seq"))
+        else:
+            continue
+        if src and dst and os.path.lexists(dst) and not os.path.lexists(src):
+            items.append((dst, src))
+    return action, items
+
+
+def latest_undoable_log(log_dir: str, limit: int = 20) -> Optional[str]:
+    """Newest of the last `limit` action logs in log_dir that has something left to undo."""
+    try:
+        names = sorted((n for n in os.listdir(log_dir) if n.endswith(".jsonl")), reverse=True)
+    except OSError:
+        return None
+    for name in names[:limit]:
+        path = os.path.join(log_dir, name)
+        records = read_action_log(path)
+        if records and records[0].get("undoable") and undo_items(path)[1]:
+            return path
+    return None
+
+
+def new_log_path(log_dir: str, action: str) -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(log_dir, f"{stamp}-{int(time.time() * 1000) % 1000:03d}-{action}.jsonl")
+
+
+#endregion
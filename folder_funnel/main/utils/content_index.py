@@ -0,0 +1,377 @@
+"""
+Content-addressed index of a whole source tree.
+
+Answers "does this content already exist anywhere in the library?" without a
+directory scan and without holding a table of every file in memory. RAM holds
+two Bloom filters, about 10 bits per file each: one over file sizes and one over
+(size, partial hash). The exact (size, hash) records live in the persistent
+`HashIndex` on disk (a private in-memory one when none is open), and are only
+queried when both filters say the content may be present.
+
+So a lookup is:
+- size filter miss: no file has that size, nothing read;
+- content filter miss: one partial read of the incoming file;
+- otherwise: candidates come from the hash index, are re-stat'ed, and the
+  incoming file and each candidate are fully hashed (through the hash cache).
+
+The tree is walked once in the background; partial hashes already in the hash
+index are reused, so after a restart the build costs a stat per file. Filter
+rebuilds (when the tree outgrows them) read the hash index, not the files.
+Watcher events are debounced per path and indexed on a background thread.
+
+All methods are thread-safe.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import os
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Custom
+from . import metrics
+from . import duplicate_handler
+from .hash_index import HashIndex
+from .bloom_filter import BloomFilter
+
+
+#endregion
+#region - ContentIndex
+
+
+MIN_CAPACITY = 64 * 1024  # Smallest filter (items); filters are rebuilt at twice the size when full
+ADD_DEBOUNCE_S = 1.0  # Quiet time after a watcher event before the file is (re)hashed
+RETRY_S = 5.0  # Retry delay for files that can't be read yet
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def _size_item(size: int) -> bytes:
+    return str(size).encode("ascii")
+
+
+def _content_item(size: int, hash_value: str) -> bytes:
+    return f"{size}:{hash_value}".encode("ascii")
+
+
+class ContentIndex:
+    """Size and content filters over every file under root, backed by the hash index."""
+    def __init__(self, root: str, min_size: int = 1, partial_size: int = 0, partial_mode: str = "head_tail"):
+        self.root = root
+        self.min_size = min_size  # Empty files are never treated as duplicates
+        # Hash kind in the filter and in the exact lookups; no partial size means full hashes
+        self.partial_size = partial_size
+        self.partial_mode = partial_mode if partial_size > 0 else "full"
+        self._prefix = _norm(root).rstrip(os.sep) + os.sep
+        self._lock = threading.RLock()
+        self._store = duplicate_handler.get_hash_index()
+        self._owns_store = self._store is None
+        if self._owns_store:
+            self._store = HashIndex(":memory:")
+        self._sizes = BloomFilter(MIN_CAPACITY)
+        self._items = BloomFilter(MIN_CAPACITY)
+        self._count = 0  # Files indexed (watcher re-adds included)
+        self._rebuilding = False
+        self._replay: Optional[List[Tuple[int, str]]] = None  # Items added while a rebuild runs
+        # Watcher adds waiting for their debounce (or for the file to become readable):
+        # norm path -> (path, size, due); their sizes are also "maybe present" until indexed
+        self._pending: Dict[str, Tuple[str, int, float]] = {}
+        self._wakeup = threading.Condition(self._lock)
+        self._ready = threading.Event()  # Set once every file found by the walk is in the filters
+        self._cancelled = threading.Event()
+        self._adder = threading.Thread(target=self._add_loop, name="funnel-content-adds", daemon=True)
+        self._adder.start()
+
+
+#endregion
+#region - Build
+
+
+    def build(self) -> None:
+        """Walk the tree and put every file in the filters. Run on a background thread."""
+        with metrics.timer("content_index.walk") as t:
+            t.items = 0
+            stack = [self.root]
+            while stack and not self._cancelled.is_set():
+                try:
+                    with os.scandir(stack.pop()) as entries:
+                        for entry in entries:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    stack.append(entry.path)
+                                elif entry.is_file(follow_symlinks=False):
+                                    st = entry.stat(follow_symlinks=False)
+                                    if st.st_size >= self.min_size and not self._index_file(entry.path, st.st_size, st.st_mtime):
+                                        self._schedule(entry.path, st.st_size, RETRY_S)
+                                    t.items += 1
+                            except OSError:
+                                continue
+                except OSError:
+                    continue
+        if not self._cancelled.is_set():
+            self._ready.set()
+
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        with self._lock:
+            self._pending.clear()
+            self._wakeup.notify_all()
+        if self._owns_store:
+            self._store.close()
+
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+
+    @property
+    def is_hashed(self) -> bool:
+        """Same as is_ready: the filters are only trusted once the walk hashed every file."""
+        return self._ready.is_set()
+
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "files": self._count,
+                "pending": len(self._pending),
+                "filter_bytes": self._sizes.nbytes + self._items.nbytes,
+            }
+
+
+    def _index_file(self, path: str, size: int, mtime: float) -> bool:
+        """Hash a file (or reuse its stored hash) and add it; False if it can't be read yet."""
+        key = _norm(path)
+        hash_value = self._store.lookup(key, mtime, size, self.partial_size, self.partial_mode)
+        if hash_value is None:
+            try:
+                hash_value = duplicate_handler.get_md5(path, partial_size=self.partial_size, partial_mode=self.partial_mode)
+            except duplicate_handler.FileNotReadyError:
+                return False
+            self._store.record(key, mtime, size, self.partial_size, self.partial_mode, hash_value)
+        self._add_item(size, hash_value)
+        return True
+
+
+    def _add_item(self, size: int, hash_value: str) -> None:
+        with self._lock:
+            self._sizes.add(_size_item(size))
+            self._items.add(_content_item(size, hash_value))
+            self._count += 1
+            if self._replay is not None:
+                self._replay.append((size, hash_value))
+            if not self._items.is_full or self._rebuilding or self._cancelled.is_set():
+                return
+            self._rebuilding = True  # Set under the lock: one rebuild at a time
+        threading.Thread(target=self._rebuild_filters, name="funnel-content-filter", daemon=True).start()
+
+
+    def _rebuild_filters(self) -> None:
+        """Refill both filters at twice the size from the hash index (no file reads).
+
+        The old filters keep answering meanwhile: past capacity they only give more false positives.
+        """
+        try:
+            with self._lock:
+                capacity = max(MIN_CAPACITY, 2 * self._count)
+                self._replay = []
+            sizes, items = BloomFilter(capacity), BloomFilter(capacity)
+            count = 0
+            with metrics.timer("content_index.filter") as t:
+                for size, hash_value in self._store.iter_content(self._prefix, self.partial_size, self.partial_mode):
+                    if self._cancelled.is_set():
+                        return
+                    sizes.add(_size_item(size))
+                    items.add(_content_item(size, hash_value))
+                    count += 1
+                t.items = count
+            with self._lock:
+                for size, hash_value in self._replay:
+                    sizes.add(_size_item(size))
+                    items.add(_content_item(size, hash_value))
+                for _path, size, _due in self._pending.values():
+                    sizes.add(_size_item(size))
+                self._sizes, self._items = sizes, items
+                self._count = count + len(self._replay)
+        finally:
+            with self._lock:
+                self._replay = None
+                self._rebuilding = False
+
+
+#endregion
+#region - Maintenance
+
+
+    def add(self, path: str) -> None:
+        """(Re)index a file after ADD_DEBOUNCE_S without further events for it.
+
+        Only stats on the calling thread (the watcher's); hashing runs on the index's own thread.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.remove(path)
+            return
+        if st.st_size >= self.min_size:
+            self._schedule(path, st.st_size, ADD_DEBOUNCE_S)
+
+
+    def remove(self, path: str) -> None:
+        # Filter bits stay set and hash index rows are dropped by the watcher: a removed file
+        # only costs false positives until the next rebuild
+        with self._lock:
+            self._pending.pop(_norm(path), None)
+
+
+    def remove_tree(self, dir_path: str) -> None:
+        prefix = _norm(dir_path) + os.sep
+        with self._lock:
+            for key in [k for k in self._pending if k.startswith(prefix)]:
+                del self._pending[key]
+
+
+    def rename(self, old_path: str, new_path: str) -> None:
+        # Content is unchanged and the watcher carries the hash index rows; only pending adds move
+        with self._lock:
+            entry = self._pending.pop(_norm(old_path), None)
+            if entry is not None:
+                self._pending[_norm(new_path)] = (new_path, entry[1], entry[2])
+
+
+    def rename_tree(self, old_dir: str, new_dir: str) -> None:
+        old_prefix = _norm(old_dir) + os.sep
+        with self._lock:
+            for key in [k for k in self._pending if k.startswith(old_prefix)]:
+                path, size, due = self._pending.pop(key)
+                new_path = os.path.join(new_dir, os.path.relpath(path, old_dir))
+                self._pending[_norm(new_path)] = (new_path, size, due)
+
+
+    def _schedule(self, path: str, size: int, delay: float) -> None:
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self._sizes.add(_size_item(size))  # Maybe present from now on, so lookups never miss it
+            self._pending[_norm(path)] = (path, size, time.monotonic() + delay)
+            self._wakeup.notify()
+
+
+    def _add_loop(self) -> None:
+        while not self._cancelled.is_set():
+            with self._lock:
+                now = time.monotonic()
+                due = [(key, entry) for key, entry in self._pending.items() if entry[2] <= now]
+                if not due:
+                    next_due = min((entry[2] for entry in self._pending.values()), default=None)
+                    self._wakeup.wait(None if next_due is None else max(0.05, next_due - now))
+                    continue
+            for key, (path, size, queued_due) in due:
+                if self._cancelled.is_set():
+                    return
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    indexed = True  # Gone; nothing to index
+                else:
+                    try:
+                        indexed = st.st_size < self.min_size or self._index_file(path, st.st_size, st.st_mtime)
+                    except Exception:
+                        if self._cancelled.is_set():
+                            return  # Store closed under us
+                        indexed = False
+                with self._lock:
+                    entry = self._pending.get(key)
+                    if entry is None or entry[2] != queued_due:
+                        continue  # Removed, or another event re-armed the debounce meanwhile
+                    if indexed:
+                        del self._pending[key]
+                    else:
+                        self._pending[key] = (path, size, time.monotonic() + RETRY_S)
+
+
+#endregion
+#region - Lookup
+
+
+    def _maybe_present(self, path: str, size: int) -> Tuple[bool, List[str]]:
+        """(size may be indexed, pending files of that size that aren't in the filters yet)."""
+        key = _norm(path)
+        with self._lock:
+            pending = [entry[0] for k, entry in self._pending.items() if entry[1] == size and k != key]
+            return _size_item(size) in self._sizes or bool(pending), pending
+
+
+    def _candidates(self, size: int, hash_value: str) -> List[str]:
+        """Files under root stored with this content hash that still have the recorded size and mtime."""
+        matches = []
+        for stored_path, mtime in self._store.find_content(size, hash_value, self.partial_size, self.partial_mode):
+            if not stored_path.startswith(self._prefix):
+                continue
+            try:
+                st = os.stat(stored_path)
+            except OSError:
+                continue
+            if st.st_size == size and st.st_mtime == mtime:
+                matches.append(stored_path)
+        return matches
+
+
+    def prefetch(self, path: str) -> None:
+        """Do the reads find() will need, off the commit path."""
+        try:
+            size = os.path.getsize(path)
+            if size < self.min_size or not self._maybe_present(path, size)[0]:
+                return
+            duplicate_handler.get_md5(path, partial_size=self.partial_size, partial_mode=self.partial_mode)
+        except (OSError, duplicate_handler.FileNotReadyError):
+            pass
+
+
+    def find(self, path: str) -> Optional[str]:
+        """Return an indexed file with the same content as path, or None.
+
+        A size filter miss answers without reading anything, and a content filter
+        miss after one partial read. Otherwise candidates from the hash index (plus
+        files still waiting to be indexed) are confirmed by full hash.
+        Raises duplicate_handler.FileNotReadyError if path can't be read yet.
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError as exc:
+            raise duplicate_handler.FileNotReadyError(str(exc)) from exc
+        if size < self.min_size:
+            return None
+        present, pending = self._maybe_present(path, size)
+        metrics.hit("content_index.size", present)
+        if not present:
+            return None
+        hash_value = duplicate_handler.get_md5(path, partial_size=self.partial_size, partial_mode=self.partial_mode)
+        with self._lock:
+            in_filter = _content_item(size, hash_value) in self._items
+        metrics.hit("content_index.filter", in_filter)
+        candidates = self._candidates(size, hash_value) if in_filter else []
+        candidates += pending
+        if not candidates:
+            return None
+        full_hash = duplicate_handler.get_md5(path) if self.partial_size > 0 else hash_value
+        for candidate in candidates:
+            try:
+                if duplicate_handler.get_md5(candidate) == full_hash:
+                    metrics.hit("content_index.hash", True)
+                    return candidate
+            except duplicate_handler.FileNotReadyError:
+                continue
+        metrics.hit("content_index.hash", False)
+        return None
+
+
+#endregion
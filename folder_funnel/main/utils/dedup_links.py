@@ -0,0 +1,155 @@
+"""
+Reclaim the space of duplicate files without removing any path.
+
+`hardlink_duplicate` points a duplicate's path at the kept file's inode;
+`reflink_duplicate` gives the duplicate its own inode whose data extents are
+shared copy-on-write with the kept file (Linux FICLONE: Btrfs, XFS, bcachefs,
+OCFS2). Both verify the contents first, build the replacement under a temporary
+name in the duplicate's folder, and swap it in with one atomic rename, so the
+duplicate path always holds either the old file or the new one.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import os
+import sys
+import errno
+import shutil
+from typing import Optional, Tuple
+
+# Custom
+from . import duplicate_handler
+
+
+#endregion
+#region - Helpers
+
+
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+
+# errno values meaning "this filesystem (pair) can't do it", as opposed to a real failure
+_UNSUPPORTED = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EPERM, errno.ENOSYS}
+
+
+class LinkUnsupportedError(OSError):
+    """The filesystem can't link/clone these two files (different volumes, no reflink support, ...)."""
+
+
+def inode_key(path: str) -> Optional[Tuple[int, int]]:
+    """(st_dev, st_ino) of path, or None when the platform doesn't report inodes."""
+    try:
+        st = os.stat(path, follow_symlinks=False)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino) if st.st_ino else None
+
+
+def _verify_identical(keep: str, duplicate: str) -> None:
+    """Raise unless both files have the same bytes (cached full hashes avoid the re-read)."""
+    keep_hash = duplicate_handler.get_cached_hash(keep)
+    if keep_hash is not None and keep_hash == duplicate_handler.get_cached_hash(duplicate):
+        return
+    if not duplicate_handler.compare_files(keep, duplicate):
+        raise ValueError(f"Contents differ: {os.path.basename(duplicate)}")
+
+
+def _temp_path(duplicate: str) -> str:
+    directory, name = os.path.split(duplicate)
+    for n in range(1000):
+        candidate = os.path.join(directory, f".{name}.ff-link{n or ''}")
+        if not os.path.lexists(candidate):
+            return candidate
+    raise FileExistsError(duplicate)
+
+
+def _swap_in(temp: str, duplicate: str) -> None:
+    try:
+        os.replace(temp, duplicate)
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+
+
+#endregion
+#region - Actions
+
+
+def hardlink_duplicate(keep: str, duplicate: str) -> bool:
+    """Replace duplicate with a hard link to keep. Returns False if they were already linked.
+
+    The duplicate path takes on keep's metadata (they become one inode).
+    Raises LinkUnsupportedError across volumes or on filesystems without hard links.
+    """
+    if inode_key(keep) is not None and inode_key(keep) == inode_key(duplicate):
+        return False
+    _verify_identical(keep, duplicate)
+    temp = _temp_path(duplicate)
+    try:
+        os.link(keep, temp)
+    except OSError as exc:
+        if exc.errno in _UNSUPPORTED:
+            raise LinkUnsupportedError(exc.errno, f"Hard links not supported here: {exc.strerror}", duplicate) from exc
+        raise
+    _swap_in(temp, duplicate)
+    return True
+
+
+def reflink_duplicate(keep: str, duplicate: str) -> bool:
+    """Replace duplicate with a copy-on-write clone of keep, keeping duplicate's own metadata.
+
+    Returns False if they were already the same inode.
+    Raises LinkUnsupportedError when the platform or filesystem has no reflinks.
+    """
+    if not sys.platform.startswith("linux"):
+        raise LinkUnsupportedError(errno.EOPNOTSUPP, "Reflinks are only supported on Linux", duplicate)
+    import fcntl
+    if inode_key(keep) is not None and inode_key(keep) == inode_key(duplicate):
+        return False
+    _verify_identical(keep, duplicate)
+    temp = _temp_path(duplicate)
+    try:
+        with open(keep, "rb") as src, open(temp, "xb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(duplicate, temp)
+    except OSError as exc:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        if exc.errno in _UNSUPPORTED:
+            raise LinkUnsupportedError(exc.errno, f"Reflinks not supported here: {exc.strerror}", duplicate) from exc
+        raise
+    _swap_in(temp, duplicate)
+    return True
+
+
+def reflink_supported(directory: str) -> bool:
+    """Probe whether files in directory can be cloned (creates and removes two tiny files)."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+    src_path = os.path.join(directory, ".ff-reflink-probe")
+    dst_path = src_path + "-clone"
+    try:
+        with open(src_path, "wb") as src:
+            src.write(b"probe")
+        with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        return False
+    finally:
+        for path in (dst_path, src_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+#endregion
@@ -10,8 +10,9 @@ import threading
 from typing import List, Dict, Tuple, Optional, Any
 from difflib import SequenceMatcher
 
-# Third-Party
-import nenotk as ntk
+# Custom
+from . import metrics
+from .hash_index import HashIndex
 
 # Type checking
 from typing import TYPE_CHECKING
@@ -41,6 +42,7 @@ _hash_cache_lock = threading.Lock()
 def get_file_key(filepath: str) -> Optional[Tuple[str, float, int]]:
     """Get a cache key for a file based on path, mtime, and size.
     Returns None if file doesn't exist or can't be accessed."""
+    metrics.count("stat")
     try:
         stat = os.stat(filepath)
         # normcase is important on Windows to avoid duplicate entries due to path casing
@@ -60,17 +62,45 @@ def _make_hash_cache_key(filepath: str, partial_size: int, partial_mode: str) ->
 
 def get_cached_hash(filepath: str, partial_size: int = 0, chunk_size: int = 8192, partial_mode: str = "head_tail") -> Optional[str]:
     """Get hash from cache if available and file hasn't changed.
+    Falls back to the persistent hash index on a memory miss.
     Returns None if not cached or file has been modified."""
     # chunk_size is intentionally not part of the cache key
     cache_key = _make_hash_cache_key(filepath, partial_size, partial_mode)
     if cache_key is None:
         return None
     with _hash_cache_lock:
-        return _hash_cache.get(cache_key)
+        cached = _hash_cache.get(cache_key)
+    metrics.hit("hash_cache", cached is not None)
+    if cached is None and _hash_index is not None:
+        try:
+            cached = _hash_index.lookup(cache_key[0], cache_key[1], cache_key[2], cache_key[3], cache_key[4])
+        except Exception:
+            cached = None
+        metrics.hit("hash_index", cached is not None)
+        if cached is not None:
+            _store_in_memory(cache_key, cached)
+    return cached
+
+
+def set_cached_hash(filepath: str, hash_value: str, partial_size: int = 0, partial_mode: str = "head_tail",
+                    persist: bool = False) -> None:
+    """Store a hash in the memory cache; with persist, also in the persistent hash index (if open).
+
+    Only files that end up in a watched source tree are persisted, so scans of
+    arbitrary folders and funnel files that get deleted don't grow the index.
+    """
+    cache_key = _make_hash_cache_key(filepath, partial_size, partial_mode)
+    if cache_key is None:
+        return
+    _store_in_memory(cache_key, hash_value)
+    if persist and _hash_index is not None:
+        try:
+            _hash_index.record(cache_key[0], cache_key[1], cache_key[2], cache_key[3], cache_key[4], hash_value)
+        except Exception:
+            pass
 
 
-def set_cached_hash(filepath: str, hash_value: str, partial_size: int = 0, partial_mode: str = "head_tail") -> None:
-    """Store a hash in the cache."""
+def _store_in_memory(cache_key: Tuple[Any, ...], hash_value: str) -> None:
     global _hash_cache
     with _hash_cache_lock:
         # Evict oldest entries if cache is too large
@@ -79,9 +109,6 @@ def set_cached_hash(filepath: str, hash_value: str, partial_size: int = 0, parti
             to_remove = list(_hash_cache.keys())[:_HASH_CACHE_MAX_SIZE // 5]
             for k in to_remove:
                 del _hash_cache[k]
-        cache_key = _make_hash_cache_key(filepath, partial_size, partial_mode)
-        if cache_key is None:
-            return
         _hash_cache[cache_key] = hash_value
 
 
@@ -101,6 +128,82 @@ def get_cache_stats() -> Dict[str, int]:
         }
 
 
+#endregion
+#region - Hash Index
+
+
+# Optional persistent store behind the memory cache (see hash_index.py)
+_hash_index: Optional[HashIndex] = None
+
+
+def open_hash_index(db_path: str) -> HashIndex:
+    """Open (or replace) the process-wide persistent hash index."""
+    global _hash_index
+    close_hash_index()
+    _hash_index = HashIndex(db_path)
+    return _hash_index
+
+
+def close_hash_index() -> None:
+    global _hash_index
+    index, _hash_index = _hash_index, None
+    if index is not None:
+        try:
+            index.close()
+        except Exception:
+            pass
+
+
+def get_hash_index() -> Optional[HashIndex]:
+    return _hash_index
+
+
+def _norm_path(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def take_hashes(filepath: str, kinds: List[Tuple[int, str]]) -> List[Tuple[int, str, str]]:
+    """Collect the known hashes of a file that is about to be moved.
+    kinds is a list of (partial_size, partial_mode); partial_size 0 means the full hash."""
+    carried = []
+    for partial_size, partial_mode in kinds:
+        hash_value = get_cached_hash(filepath, partial_size, partial_mode=partial_mode)
+        if hash_value is not None:
+            carried.append((partial_size, partial_mode, hash_value))
+    return carried
+
+
+def carry_hashes(old_path: str, new_path: str, carried: List[Tuple[int, str, str]]) -> None:
+    """Re-key hashes taken with take_hashes() to a file's new path and stat after a move."""
+    if carried:
+        for partial_size, partial_mode, hash_value in carried:
+            set_cached_hash(new_path, hash_value, partial_size, partial_mode=partial_mode, persist=True)
+    forget_hashes([old_path])
+
+
+def forget_hashes(paths: List[str]) -> None:
+    """Drop persistent rows for paths that no longer exist."""
+    if _hash_index is None:
+        return
+    try:
+        _hash_index.remove([_norm_path(p) for p in paths])
+    except Exception:
+        pass
+
+
+def rename_hashes(old_path: str, new_path: str, is_directory: bool = False) -> None:
+    """Follow a rename inside the source tree so its recorded hashes stay valid."""
+    if _hash_index is None:
+        return
+    try:
+        if is_directory:
+            _hash_index.rename_tree(_norm_path(old_path), _norm_path(new_path))
+        else:
+            _hash_index.rename(_norm_path(old_path), _norm_path(new_path))
+    except Exception:
+        pass
+
+
 #endregion
 #region - Directory Cache
 
@@ -119,9 +222,13 @@ def get_cached_dir_listing(dir_path: str) -> List[str]:
         with _dir_cache_lock:
             cached = _dir_cache.get(dir_path)
             if cached and cached[0] == current_mtime:
+                metrics.hit("dir_cache", True)
                 return cached[1]
+        metrics.hit("dir_cache", False)
         # Refresh cache outside lock when hitting filesystem
-        files = os.listdir(dir_path)
+        with metrics.timer("listdir") as t:
+            files = os.listdir(dir_path)
+            t.items = len(files)
         with _dir_cache_lock:
             _dir_cache[dir_path] = (current_mtime, files)
         return files
@@ -144,6 +251,30 @@ def invalidate_dir_cache(dir_path: str = None) -> None:
 #region - File Operations
 
 
+# Partial hash modes:
+#   "head_tail"     first partial_size bytes + last partial_size bytes
+#   "sampled:<K>"   K evenly spaced blocks of partial_size bytes (first and last included)
+DEFAULT_SAMPLE_COUNT = 8
+
+
+def sampled_mode(samples: int = DEFAULT_SAMPLE_COUNT) -> str:
+    """Return the partial_mode string for K-block sampled hashing (K is part of the cache key)."""
+    return f"sampled:{max(2, int(samples))}"
+
+
+def partial_hash_mode(mode: str, samples: int = DEFAULT_SAMPLE_COUNT) -> str:
+    """Map a settings value ("head_tail" / "sampled") to a get_md5 partial_mode."""
+    return sampled_mode(samples) if str(mode).startswith("sampled") else "head_tail"
+
+
+def _sample_offsets(file_size: int, block_size: int, samples: int) -> List[int]:
+    """Start offsets of `samples` evenly spaced blocks covering head to tail."""
+    if file_size <= block_size * samples:
+        return [0]  # Small file: a single read of the whole thing is cheaper
+    span = file_size - block_size
+    return [(span * i) // (samples - 1) for i in range(samples)]
+
+
 def get_md5(
     filename: str,
     chunk_size: int = 8192,
@@ -156,8 +287,9 @@ def get_md5(
     Args:
         filename: Path to the file to hash
         chunk_size: Size of chunks to read at a time
-        partial_size: If > 0, only hash the first N bytes (for quick comparison)
+        partial_size: If > 0, only hash part of the file (for quick comparison); see partial_mode
         use_cache: Whether to use the hash cache
+        partial_mode: "head_tail", or "sampled:<K>" for K blocks of partial_size bytes
 
     Returns:
         MD5 hash as hex string
@@ -172,9 +304,22 @@ def get_md5(
     except (OSError, IOError) as exc:
         raise FileNotReadyError(str(exc)) from exc
     m = hashlib.md5()
+    sampled = partial_size > 0 and partial_mode.startswith("sampled")
+    t = metrics.timer("hash.full" if partial_size <= 0 else ("hash.sampled" if sampled else "hash.partial"))
     try:
-        with open(filename, 'rb') as f:
-            if partial_size > 0:
+        with t, open(filename, 'rb') as f:
+            if sampled:
+                samples = int(partial_mode.partition(":")[2] or DEFAULT_SAMPLE_COUNT)
+                offsets = _sample_offsets(int(file_size), int(partial_size), samples)
+                block = int(partial_size) if len(offsets) > 1 else int(file_size)
+                bytes_read = 0
+                for offset in offsets:
+                    f.seek(offset)
+                    data = f.read(block)
+                    m.update(data)
+                    bytes_read += len(data)
+                t.nbytes = bytes_read
+            elif partial_size > 0:
                 # Head
                 remaining = min(int(partial_size), int(file_size))
                 bytes_read = 0
@@ -193,15 +338,18 @@ def get_md5(
                         tail = f.read(int(partial_size))
                         if tail:
                             m.update(tail)
+                            bytes_read += len(tail)
                     except (OSError, IOError):
                         # If seeking fails for any reason, fall back to header-only
                         pass
+                t.nbytes = bytes_read
             else:
                 while True:
                     chunk = f.read(chunk_size)
                     if not chunk:
                         break
                     m.update(chunk)
+                t.nbytes = file_size
     except (PermissionError, OSError, IOError) as exc:
         raise FileNotReadyError(str(exc)) from exc
     hash_value = m.hexdigest()
@@ -211,8 +359,47 @@ def get_md5(
     return hash_value
 
 
+COMPARE_BUFFER_SIZE = 1024 * 1024  # Read size per file for lockstep byte comparison
+
+
+def compare_files(file1: str, file2: str, buffer_size: int = COMPARE_BUFFER_SIZE) -> bool:
+    """Byte-compare two files in lockstep, stopping at the first differing block.
+
+    When the files match, their full MD5 (computed from file1's blocks during the read) is cached
+    for both paths, so later checks against either file are cache hits.
+    """
+    try:
+        if os.path.getsize(file1) != os.path.getsize(file2):
+            return False
+    except (OSError, IOError) as exc:
+        raise FileNotReadyError(str(exc)) from exc
+    m = hashlib.md5()
+    t = metrics.timer("compare.bytes")
+    bytes_read = 0
+    try:
+        with t, open(file1, 'rb') as f1, open(file2, 'rb') as f2:
+            while True:
+                block1 = f1.read(buffer_size)
+                block2 = f2.read(buffer_size)
+                bytes_read += len(block1) + len(block2)
+                t.nbytes = bytes_read
+                if block1 != block2:
+                    metrics.count("compare.early_exit")
+                    return False
+                if not block1:
+                    break
+                m.update(block1)
+    except (PermissionError, OSError, IOError) as exc:
+        raise FileNotReadyError(str(exc)) from exc
+    hash_value = m.hexdigest()
+    set_cached_hash(file1, hash_value)
+    set_cached_hash(file2, hash_value)
+    return True
+
+
 def get_file_size(filepath: str) -> int:
     """Get file size, returns -1 if file doesn't exist."""
+    metrics.count("stat")
     try:
         return os.path.getsize(filepath)
     except (OSError, IOError):
@@ -222,7 +409,7 @@ def get_file_size(filepath: str) -> int:
 def are_files_identical(file1: str, file2: str, check_mode: str = "Similar",
                         method: str = 'Strict', max_files: int = 10,
                         chunk_size: int = 8192, partial_hash_size: int = 0,
-                        app: 'Main' = None) -> Tuple[bool, Optional[str]]:
+                        app: 'Main' = None, partial_mode: str = "head_tail") -> Tuple[bool, Optional[str]]:
     """Compare files by size/MD5 and/or check similar files in the target directory.
 
     Args:
@@ -234,6 +421,7 @@ def are_files_identical(file1: str, file2: str, check_mode: str = "Similar",
         chunk_size: Chunk size for MD5 calculation
         partial_hash_size: If > 0, use partial hash for initial comparison (bytes to read)
         app: Main app instance for logging warnings
+        partial_mode: Partial hash mode ("head_tail" or "sampled:<K>")
 
     Returns:
         Tuple of (is_identical, matching_file_path)
@@ -247,24 +435,29 @@ def are_files_identical(file1: str, file2: str, check_mode: str = "Similar",
         file1_full_hash: Optional[str] = None
 
         def _partial_hash(path: str) -> str:
-            return get_md5(path, chunk_size, partial_size=partial_hash_size, partial_mode="head_tail")
+            return get_md5(path, chunk_size, partial_size=partial_hash_size, partial_mode=partial_mode)
 
         def _full_hash(path: str) -> str:
             return get_md5(path, chunk_size)
 
+        def _confirm_single(path: str) -> bool:
+            # One pair left to decide: compare bytes (early exit on the first difference) unless both full hashes are already known
+            nonlocal file1_full_hash
+            file1_full_hash = file1_full_hash or get_cached_hash(file1)
+            candidate_hash = get_cached_hash(path)
+            if file1_full_hash and candidate_hash:
+                return candidate_hash == file1_full_hash
+            return compare_files(file1, path)
+
         # Fast path: always check the exact destination file first (most likely candidate)
         if os.path.exists(file2) and get_file_size(file2) == file1_size:
             if partial_hash_size > 0:
                 if file1_partial_hash is None:
                     file1_partial_hash = _partial_hash(file1)
-                if _partial_hash(file2) == file1_partial_hash:
-                    file1_full_hash = file1_full_hash or _full_hash(file1)
-                    if _full_hash(file2) == file1_full_hash:
-                        return True, file2
-            else:
-                file1_full_hash = file1_full_hash or _full_hash(file1)
-                if _full_hash(file2) == file1_full_hash:
+                if _partial_hash(file2) == file1_partial_hash and _confirm_single(file2):
                     return True, file2
+            elif _confirm_single(file2):
+                return True, file2
         # Single mode: only check the exact destination file
         if check_mode == "Single":
             return False, None
@@ -274,6 +467,8 @@ def are_files_identical(file1: str, file2: str, check_mode: str = "Similar",
             app.log(f"Warning: max_files limit ({max_files}) reached in {os.path.basename(target_dir)}, some duplicates may be missed", mode="warning", verbose=2)
         checked = 0
         full_md5_computes = 0
+        # Partial-hash gate first, so we know how many candidates need a full comparison
+        survivors = []
         for candidate in similar_files:
             if candidate == file2:
                 continue  # already checked
@@ -288,13 +483,20 @@ def are_files_identical(file1: str, file2: str, check_mode: str = "Similar",
                         continue
                 except FileNotReadyError:
                     continue
-            if file1_full_hash is None:
-                file1_full_hash = _full_hash(file1)
-                full_md5_computes += 1
-            if _full_hash(candidate) == file1_full_hash:
-                return True, candidate
-            checked += 1
-        if app and getattr(app, "log_verbosity_var", None) and app.log_verbosity_var.get() >= 4:
+            survivors.append(candidate)
+        if len(survivors) == 1:
+            checked = 1
+            if _confirm_single(survivors[0]):
+                return True, survivors[0]
+        else:
+            for candidate in survivors:
+                if file1_full_hash is None:
+                    file1_full_hash = _full_hash(file1)
+                    full_md5_computes += 1
+                if _full_hash(candidate) == file1_full_hash:
+                    return True, candidate
+                checked += 1
+        if app and getattr(app, "funnel_config", None) and app.funnel_config.log_verbosity >= 4:
             app.log(f"Dupe check stats: candidates={len(similar_files)}, checked={checked}, full_md5_source={full_md5_computes}", mode="simple", verbose=4)
         return False, None
     except FileNotReadyError:
@@ -308,6 +510,7 @@ def are_files_identical(file1: str, file2: str, check_mode: str = "Similar",
         return False, None
 
 
+@metrics.timed("find_similar_files")
 def find_similar_files(filename: str, target_dir: str, method: str = 'Strict',
                        max_files: int = 10, return_truncation_info: bool = False,
                        source_size: int = -1) -> List[str]:
@@ -414,7 +617,7 @@ def confirm_duplicate_storage_removal(app: 'Main'):
     """Ask the user if they want to remove the duplicate storage folder.
     Returns True if closing should continue, False if cancelled."""
     if app.duplicate_storage_path and os.path.exists(app.duplicate_storage_path):
-        response = ntk.askyesnocancel("Remove Duplicate Files?", prompt="Remove duplicate files folder?", detail=app.duplicate_storage_path)
+        response = app.ask_yes_no_cancel("Remove Duplicate Files?", prompt="Remove duplicate files folder?", detail=app.duplicate_storage_path)
         if response is None:  # Cancel was selected
             return False  # Stop closing
         elif response:  # Yes was selected
@@ -423,14 +626,14 @@ def confirm_duplicate_storage_removal(app: 'Main'):
                 app.log(f"Removed duplicate storage folder: {app.duplicate_storage_path}", mode="info", verbose=1)
             except Exception as e:
                 app.log(f"Failed to remove duplicate folder: {str(e)}", mode="error", verbose=1)
-                ntk.showinfo("Error", f"Failed to remove duplicate folder: {str(e)}")
+                app.show_error("Error", f"Failed to remove duplicate folder: {str(e)}")
         # If No was selected, keep the folder
     return True  # Continue closing
 
 
 def create_duplicate_storage_folder(app: 'Main'):
     """Create a folder to store duplicate files when in 'Move' mode."""
-    source_path = app.source_dir_var.get()
+    source_path = app.funnel_config.source_dir
     source_folder_name = os.path.basename(source_path)
     parent_dir = os.path.dirname(source_path)
     duplicate_folder_name = f"{app.duplicate_name_prefix}{source_folder_name}"
@@ -440,7 +643,7 @@ def create_duplicate_storage_folder(app: 'Main'):
         app.log(f"Created duplicate storage folder: {app.duplicate_storage_path}", mode="info", verbose=2)
     except Exception as e:
         app.log(f"Failed to create duplicate storage folder: {str(e)}", mode="error", verbose=1)
-        ntk.showinfo("Error", f"Failed to create duplicate storage folder: {str(e)}")
+        app.show_error("Error", f"Failed to create duplicate storage folder: {str(e)}")
         app.duplicate_storage_path = ""
 
 
@@ -450,4 +653,36 @@ def show_duplicate_scanner(app: 'Main'):
     scanner = duplicate_scanner_dialog.DuplicateScannerDialog(app.root, app)
 
 
+def review_saved_scan(app: 'Main'):
+    """Open exported Duplicate Scanner results in the interactive review dialog.
+
+    The file is loaded (and every row stat-checked) on a background thread; the dialog opens on the Tk thread.
+    """
+    from tkinter import filedialog
+    path = filedialog.askopenfilename(title="Review saved scan results", parent=app.root, filetypes=[("Scan results", "*.jsonl *.csv *.sqlite *.db"), ("All files", "*.*")])
+    if not path:
+        return
+    app.log(f"Importing scan results from {path}...", mode="info", verbose=2)
+    threading.Thread(target=_load_saved_scan, args=(app, path), name="funnel-review-import", daemon=True).start()
+
+
+def _load_saved_scan(app: 'Main', path: str) -> None:
+    from main.ui.interactive_duplicate_scanner import duplicate_review_dialog
+    from . import scan_results
+    try:
+        loaded = scan_results.import_results(path)
+    except Exception as e:
+        app.log(f"Failed to import scan results from {path}: {str(e)}", mode="error", verbose=1)
+        app.show_error("Error", f"Could not import scan results:\n{str(e)}")
+        return
+    groups = {key: loaded.table.paths(rows) for key, rows in loaded.group_rows.items()}
+    stale_text = f" ({loaded.stale} changed or missing files dropped)" if loaded.stale else ""
+    app.log(f"Imported scan results: {len(groups)} groups from {path}{stale_text}", mode="info", verbose=1)
+    if not groups:
+        app.show_error("No Duplicates", f"No duplicate groups left in {os.path.basename(path)}{stale_text}.")
+        return
+    root = loaded.meta.get("root") or os.path.commonpath(loaded.table.dirs)
+    app._defer_to_ui(duplicate_review_dialog.InteractiveDuplicateReviewDialog, app.root, groups, root, app)
+
+
 #endregion
\ No newline at end of file
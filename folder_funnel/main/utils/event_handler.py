@@ -20,16 +20,7 @@ if TYPE_CHECKING:
 #region - Constants
 
 
-DELAY = 2000  # Delay in milliseconds for after() calls
-
-
-#endregion
-#region - Timer ID Tracking
-
-
-# Module-level timer IDs for debounce cancellation
-_count_timer_id = None
-_sync_timer_id = None
+DELAY = 2000  # Delay in milliseconds for schedule() calls
 
 
 #endregion
@@ -38,72 +29,27 @@ _sync_timer_id = None
 
 def queue_move_file(app: 'Main', path):
     """Queue a file or folder for moving to the watch folder."""
-    app.root.after(DELAY, lambda: app.queue_move_file(path))
+    app.schedule(DELAY, lambda: app.queue_move_file(path))
 
 
 def handle_rename_event(app: 'Main', src, dest):
     """Handle a file rename event."""
-    app.root.after(DELAY, lambda: app.handle_rename_event(src, dest))
-
-
-def _set_timer(timer_name: str, timer_id):
-    """Internal: store timer ids by name."""
-    global _count_timer_id, _sync_timer_id
-    if timer_name == "count":
-        _count_timer_id = timer_id
-    elif timer_name == "sync":
-        _sync_timer_id = timer_id
-
-
-def _get_timer(timer_name: str):
-    """Internal: fetch timer ids by name."""
-    if timer_name == "count":
-        return _count_timer_id
-    if timer_name == "sync":
-        return _sync_timer_id
-    return None
-
-
-def _run_and_clear(timer_name: str, callback, *args, **kwargs):
-    """Invoke callback then clear stored timer id."""
-    _set_timer(timer_name, None)
-    callback(*args, **kwargs)
+    app.schedule(DELAY, lambda: app.handle_rename_event(src, dest))
 
 
 def _debounce(app: 'Main', timer_name: str, callback, delay: int = DELAY, *args, **kwargs):
-    """Cancel any pending timer of this name and schedule a new one."""
-    current_id = _get_timer(timer_name)
-    if current_id is not None:
-        try:
-            app.root.after_cancel(current_id)
-        except Exception:
-            pass
-    new_id = app.root.after(delay, lambda: _run_and_clear(timer_name, callback, *args, **kwargs))
-    _set_timer(timer_name, new_id)
+    """Restart the named debounce window; only the last call within `delay` runs."""
+    app.debounce(timer_name, delay, lambda: callback(*args, **kwargs))
 
 
 def sync_funnel_folders(app: 'Main', silent="semi"):
     """Sync the funnel folders with the source folder. Debounced with timer cancellation."""
-    _debounce(app, "sync", _do_sync, DELAY, app, silent)
-
-
-def _do_sync(app: 'Main', silent):
-    """Execute the sync operation and clear the timer ID."""
-    global _sync_timer_id
-    _sync_timer_id = None
-    app.sync_funnel_folders(silent)
+    _debounce(app, "sync", app.sync_funnel_folders, DELAY, silent)
 
 
 def count_folders_and_files(app: 'Main'):
     """Count the number of folders and files in the source folder. Debounced with timer cancellation."""
-    _debounce(app, "count", _do_count, DELAY, app)
-
-
-def _do_count(app: 'Main'):
-    """Execute the count operation and clear the timer ID."""
-    global _count_timer_id
-    _count_timer_id = None
-    app.count_folders_and_files()
+    _debounce(app, "count", app.count_folders_and_files, DELAY)
 
 
 def invalidate_dir_cache(dir_path: str = None):
@@ -170,6 +116,8 @@ class SourceFolderHandler(FileSystemEventHandler):
             folder_watcher.mirror_created_dir(self.parent, event.src_path)
             self.parent.adjust_counts(folder_delta=1)
         else:
+            if self.parent.content_index is not None:
+                self.parent.content_index.add(event.src_path)
             self.parent.adjust_counts(file_delta=1)
 
 
@@ -178,14 +126,31 @@ class SourceFolderHandler(FileSystemEventHandler):
         if event.is_directory:
             from . import folder_watcher  # Lazy import
             folder_watcher.mirror_deleted_dir(self.parent, event.src_path)
+            if self.parent.content_index is not None:
+                self.parent.content_index.remove_tree(event.src_path)
             self.parent.adjust_counts(folder_delta=-1)
         else:
+            duplicate_handler.forget_hashes([event.src_path])
+            if self.parent.content_index is not None:
+                self.parent.content_index.remove(event.src_path)
             self.parent.adjust_counts(file_delta=-1)
 
 
+    def on_modified(self, event):
+        # Edits in place change a file's content; re-stat it so stale hashes drop out
+        if not event.is_directory and self.parent.content_index is not None:
+            self.parent.content_index.add(event.src_path)
+
+
     def on_moved(self, event):
         invalidate_dir_cache(os.path.dirname(event.src_path))
         invalidate_dir_cache(os.path.dirname(event.dest_path))
+        duplicate_handler.rename_hashes(event.src_path, event.dest_path, is_directory=event.is_directory)
+        if self.parent.content_index is not None:
+            if event.is_directory:
+                self.parent.content_index.rename_tree(event.src_path, event.dest_path)
+            else:
+                self.parent.content_index.rename(event.src_path, event.dest_path)
         if event.is_directory:
             from . import folder_watcher  # Lazy import
             folder_watcher.mirror_moved_dir(self.parent, event.src_path, event.dest_path)
@@ -5,7 +5,9 @@
 from __future__ import annotations
 
 import os
-from typing import Callable, Iterable, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, TypeVar
 
 
 #endregion
@@ -14,6 +16,9 @@ from typing import Callable, Iterable, Optional
 
 VolumeSupport = str  # "stat_walk" | "unsupported"
 
+# Directory listings in flight at once; mostly waiting on I/O (network shares, cold disks)
+DEFAULT_WALK_WORKERS = min(8, (os.cpu_count() or 4) + 4)
+
 
 class FastDiscoveryError(Exception):
     """Base exception for fast discovery failures."""
@@ -75,6 +80,56 @@ def get_counts_via_mft(root_path: str) -> tuple[int, int]:
     return _get_counts_via_scandir(root_path)
 
 
+class DirListing(NamedTuple):
+    """Files of one directory that passed the scan_files filters."""
+    path: str
+    files: list[tuple[str, int, float, Optional[tuple[int, int]]]]  # (name, size, mtime, (st_dev, st_ino) if hard-linked)
+    errors: list[tuple[str, OSError]]  # (path, error) for entries or the directory itself
+
+
+def scan_files(
+    root_path: str,
+    recursive: bool = True,
+    extensions: Optional[set[str]] = None,
+    min_size: int = 0,
+    max_size: Optional[int] = None,
+    workers: int = DEFAULT_WALK_WORKERS,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> Iterator[DirListing]:
+    """Yield one DirListing per directory under root_path, as directories are listed.
+
+    Filters run on the DirEntry in the worker: extensions (lowercase, with the dot)
+    are checked before any stat call, then min_size/max_size. Errors are returned in
+    the listing instead of raised, so the caller decides how to report them.
+    Files with more than one hard link carry their (st_dev, st_ino); on platforms
+    where DirEntry.stat() has no link count (Windows) that field is always None.
+    """
+    def _visit(directory: str) -> tuple[DirListing, list[str]]:
+        files: list[tuple[str, int, float, Optional[tuple[int, int]]]] = []
+        errors: list[tuple[str, OSError]] = []
+        subdirs: list[str] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            if extensions is not None and os.path.splitext(entry.name)[1].lower() not in extensions:
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                            if st.st_size >= min_size and (max_size is None or st.st_size <= max_size):
+                                link = (st.st_dev, st.st_ino) if st.st_nlink > 1 else None
+                                files.append((entry.name, st.st_size, st.st_mtime, link))
+                    except OSError as exc:
+                        errors.append((entry.path, exc))
+        except OSError as exc:
+            errors.append((directory, exc))
+        return DirListing(directory, files, errors), subdirs
+
+    yield from parallel_walk(root_path, _visit, workers=workers, recursive=recursive, cancelled=cancelled)
+
+
 def safe_fallback_walk(root_path: str) -> Iterable[tuple[str, list[str], list[str]]]:
     """Safe fallback walk that mirrors os.walk output.
 
@@ -88,29 +143,83 @@ def safe_fallback_walk(root_path: str) -> Iterable[tuple[str, list[str], list[st
         return
 
 
+#endregion
+#region - Parallel walker
+
+
+T = TypeVar("T")
+
+
+def parallel_walk(
+    root_path: str,
+    visit: Callable[[str], tuple[T, list[str]]],
+    workers: int = DEFAULT_WALK_WORKERS,
+    recursive: bool = True,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> Iterator[T]:
+    """Walk a tree iteratively, listing several directories at once.
+
+    visit(directory) runs on a worker thread and returns (result, subdirectories);
+    results are yielded on the caller's thread in completion order. There is no
+    recursion, so tree depth is unbounded, and only a small window of directories is
+    in flight, so a slow (network) directory doesn't stall the rest. workers <= 1
+    walks on the caller's thread.
+    """
+    if workers <= 1:
+        stack = [root_path]
+        while stack and not (cancelled and cancelled()):
+            result, subdirs = visit(stack.pop())
+            if recursive:
+                stack.extend(reversed(subdirs))
+            yield result
+        return
+    pending = deque([root_path])
+    in_flight = set()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="funnel-walk")
+    try:
+        while pending or in_flight:
+            if cancelled and cancelled():
+                break
+            while pending and len(in_flight) < workers * 2:
+                in_flight.add(pool.submit(visit, pending.popleft()))
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                result, subdirs = future.result()
+                if recursive:
+                    pending.extend(subdirs)
+                yield result
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 #endregion
 #region - Fallback backend (scandir streaming)
 
 
+def _list_counts(directory: str) -> tuple[tuple[int, int], list[str]]:
+    file_count = 0
+    subdirs: list[str] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        file_count += 1
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return (len(subdirs), file_count), subdirs
+
+
 def _get_counts_via_scandir(root_path: str) -> tuple[int, int]:
     folder_count = 0
     file_count = 0
-    stack = [root_path]
-    while stack:
-        current = stack.pop()
-        try:
-            with os.scandir(current) as it:
-                for entry in it:
-                    try:
-                        if entry.is_dir(follow_symlinks=False):
-                            folder_count += 1
-                            stack.append(entry.path)
-                        elif entry.is_file(follow_symlinks=False):
-                            file_count += 1
-                    except OSError:
-                        continue
-        except OSError:
-            continue
+    for dirs, files in parallel_walk(root_path, _list_counts):
+        folder_count += dirs
+        file_count += files
     return int(folder_count), int(file_count)
 
 
@@ -128,29 +237,33 @@ def _enumerate_paths_via_scandir(
 
         _enumerate_paths_via_scandir(root_path, include_dirs, batch_size, _cb)
         return results
-    batch: list[str] = []
-    stack = [root_path]
-    while stack:
-        current = stack.pop()
+
+    def _visit(directory: str) -> tuple[list[str], list[str]]:
+        paths: list[str] = []
+        subdirs: list[str] = []
         try:
-            with os.scandir(current) as it:
+            with os.scandir(directory) as it:
                 for entry in it:
                     try:
-                        is_dir = entry.is_dir(follow_symlinks=False)
-                        if is_dir:
-                            stack.append(entry.path)
-                            if include_dirs:
-                                batch.append(entry.path)
-                        else:
-                            if not include_dirs and entry.is_file(follow_symlinks=False):
-                                batch.append(entry.path)
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif not include_dirs and entry.is_file(follow_symlinks=False):
+                            paths.append(entry.path)
                     except OSError:
                         continue
-                    if len(batch) >= batch_size:
-                        batch_callback(batch)
-                        batch = []
         except OSError:
-            continue
+            pass
+        return (subdirs if include_dirs else paths), subdirs
+
+    batch: list[str] = []
+    # Callbacks run on this thread, between directory listings
+    for paths in parallel_walk(root_path, _visit):
+        batch.extend(paths)
+        if len(batch) >= batch_size:
+            full = len(batch) - len(batch) % batch_size
+            for start in range(0, full, batch_size):
+                batch_callback(batch[start:start + batch_size])
+            batch = batch[full:]
     if batch:
         batch_callback(batch)
     return None
@@ -3,17 +3,17 @@
 
 # Standard
 import os
-import re
 import shutil
 import threading
 
 # Third-party
 from watchdog.observers import Observer
-import nenotk as ntk
 
 # Custom
 from .event_handler import FunnelFolderHandler, SourceFolderHandler
+from .content_index import ContentIndex
 from . import fast_discovery
+from . import metrics
 
 # Type checking
 from typing import TYPE_CHECKING
@@ -30,7 +30,7 @@ def start_folder_watcher(app: 'Main', auto_start=False):
     if not app.check_working_dir_exists():
         return
     if not auto_start:
-        confirm = ntk.askokcancel("Begin Process?", "This will create a copy of the selected folder and all sub-folders (excluding files), and begin the Folder-Funnel process.\n\nContinue?")
+        confirm = app.ask_ok_cancel("Begin Process?", "This will create a copy of the selected folder and all sub-folders (excluding files), and begin the Folder-Funnel process.\n\nContinue?")
         if not confirm:
             return
     # Show activity during initialization (non-blocking)
@@ -42,7 +42,7 @@ def start_folder_watcher(app: 'Main', auto_start=False):
 
     def _ui(fn, *args, **kwargs):
         try:
-            app.root.after(0, lambda: fn(*args, **kwargs))
+            app.run_on_engine(fn, *args, **kwargs)
         except Exception:
             return
 
@@ -55,9 +55,8 @@ def start_folder_watcher(app: 'Main', auto_start=False):
     def _compute_counts(source_path: str) -> tuple[int, int]:
         # Prefer fast discovery when enabled and available.
         try:
-            if getattr(app, "fast_discovery_enabled_var", None) is not None and app.fast_discovery_enabled_var.get():
-                if hasattr(app, "fast_discovery_available") and app.fast_discovery_available(path=source_path):
-                    return fast_discovery.get_counts_via_mft(source_path)
+            if app.funnel_config.fast_discovery_enabled and app.fast_discovery_available(path=source_path):
+                return fast_discovery.get_counts_via_mft(source_path)
         except Exception:
             pass
         folder_count = 0
@@ -68,8 +67,7 @@ def start_folder_watcher(app: 'Main', auto_start=False):
             file_count += len(files)
             i += 1
             if i % 100 == 0:
-                _ui(app.foldercount_var.set, f"Folders: {ntk.number_commas(folder_count)}")
-                _ui(app.filecount_var.set, f"Files: {ntk.number_commas(file_count)}")
+                _ui(app.set_counts, folder_count, file_count)
         return folder_count, file_count
 
     def _scan_existing_files(funnel_dir: str) -> list[str]:
@@ -82,7 +80,7 @@ def start_folder_watcher(app: 'Main', auto_start=False):
                 file_path = os.path.join(dirpath, filename)
                 if not _should_process_firefox_temp_files(app, file_path):
                     continue
-                if app.ignore_temp_files_var.get() and _is_temp_file(app, file_path):
+                if app.funnel_config.ignore_temp_files and _is_temp_file(app, file_path):
                     continue
                 existing_files.append(os.path.normpath(file_path))
         return existing_files
@@ -90,9 +88,9 @@ def start_folder_watcher(app: 'Main', auto_start=False):
     def _prompt_existing_files(existing_files: list[str]) -> None:
         if not existing_files:
             return
-        file_count_str = ntk.number_commas(len(existing_files))
+        file_count_str = f"{len(existing_files):,}"
         message = (f"Found {file_count_str} pre-existing file{'s' if len(existing_files) != 1 else ''} in the funnel folder.\n\n" f"Would you like to add {'them' if len(existing_files) != 1 else 'it'} to the move queue for processing?")
-        confirm = ntk.askyesno("Pre-existing Files Found", message)
+        confirm = app.ask_yes_no("Pre-existing Files Found", message)
         if confirm:
             for file_path in existing_files:
                 if file_path not in app.move_queue:
@@ -114,25 +112,24 @@ def start_folder_watcher(app: 'Main', auto_start=False):
         _start_folder_watcher(app)
         app.set_status("running")
         app.move_count = 0
-        app.movecount_var.set("Moved: 0")
+        app.update_move_count()
         app.duplicate_count = 0
         app.update_duplicate_count()
 
     def _worker() -> None:
         try:
-            source_path = app.source_dir_var.get()
+            source_path = app.funnel_config.source_dir
             if not source_path or not os.path.exists(source_path):
                 return
             folder_count, file_count = _compute_counts(source_path)
             if _is_cancelled():
                 return
-            _ui(app.foldercount_var.set, f"Folders: {ntk.number_commas(folder_count)}")
-            _ui(app.filecount_var.set, f"Files: {ntk.number_commas(file_count)}")
             try:
                 app.folder_count = int(folder_count)
                 app.file_count = int(file_count)
             except Exception:
                 pass
+            _ui(app.set_counts, folder_count, file_count)
             _ui(app.set_status, "busy", "Syncing folders...")
             # Synchronous sync on this worker thread (UI updates marshaled internally)
             sync_funnel_folders(app, silent="initial")
@@ -146,13 +143,11 @@ def start_folder_watcher(app: 'Main', auto_start=False):
     threading.Thread(target=_worker, daemon=True).start()
 
 
-def _tick_progress(app: 'Main', state: dict):
-    """Advance and render the manual progress indicator."""
+def _tick_progress(state: dict):
+    """Advance the manual progress indicator; the UI samples it once per frame."""
     state["value"] += state.get("step", 0)
     if state["value"] > state.get("max", 100):
         state["value"] = 0
-    app.queue_progressbar['value'] = state["value"]
-    app.root.update_idletasks()
 
 
 def _start_folder_watcher(app: 'Main'):
@@ -167,16 +162,48 @@ def _start_folder_watcher(app: 'Main'):
     # Set up source folder observer
     app.source_observer = Observer()
     source_handler = SourceFolderHandler(app)
-    app.source_observer.schedule(source_handler, path=app.source_dir_var.get(), recursive=True)
+    app.source_observer.schedule(source_handler, path=app.funnel_config.source_dir, recursive=True)
     app.source_observer.start()
+    sync_content_index(app)
     app.log("Ready!\n", mode="system", verbose=1)
 
 
-def stop_folder_watcher(app: 'Main'):
+def sync_content_index(app: 'Main'):
+    """Start or stop the content index to match dupe_check_mode while the watcher runs."""
+    if not app.source_observer:
+        return
+    running = getattr(app, "content_index", None) is not None
+    if app.funnel_config.dupe_check_mode == "Global" and not running:
+        app.log("Global check mode: building the content index; using Similar checks until it is ready", mode="info", verbose=2)
+        _start_content_index(app)
+    elif app.funnel_config.dupe_check_mode != "Global" and running:
+        app.content_index.cancel()
+        app.content_index = None
+        app.log("Content index stopped", mode="info", verbose=3)
+
+
+def _start_content_index(app: 'Main'):
+    """Build the whole-tree content index in the background; the source observer keeps it current."""
+    from .move_queue import _partial_hash_settings  # Lazy import
+    partial_hash_size, partial_mode = _partial_hash_settings(app)
+    content_index = ContentIndex(app.funnel_config.source_dir, partial_size=partial_hash_size, partial_mode=partial_mode)
+    app.content_index = content_index
+
+    def _build():
+        try:
+            content_index.build()
+            if content_index.is_hashed:
+                app.log(f"Content index ready: {content_index.stats()['files']:,} files", mode="info", verbose=2)
+        except Exception as exc:
+            app.log(f"Content index build failed: {exc}", mode="warning", verbose=1)
+    threading.Thread(target=_build, name="funnel-content-index", daemon=True).start()
+
+
+def stop_folder_watcher(app: 'Main', remove_funnel: bool = True):
     """Stop the folder watching process with confirmation"""
     if not (app.funnel_observer or app.source_observer):
         return True
-    confirm = ntk.askokcancel("Stop Process?", "This will stop the Folder-Funnel process and remove the funnel folder.\n\nContinue?")
+    confirm = app.ask_ok_cancel("Stop Process?", "This will stop the Folder-Funnel process and remove the funnel folder.\n\nContinue?")
     if not confirm:
         return False
     # Cancel any in-progress initialization.
@@ -186,12 +213,12 @@ def stop_folder_watcher(app: 'Main'):
         pass
     _stop_folder_watcher(app)
     app.log("Stopping Folder-Funnel process...", mode="system", verbose=1)
-    if app.funnel_dir and os.path.exists(app.funnel_dir):
+    if remove_funnel and app.funnel_dir and os.path.exists(app.funnel_dir):
         try:
             shutil.rmtree(app.funnel_dir)
+            app.log(f"Removed funnel folder: {app.funnel_dir}", mode="system", verbose=1)
         except Exception as exc:
             app.log(f"Failed to remove funnel folder {app.funnel_dir}: {exc}", mode="warning", verbose=2)
-    app.log(f"Removed funnel folder: {app.funnel_dir}", mode="system", verbose=1)
     app.reset_status_row()
     app.clear_history()
     app.toggle_widgets_state(state="idle")
@@ -200,6 +227,9 @@ def stop_folder_watcher(app: 'Main'):
 
 def _stop_folder_watcher(app: 'Main'):
     """Stop all file system observers"""
+    if getattr(app, "content_index", None) is not None:
+        app.content_index.cancel()
+        app.content_index = None
     if app.funnel_observer:
         app.funnel_observer.stop()
         app.funnel_observer.join(timeout=2)
@@ -214,9 +244,10 @@ def _stop_folder_watcher(app: 'Main'):
         app.source_observer = None
 
 
+@metrics.timed("sync_funnel_folders")
 def sync_funnel_folders(app: 'Main', silent=False):
     """Create or update the watch folder structure to match the source folder"""
-    source_path = app.source_dir_var.get()
+    source_path = app.funnel_config.source_dir
     if not app.check_working_dir_exists():
         return
     source_folder_name = os.path.basename(source_path)
@@ -225,24 +256,16 @@ def sync_funnel_folders(app: 'Main', silent=False):
     app.funnel_dir = os.path.normpath(os.path.join(parent_dir, app.funnel_dir_name))
     counter_created = 0
     counter_removed = 0
-    # Set progress bar to determinate mode for manual animation
-    app.queue_progressbar.configure(mode="determinate")
-    app.queue_progressbar['value'] = 0
-    app.root.update_idletasks()
-    progress_state = {"value": 0, "step": 10, "max": 100}
+    # Manual progress animation: this thread only bumps the counter, the UI samples it
+    progress_state = {"value": 0, "step": 10, "max": 100, "done": False}
+    app.animate_progress("sync", lambda: None if progress_state["done"] else progress_state["value"], on_done=lambda: app.set_queue_progress(0))
 
     def _ui(fn, *args, **kwargs):
         try:
-            app.root.after(0, lambda: fn(*args, **kwargs))
+            app.run_on_engine(fn, *args, **kwargs)
         except Exception:
             return
 
-    def _ui_tick() -> None:
-        try:
-            _tick_progress(app, progress_state)
-        except Exception:
-            pass
-
     try:
         os.makedirs(app.funnel_dir, exist_ok=True)
         if not silent:
@@ -264,12 +287,11 @@ def sync_funnel_folders(app: 'Main', silent=False):
                     continue
                 item_counter += 1
                 if item_counter % 50 == 0:
-                    _ui(_ui_tick)
+                    _tick_progress(progress_state)
         use_fast = False
         try:
-            if getattr(app, "fast_discovery_enabled_var", None) is not None and app.fast_discovery_enabled_var.get():
-                if hasattr(app, "fast_discovery_available") and app.fast_discovery_available(path=source_path):
-                    use_fast = True
+            if app.funnel_config.fast_discovery_enabled and app.fast_discovery_available(path=source_path):
+                use_fast = True
         except Exception:
             use_fast = False
         if use_fast:
@@ -298,22 +320,16 @@ def sync_funnel_folders(app: 'Main', silent=False):
                     pass
             item_counter += 1
             if item_counter % 200 == 0:
-                _ui(_ui_tick)
+                _tick_progress(progress_state)
         if silent in [False, "semi"]:
-            _ui(app.log, f"Sync complete: Created {ntk.number_commas(counter_created)}, removed {ntk.number_commas(counter_removed)} directories", mode="system", verbose=2)
+            _ui(app.log, f"Sync complete: Created {counter_created:,}, removed {counter_removed:,} directories", mode="system", verbose=2)
         elif silent == "initial":
-            try:
-                folder_count = re.split(" ", app.foldercount_var.get())
-                file_count = re.split(" ", app.filecount_var.get())
-                _ui(app.log, f"Watching: {ntk.number_commas(folder_count[1])} folders and {ntk.number_commas(file_count[1])} files", mode="system", verbose=2)
-            except Exception:
-                pass
+            _ui(app.log, f"Watching: {int(app.folder_count):,} folders and {int(app.file_count):,} files", mode="system", verbose=2)
     except Exception as e:
-        _ui(ntk.showinfo, "Error: sync_funnel_folders()", f"{str(e)}")
+        _ui(app.show_error, "Error: sync_funnel_folders()", f"{str(e)}")
         _ui(app.log, f"Error syncing funnel folders: {str(e)}", mode="error", verbose=1)
     finally:
-        _ui(app.queue_progressbar.__setitem__, 'value', 0)
-        _ui(app.queue_progressbar.configure, mode="determinate")
+        progress_state["done"] = True
 
 
 #endregion
@@ -322,7 +338,7 @@ def sync_funnel_folders(app: 'Main', silent=False):
 
 def _rel_to_funnel(app: 'Main', abs_path: str) -> str:
     """Return the path inside the funnel that mirrors a source abs path."""
-    rel_path = os.path.relpath(abs_path, app.source_dir_var.get())
+    rel_path = os.path.relpath(abs_path, app.funnel_config.source_dir)
     return os.path.normpath(os.path.join(app.funnel_dir, rel_path))
 
 
@@ -0,0 +1,590 @@
+"""
+Headless funnel core.
+
+`FunnelEngine` owns everything the watcher/queue/duplicate modules need (config,
+queue state, counters, scheduling, hooks) without importing Tkinter. The GUI
+`Main` subclasses it and overrides the UI hooks; services can instantiate it
+directly:
+
+    engine = FunnelEngine(FunnelConfig(source_dir="/srv/library"))
+    engine.on_moved = lambda dest, rel, action: print(action, rel)
+    engine.start()
+    ...
+    engine.stop()
+"""
+
+
+#region - Imports
+
+
+# Standard
+import os
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, fields
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Custom
+from . import move_queue
+from . import folder_watcher
+from . import fast_discovery
+from .async_scheduler import AsyncScheduler
+
+
+#endregion
+#region - Config
+
+
+@dataclass
+class FunnelConfig:
+    """User settings read by the core modules (mirrors the GUI tk variables)."""
+    source_dir: str = ""
+    dupe_handle_mode: str = "Move"  # "Delete", "Move"
+    dupe_filter_mode: str = "Flexible"  # "Flexible", "Strict"
+    dupe_check_mode: str = "Similar"  # "Similar", "Single", "Global"
+    dupe_max_files: int = 75
+    dupe_use_partial_hash: bool = True
+    dupe_partial_hash_size: int = 4096  # Bytes per partial read (head/tail size, or block size when sampled)
+    dupe_partial_hash_mode: str = "head_tail"  # "head_tail", "sampled"
+    dupe_partial_hash_samples: int = 8  # Blocks read in "sampled" mode
+    dupe_hash_on_ingest: bool = False  # Hash every moved file so later checks against it cost no reads
+    delete_to_trash: bool = True  # Deleted duplicates go to the trash (undoable) instead of being removed
+    move_queue_length: int = 1000  # Queue timer (ms)
+    log_verbosity: int = 1  # 1=Essential, 2=Extended, 3=Detailed, 4=Debug
+    ignore_firefox_temp_files: bool = True
+    ignore_temp_files: bool = True
+    auto_extract_zip: bool = False
+    auto_delete_zip: bool = False
+    overwrite_on_conflict: bool = False
+    fast_discovery_enabled: bool = True
+
+    @classmethod
+    def field_names(cls) -> List[str]:
+        return [f.name for f in fields(cls)]
+
+
+#endregion
+#region - SerialStrand
+
+
+class SerialStrand:
+    """Run callbacks one at a time, in order, on a shared executor.
+
+    Lets several engines share one worker pool while each engine still sees a
+    single logical "main thread" for its queue state.
+    """
+    def __init__(self, executor: Executor, on_error: Optional[Callable[[BaseException], None]] = None):
+        self.executor = executor
+        self.on_error = on_error
+        self._pending: Deque[Callable] = deque()
+        self._lock = threading.Lock()
+        self._active = False
+        self._local = threading.local()
+
+
+    def submit(self, callback: Callable) -> None:
+        with self._lock:
+            self._pending.append(callback)
+            if self._active:
+                return
+            self._active = True
+        try:
+            self.executor.submit(self._drain)
+        except RuntimeError:
+            # Executor shut down; nothing left to run on
+            with self._lock:
+                self._pending.clear()
+                self._active = False
+
+
+    def is_current(self) -> bool:
+        return getattr(self._local, "active", False)
+
+
+    def _drain(self) -> None:
+        self._local.active = True
+        try:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        self._active = False
+                        return
+                    callback = self._pending.popleft()
+                try:
+                    callback()
+                except Exception as exc:
+                    if self.on_error:
+                        try:
+                            self.on_error(exc)
+                        except Exception:
+                            pass
+        finally:
+            self._local.active = False
+
+
+#endregion
+#region - Engine
+
+
+_LOG_LEVELS = {"error": logging.ERROR, "warning": logging.WARNING}
+
+
+class FunnelEngine:
+    """One funnel (watch folder -> source folder) without any UI.
+
+    Core modules (`move_queue`, `folder_watcher`, `event_handler`, `duplicate_handler`)
+    only touch the attributes and hook methods defined here. Override the hook
+    methods, or assign the `on_*` callbacks, to observe progress.
+    """
+    def __init__(self, config: Optional[FunnelConfig] = None, name: str = "", scheduler: Optional[AsyncScheduler] = None, executor: Optional[Executor] = None):
+        self.funnel_config = config or FunnelConfig()
+        self.name = name or os.path.basename(os.path.normpath(self.funnel_config.source_dir or "")) or "funnel"
+        self.logger = logging.getLogger(f"folder_funnel.{self.name}")
+        self._owns_scheduler = scheduler is None
+        self._owns_executor = executor is None
+        # Timers live on the asyncio loop; the work they trigger runs serially on the executor ("engine thread")
+        self.scheduler = scheduler or AsyncScheduler(name=f"funnel-{self.name}-timers", on_error=self._on_scheduler_error)
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"funnel-{self.name}")
+        self._strand = SerialStrand(self.executor, on_error=self._on_scheduler_error)
+        self._ready = threading.Event()
+
+        # Optional observer callbacks
+        self.on_log: Optional[Callable[[str, str, int], None]] = None  # (message, mode, verbose)
+        self.on_moved: Optional[Callable[[str, str, str], None]] = None  # (dest_path, rel_path, action)
+        self.on_duplicate: Optional[Callable[[str, str, str, str], None]] = None  # (rel_path, source_path, duplicate_path, action)
+        self.on_queue_changed: Optional[Callable[[int], None]] = None  # (queue_length)
+        self.on_status: Optional[Callable[[str, Optional[str]], None]] = None  # (state, message)
+
+        # Funnel and Duplicate Folders
+        self.funnel_dir = ""  # The funnel folder that will be watched
+        self.funnel_dir_name = ""  # The name of the funnel folder
+        self.funnel_name_prefix = "#FUNNEL#_"  # Prefix for the funnel folder name
+        self.duplicate_storage_path = ""  # The folder that will store moved duplicate files
+        self.duplicate_name_prefix = "#DUPLICATE#_"  # Prefix for duplicate storage folder name
+
+        # Status
+        self.status_state = "idle"
+
+        # Counts
+        self.move_count = 0  # Files moved
+        self.duplicate_count = 0  # Duplicate files detected
+        self.grand_move_count = 0  # Lifetime total of files moved
+        self.grand_duplicate_count = 0  # Lifetime total of duplicate files detected
+        self.folder_count = 0  # Live folder count (kept in sync incrementally)
+        self.file_count = 0  # Live file count (kept in sync incrementally)
+
+        # Legacy duplicate bookkeeping (used by move_queue)
+        self.duplicate_history_items = {}  # {filename: {"source": source_path, "duplicate": duplicate_path, "order": int}}
+        self.history_order_counter = 0
+
+        # Queue related variables
+        self.move_queue: List[str] = []  # List of files waiting to be moved
+        self.queue_count = 0  # Number of files in the move queue
+        self.queue_timer_id = None  # Store timer ID for cancellation
+        self.queue_start_time = None  # Store when the queue timer started
+
+        # Observers for file watching
+        self.funnel_observer = None
+        self.source_observer = None
+        self.content_index = None  # Whole-tree ContentIndex, only in "Global" check mode
+
+        # Temporary filetypes
+        self.temp_filetypes = [".tmp", ".temp", ".part", ".crdownload", ".partial", ".bak"]
+
+
+#endregion
+#region - Scheduling
+
+
+    def schedule(self, delay_ms: int, callback: Callable) -> Any:
+        """Run callback on the engine thread after delay_ms."""
+        return self.scheduler.call_later(delay_ms, self._strand.submit, callback)
+
+
+    def cancel_scheduled(self, handle: Any) -> None:
+        self.scheduler.cancel(handle)
+
+
+    def debounce(self, name: str, delay_ms: int, callback: Callable) -> Any:
+        """(Re)start the named timer; only the last callback within the window runs."""
+        return self.scheduler.debounce((id(self), name), delay_ms, self._strand.submit, callback)
+
+
+    def cancel_debounce(self, name: str) -> None:
+        self.scheduler.cancel_debounce((id(self), name))
+
+
+    def animate_progress(self, key: str, sample: Callable[[], Optional[float]], on_done: Optional[Callable[[], None]] = None) -> None:
+        """Drive the progress bar from `sample` (None = finished). Headless engines have no UI: no-op."""
+        return None
+
+
+    def stop_progress(self, key: str) -> None:
+        return None
+
+
+    def run_on_engine(self, fn: Callable, *args, **kwargs) -> None:
+        """Marshal a call onto the engine thread (serial per engine)."""
+        self._strand.submit(lambda: fn(*args, **kwargs))
+
+
+    def is_engine_thread(self) -> bool:
+        return self._strand.is_current()
+
+
+    def _call_on_engine(self, fn: Callable, *args) -> None:
+        """Run now when already on the engine thread, else queue it there."""
+        if self.is_engine_thread():
+            fn(*args)
+        else:
+            self.run_on_engine(fn, *args)
+
+
+    async def run_serial(self, fn: Callable, *args) -> Any:
+        """Await fn(*args) on the engine thread (for coroutines on the scheduler loop)."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def _call():
+            try:
+                result = fn(*args)
+            except BaseException as exc:
+                loop.call_soon_threadsafe(lambda: future.done() or future.set_exception(exc))
+            else:
+                loop.call_soon_threadsafe(lambda: future.done() or future.set_result(result))
+        self._strand.submit(_call)
+        return await future
+
+
+    def run_on_engine_and_wait(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Run fn on the engine thread and block until it returns."""
+        if self.is_engine_thread():
+            return fn(*args)
+        done = threading.Event()
+        result: Dict[str, Any] = {}
+
+        def _call():
+            try:
+                result["value"] = fn(*args)
+            except BaseException as exc:
+                result["error"] = exc
+            finally:
+                done.set()
+        self.run_on_engine(_call)
+        done.wait(timeout)
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
+
+
+    def _on_scheduler_error(self, exc: BaseException) -> None:
+        self.log(f"Unhandled error in scheduled callback: {exc}", mode="error", verbose=1)
+
+
+#endregion
+#region - Hooks
+
+
+    def log(self, message, mode="simple", verbose=1):
+        if verbose > int(self.funnel_config.log_verbosity or 1):
+            return
+        self.logger.log(_LOG_LEVELS.get(mode, logging.INFO), str(message).rstrip("\n"))
+        if self.on_log:
+            self.on_log(str(message), mode, verbose)
+
+
+    def set_status(self, state: str, message: str | None = None):
+        self.status_state = (state or "idle").lower()
+        if self.status_state == "running":
+            self._ready.set()
+        if self.on_status:
+            self.on_status(self.status_state, message)
+
+
+    def show_error(self, title: str, message: str) -> None:
+        self.log(f"{title}: {message}", mode="error", verbose=1)
+
+
+    def ask_ok_cancel(self, title: str, message: str) -> bool:
+        """Headless engines never block on prompts; the default answer proceeds."""
+        return True
+
+
+    def ask_yes_no(self, title: str, message: str) -> bool:
+        return True
+
+
+    def ask_yes_no_cancel(self, title: str, prompt: str, detail: str = "") -> Optional[bool]:
+        """Return True/False/None (cancel). Headless default keeps data (False)."""
+        return False
+
+
+    def notify(self, message: str, title: str = "Folder-Funnel") -> None:
+        self.log(message, mode="info", verbose=2)
+
+
+    def toggle_widgets_state(self, state="idle"):
+        pass
+
+
+    def reset_status_row(self):
+        self.set_status("idle")
+        self.set_counts(0, 0)
+        self.move_count = 0
+        self.duplicate_count = 0
+
+
+    def clear_history(self):
+        self.duplicate_history_items.clear()
+
+
+    def set_queue_progress(self, value: float) -> None:
+        pass
+
+
+    def update_queue_count(self):
+        self.queue_count = len(self.move_queue)
+        if self.on_queue_changed:
+            self.on_queue_changed(self.queue_count)
+
+
+    def update_duplicate_count(self):
+        pass
+
+
+    def update_move_count(self):
+        pass
+
+
+    def batch_complete(self) -> None:
+        """Called on the engine thread after each pass over the move queue."""
+        pass
+
+
+    def set_counts(self, folder_count: int, file_count: int) -> None:
+        self.folder_count = int(folder_count)
+        self.file_count = int(file_count)
+
+
+    def add_history_moved(self, dest_path: str, rel_path: str, action: str = "Moved"):
+        if self.on_moved:
+            self.on_moved(dest_path, rel_path, action)
+
+
+    def add_history_duplicate(self, rel_path: str, source_path: str, duplicate_path: str, action: str):
+        if self.on_duplicate:
+            self.on_duplicate(rel_path, source_path, duplicate_path, action)
+
+
+#endregion
+#region - Folder Watcher Logic
+
+
+    def start_folder_watcher(self, auto_start=False):
+        folder_watcher.start_folder_watcher(self, auto_start)
+
+    def stop_folder_watcher(self, remove_funnel: bool = True):
+        return folder_watcher.stop_folder_watcher(self, remove_funnel=remove_funnel)
+
+    def sync_funnel_folders(self, silent=False):
+        self._call_on_engine(folder_watcher.sync_funnel_folders, self, silent)
+
+    def sync_content_index(self):
+        self._call_on_engine(folder_watcher.sync_content_index, self)
+
+
+#endregion
+#region - Move/Queue Logic
+
+
+    # Queue state has a single writer: the engine thread. Calls from the UI are forwarded there.
+    def queue_move_file(self, source_path):
+        self._call_on_engine(move_queue.queue_move_file, self, source_path)
+
+    def process_move_queue(self):
+        self._call_on_engine(move_queue.process_move_queue, self)
+
+    def handle_rename_event(self, old_path, new_path):
+        self._call_on_engine(move_queue.handle_rename_event, self, old_path, new_path)
+
+    def process_pending_moves(self):
+        """Blocks until the pass completes (used before shutdown).
+
+        Not for the Tk thread: the pass calls UI hooks, which need that thread running.
+        """
+        self.run_on_engine_and_wait(move_queue.process_pending_moves, self)
+
+
+#endregion
+#region - File Logic
+
+
+    def check_working_dir_exists(self):
+        """Check if the source folder exists."""
+        path = self.funnel_config.source_dir
+        if not path:
+            self.show_error("Error", "No folder selected")
+            return False
+        elif not os.path.exists(path):
+            self.show_error("Error", "Selected folder does not exist")
+            return False
+        return path
+
+
+    def count_folders_and_files(self):
+        """Count the number of folders and files in the source folder.
+
+        Thread safety:
+            - This starts a background worker.
+            - Count updates are marshaled via run_on_engine().
+
+        Notes:
+            Folder-Funnel relies on counts for informational UI; the live observers
+            maintain deltas via adjust_counts().
+        """
+        if getattr(self, '_counting_in_progress', False):
+            return
+        source_path = (self.funnel_config.source_dir or "").strip()
+        if not source_path or not os.path.exists(source_path):
+            return
+        self._counting_in_progress = True
+
+        def _done() -> None:
+            self._counting_in_progress = False
+
+        def _worker() -> None:
+            try:
+                if self.funnel_config.fast_discovery_enabled and self.fast_discovery_available(path=source_path):
+                    folder_count, file_count = fast_discovery.get_counts_via_mft(source_path)
+                    self.run_on_engine(self.set_counts, folder_count, file_count)
+                else:
+                    # Safe, portable scan with periodic updates.
+                    folder_count = 0
+                    file_count = 0
+                    i = 0
+                    for _root_dir, dirs, files in os.walk(source_path):
+                        folder_count += len(dirs)
+                        file_count += len(files)
+                        i += 1
+                        if i % 50 == 0:
+                            self.run_on_engine(self.set_counts, folder_count, file_count)
+                    self.run_on_engine(self.set_counts, folder_count, file_count)
+            finally:
+                self.run_on_engine(_done)
+
+        threading.Thread(target=_worker, daemon=True).start()
+
+
+    def fast_discovery_available(self, path: str | None = None) -> bool:
+        """Return True when a fast discovery backend is available for path."""
+        try:
+            target = (path or self.funnel_config.source_dir or "").strip()
+            if not target:
+                return False
+            mode = fast_discovery.detect_volume_support(target)
+            return mode != "unsupported"
+        except Exception:
+            return False
+
+
+    def enumerate_with_fast_discovery(self, root_path: str, on_batch, include_dirs: bool = True, batch_size: int = 1000):
+        """Enumerate paths on a worker thread and deliver batches via run_on_engine()."""
+        def _worker() -> None:
+            try:
+                fast_discovery.enumerate_paths_via_mft(root_path, include_dirs=include_dirs, batch_size=batch_size, batch_callback=lambda batch: self.run_on_engine(on_batch, batch))
+            except Exception:
+                # Fail safe: nothing to enumerate.
+                return
+        threading.Thread(target=_worker, daemon=True).start()
+
+
+    def adjust_counts(self, folder_delta=0, file_delta=0):
+        """Incrementally adjust cached counts."""
+        if not self.is_engine_thread():
+            # Marshal to the engine thread so counts have a single writer
+            self.run_on_engine(self.adjust_counts, folder_delta, file_delta)
+            return
+        folder_count = max(0, self.folder_count + folder_delta) if folder_delta else self.folder_count
+        file_count = max(0, self.file_count + file_delta) if file_delta else self.file_count
+        self.set_counts(folder_count, file_count)
+
+
+#endregion
+#region - Lifecycle
+
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.funnel_observer or self.source_observer)
+
+
+    def start(self, wait: bool = True, timeout: Optional[float] = None) -> bool:
+        """Create the funnel folder, queue pre-existing files and start watching."""
+        if self.is_running:
+            return True
+        if not self.check_working_dir_exists():
+            return False
+        self.scheduler.start()
+        self._ready.clear()
+        self.start_folder_watcher(auto_start=True)
+        if wait:
+            return self.wait_until_ready(timeout)
+        return True
+
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until startup finished (observers running) or timeout."""
+        return self._ready.wait(timeout) and self.is_running
+
+
+    def stop(self, process_pending: bool = True, remove_funnel: bool = True, timeout: Optional[float] = 30.0) -> None:
+        """Stop watching; optionally flush the queue first. Safe to call from any thread.
+
+        The funnel folder is kept if files are still queued when the flush times out.
+        """
+        remaining = 0
+        if process_pending:
+            remaining = self.flush_queue(timeout)
+        else:
+            self.run_on_engine_and_wait(move_queue.stop_queue, self)
+        if remaining and remove_funnel:
+            self.log(f"{remaining:,} file{'s' if remaining != 1 else ''} still queued; keeping funnel folder: {self.funnel_dir}", mode="warning", verbose=1)
+            remove_funnel = False
+        self.run_on_engine_and_wait(self.stop_folder_watcher, remove_funnel)
+        if self._owns_scheduler:
+            self.scheduler.stop()
+
+
+    def close(self) -> None:
+        """Release the timer thread and worker pool this engine created (not shared ones)."""
+        if self._owns_scheduler:
+            self.scheduler.stop(wait=False)
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+
+    def flush_queue(self, timeout: Optional[float] = 30.0) -> int:
+        """Run queue passes until it drains (files need two stable stats) or timeout; returns files left."""
+        return self.scheduler.submit(self._flush_queue_async(timeout)).result()
+
+
+    async def _flush_queue_async(self, timeout: Optional[float]) -> int:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout if timeout is not None else float("inf"))
+        while True:
+            remaining = await self.run_serial(self._flush_pass)
+            if not remaining or loop.time() >= deadline:
+                return remaining
+            await asyncio.sleep(0.5)
+
+
+    def _flush_pass(self) -> int:
+        if not self.move_queue or any(move_queue._is_due(self, path) for path in self.move_queue):
+            self.process_pending_moves()
+        return len(self.move_queue)
+
+
+#endregion
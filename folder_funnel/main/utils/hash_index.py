@@ -0,0 +1,182 @@
+"""
+Persistent, SQLite-backed record of file content hashes.
+
+The in-memory hash cache in `duplicate_handler` is bounded and dies with the
+process; this index keeps hashes across runs so files that were already hashed
+(e.g. when they were funneled in) never need to be read again. Rows are keyed
+by path + hash kind and validated against the file's current (mtime, size), so
+a stale row is simply a miss.
+
+Writes are buffered and flushed in batches; all methods are thread-safe.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+#endregion
+#region - HashIndex
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT NOT NULL,
+    partial_size INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (path, partial_size, mode)
+) WITHOUT ROWID
+"""
+
+# Content lookups (which files have this hash?) for the Global content index
+_CONTENT_INDEX = "CREATE INDEX IF NOT EXISTS hashes_content ON hashes (hash, size)"
+
+# Full row: (path, partial_size, mode, mtime, size, hash)
+_Row = Tuple[str, int, str, float, int, str]
+
+
+class HashIndex:
+    """Path-keyed hash store validated by (mtime, size)."""
+    def __init__(self, db_path: str, flush_every: int = 500):
+        self.db_path = db_path
+        self.flush_every = max(1, int(flush_every))
+        self._lock = threading.RLock()
+        self._pending: Dict[Tuple[str, int, str], Tuple[float, int, str]] = {}
+        folder = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(_CONTENT_INDEX)
+        self._conn.commit()
+
+
+    def lookup(self, path: str, mtime: float, size: int, partial_size: int, mode: str) -> Optional[str]:
+        """Return the stored hash if the file still has the recorded (mtime, size)."""
+        key = (path, int(partial_size), mode)
+        with self._lock:
+            row = self._pending.get(key)
+            if row is None:
+                cur = self._conn.execute("SELECT mtime, size, hash FROM hashes WHERE path=? AND partial_size=? AND mode=?", key)
+                row = cur.fetchone()
+        if row is None or row[0] != mtime or row[1] != size:
+            return None
+        return row[2]
+
+
+    def record(self, path: str, mtime: float, size: int, partial_size: int, mode: str, hash_value: str) -> None:
+        with self._lock:
+            self._pending[(path, int(partial_size), mode)] = (mtime, int(size), hash_value)
+            if len(self._pending) >= self.flush_every:
+                self._flush_locked()
+
+
+    def hashes_for(self, path: str) -> List[_Row]:
+        """All stored rows for path (any hash kind)."""
+        with self._lock:
+            self._flush_locked()
+            cur = self._conn.execute("SELECT path, partial_size, mode, mtime, size, hash FROM hashes WHERE path=?", (path,))
+            return cur.fetchall()
+
+
+    def find_content(self, size: int, hash_value: str, partial_size: int, mode: str) -> List[Tuple[str, float]]:
+        """(path, mtime) of every row with this content hash; rows may be stale, so callers re-stat."""
+        with self._lock:
+            self._flush_locked()
+            cur = self._conn.execute(
+                "SELECT path, mtime FROM hashes WHERE hash=? AND size=? AND partial_size=? AND mode=?",
+                (hash_value, int(size), int(partial_size), mode),
+            )
+            return cur.fetchall()
+
+
+    def iter_content(self, prefix: str, partial_size: int, mode: str, batch: int = 5000) -> Iterator[Tuple[int, str]]:
+        """(size, hash) of every row of one hash kind whose path starts with prefix, read in batches."""
+        end = prefix[:-1] + chr(ord(prefix[-1]) + 1) if prefix else "\U0010ffff"
+        last = None
+        while True:
+            with self._lock:
+                self._flush_locked()
+                cur = self._conn.execute(
+                    "SELECT path, size, hash FROM hashes WHERE path >= ? AND path < ? AND partial_size=? AND mode=? ORDER BY path LIMIT ?",
+                    (prefix if last is None else last + "\0", end, int(partial_size), mode, batch),
+                )
+                rows = cur.fetchall()
+            if not rows:
+                return
+            for _path, size, hash_value in rows:
+                yield size, hash_value
+            last = rows[-1][0]
+
+
+    def remove(self, paths: Iterable[str]) -> None:
+        paths = list(paths)
+        if not paths:
+            return
+        with self._lock:
+            self._flush_locked()
+            self._conn.executemany("DELETE FROM hashes WHERE path=?", [(p,) for p in paths])
+            self._conn.commit()
+
+
+    def rename(self, old_path: str, new_path: str) -> None:
+        """Carry rows from old_path to new_path (a rename keeps content, mtime and size)."""
+        with self._lock:
+            self._flush_locked()
+            self._conn.execute("DELETE FROM hashes WHERE path=?", (new_path,))
+            self._conn.execute("UPDATE hashes SET path=? WHERE path=?", (new_path, old_path))
+            self._conn.commit()
+
+
+    def rename_tree(self, old_dir: str, new_dir: str) -> None:
+        """Carry rows for every file under old_dir to the same relative path under new_dir."""
+        old_prefix = old_dir.rstrip("\\/") + os.sep
+        new_prefix = new_dir.rstrip("\\/") + os.sep
+        with self._lock:
+            self._flush_locked()
+            self._conn.execute(
+                "UPDATE OR REPLACE hashes SET path = ? || substr(path, ?) WHERE substr(path, 1, ?) = ?",
+                (new_prefix, len(old_prefix) + 1, len(old_prefix), old_prefix),
+            )
+            self._conn.commit()
+
+
+    def count(self) -> int:
+        with self._lock:
+            self._flush_locked()
+            return int(self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0])
+
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        rows = [(path, partial_size, mode, mtime, size, hash_value) for (path, partial_size, mode), (mtime, size, hash_value) in self._pending.items()]
+        self._pending.clear()
+        self._conn.executemany("INSERT OR REPLACE INTO hashes (path, partial_size, mode, mtime, size, hash) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._conn.commit()
+
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._flush_locked()
+            finally:
+                self._conn.close()
+
+
+#endregion
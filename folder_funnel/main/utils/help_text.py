@@ -16,6 +16,7 @@ Folder-Funnel was created to help speed up the process of saving files to a dire
 - Double- or right-click items in the **History** list to open or locate them quickly.
 - Clear logs or history anytime under the **Edit** menu.
 - Check the status bar at the bottom to see progress and queue details.
+- Open *'Help' > 'Show Metrics'* to see hashing, move, and scan throughput, latency percentiles, and cache hit rates.
 
 ## File Rules
 
@@ -41,8 +42,16 @@ Folder-Funnel was created to help speed up the process of saving files to a dire
 - **Duplicate Checking Mode**
     - **Similar**: Perform additional MD5 checksum checks against files with a similar filename.
     - **Single**: Perform an MD5 checksum check only on exact filename matches.
+    - **Global**: Check incoming files against every file in the source folder, whatever their name or location. An index of the source folder is built in the background when the process starts (a partial hash of each file, or a full hash with partial hashing off, done once and remembered across restarts), then kept up to date as files change. Until the index is ready, *Similar* is used. Memory use is a compact filter of a few bytes per file: most unique files are cleared after one small read, and exact matches are looked up in the hash index on disk.
 - **Duplicate Checking: Max Files**
     - The maximum number of similar files to check for duplicates.
+- **Partial Hash Mode**
+    - **Head + Tail**: Quick pre-check of the start and end of each file.
+    - **Sampled Blocks**: Quick pre-check of evenly spaced blocks across each file. Better for large media files that share headers and trailers.
+- **Hash Files on Ingest**
+    - Hash every moved file while it is still in the disk cache. Hashes are kept in a persistent index, so later duplicate checks against funneled files don't re-read them.
+- **Delete to Trash**
+    - Deleted duplicates (by the funnel, the scanner and the review window) go to the system trash instead of being removed. Scanner deletes can be put back with **Undo Last Action**. Trash this app adds is purged after 30 days, oldest first, or when it grows past 10 GB.
 
 ## Queue Timer
 
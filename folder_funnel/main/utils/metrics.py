@@ -0,0 +1,225 @@
+"""Lightweight hot-path instrumentation (timers + counters).
+
+Collection is disabled by default. While disabled, `timer()` hands back a shared
+no-op context manager and `count()`/`hit()` return immediately, so instrumented
+code pays roughly one global lookup per call.
+
+Usage:
+    with metrics.timer("hash.full") as t:
+        ...
+        t.nbytes = file_size
+"""
+
+
+#region - Imports
+
+
+# Standard
+import time
+import threading
+from collections import deque
+from functools import wraps
+from typing import Callable, Deque, Dict, Optional
+
+
+#endregion
+#region - State
+
+
+_SAMPLE_WINDOW = 512  # Latency samples kept per operation (for p50/p95)
+
+enabled: bool = False
+_lock = threading.Lock()
+_ops: Dict[str, "_OpStats"] = {}
+_counters: Dict[str, int] = {}
+_started_at: float = time.time()
+
+
+class _OpStats:
+    __slots__ = ("calls", "items", "nbytes", "total_s", "samples")
+
+    def __init__(self):
+        self.calls = 0
+        self.items = 0
+        self.nbytes = 0
+        self.total_s = 0.0
+        self.samples: Deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+
+
+def set_enabled(value: bool) -> None:
+    """Turn collection on/off (existing data is kept)."""
+    global enabled
+    enabled = bool(value)
+
+
+def is_enabled() -> bool:
+    return enabled
+
+
+def reset() -> None:
+    """Drop all collected timings and counters."""
+    global _started_at
+    with _lock:
+        _ops.clear()
+        _counters.clear()
+        _started_at = time.time()
+
+
+#endregion
+#region - Recording
+
+
+class _NullTimer:
+    """Shared no-op timer returned while collection is disabled."""
+    __slots__ = ()
+
+    items = 1
+    nbytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        # Callers set items/nbytes unconditionally; ignore while disabled.
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("name", "items", "nbytes", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 1
+        self.nbytes = 0
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self._start, self.items, self.nbytes)
+        return False
+
+
+def timer(name: str):
+    """Return a context manager that records wall time for `name`."""
+    if not enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of `timer()` for whole functions."""
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with _Timer(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(name: str, seconds: float, items: int = 1, nbytes: int = 0) -> None:
+    """Record one completed operation."""
+    if not enabled:
+        return
+    with _lock:
+        stats = _ops.get(name)
+        if stats is None:
+            stats = _ops[name] = _OpStats()
+        stats.calls += 1
+        stats.items += int(items)
+        stats.nbytes += int(nbytes)
+        stats.total_s += float(seconds)
+        stats.samples.append(float(seconds))
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment a plain counter."""
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + int(n)
+
+
+def hit(cache_name: str, was_hit: bool) -> None:
+    """Record a cache lookup outcome (used for hit-rate reporting)."""
+    if not enabled:
+        return
+    key = f"{cache_name}.hit" if was_hit else f"{cache_name}.miss"
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + 1
+
+
+#endregion
+#region - Reporting
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round((pct / 100.0) * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def snapshot() -> Dict[str, object]:
+    """Return a point-in-time copy of all metrics.
+
+    Shape:
+        {
+          "elapsed_s": float,
+          "operations": {name: {calls, items, bytes, total_s, files_per_s, mb_per_s, p50_ms, p95_ms}},
+          "counters": {name: int},
+          "caches": {name: {hits, misses, hit_rate}},
+        }
+    """
+    with _lock:
+        ops = {name: (s.calls, s.items, s.nbytes, s.total_s, list(s.samples)) for name, s in _ops.items()}
+        counters = dict(_counters)
+        started_at = _started_at
+    operations: Dict[str, Dict[str, float]] = {}
+    for name, (calls, items, nbytes, total_s, samples) in ops.items():
+        samples.sort()
+        operations[name] = {
+            "calls": calls,
+            "items": items,
+            "bytes": nbytes,
+            "total_s": total_s,
+            "files_per_s": (items / total_s) if total_s > 0 else 0.0,
+            "mb_per_s": (nbytes / (1024 * 1024) / total_s) if total_s > 0 else 0.0,
+            "p50_ms": _percentile(samples, 50) * 1000.0,
+            "p95_ms": _percentile(samples, 95) * 1000.0,
+        }
+    caches: Dict[str, Dict[str, float]] = {}
+    for key, value in counters.items():
+        if key.endswith(".hit") or key.endswith(".miss"):
+            cache_name, _, outcome = key.rpartition(".")
+            entry = caches.setdefault(cache_name, {"hits": 0, "misses": 0, "hit_rate": 0.0})
+            entry["hits" if outcome == "hit" else "misses"] += value
+    for entry in caches.values():
+        total = entry["hits"] + entry["misses"]
+        entry["hit_rate"] = (entry["hits"] / total) if total else 0.0
+    plain_counters = {k: v for k, v in counters.items() if not (k.endswith(".hit") or k.endswith(".miss"))}
+    return {
+        "elapsed_s": time.time() - started_at,
+        "operations": operations,
+        "counters": plain_counters,
+        "caches": caches,
+    }
+
+
+def get_operation(name: str) -> Optional[Dict[str, float]]:
+    """Convenience accessor for a single operation from `snapshot()`."""
+    return snapshot()["operations"].get(name)
+
+
+#endregion
@@ -6,15 +6,17 @@ import os
 import time
 import shutil
 import zipfile
-
-# Third-party
-import nenotk as ntk
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
 
 # Custom
 from . import duplicate_handler
+from . import trash
+from . import metrics
 
 # Type checking
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Deque, Dict, List, NamedTuple, Optional, Tuple
 if TYPE_CHECKING:
     from app import Main
 
@@ -92,19 +94,33 @@ def _clear_retry(app: 'Main', path: str) -> None:
     last_stat.pop(path, None)
 
 
-def _is_file_stable(app: 'Main', path: str) -> bool:
-    """Returns True when file size/mtime are unchanged across attempts."""
-    _, _, last_stat = _retry_state(app)
+def _stat_key(path: str) -> Optional[Tuple[int, float]]:
     try:
         st = os.stat(path)
-        stat_key = (st.st_size, st.st_mtime)
+        return (st.st_size, st.st_mtime)
     except Exception:
+        return None
+
+
+def _is_file_stable(app: 'Main', path: str, stat_key: Optional[Tuple[int, float]] = None) -> bool:
+    """Returns True when file size/mtime are unchanged across attempts (stat_key: a fresh prefetched stat)."""
+    _, _, last_stat = _retry_state(app)
+    if stat_key is None:
+        stat_key = _stat_key(path)
+    if stat_key is None:
         return False
     prev = last_stat.get(path)
     last_stat[path] = stat_key
     return prev is not None and prev == stat_key
 
 
+def _last_known_size(app: 'Main', path: str) -> int:
+    """Return the size recorded by the last stability check (no extra stat)."""
+    _, _, last_stat = _retry_state(app)
+    stat_key = last_stat.get(path)
+    return int(stat_key[0]) if stat_key else 0
+
+
 def _schedule_retry_pass(app: 'Main') -> None:
     """Schedule the next queue processing based on earliest due time."""
     _, due_ms, _ = _retry_state(app)
@@ -122,13 +138,8 @@ def _schedule_retry_pass(app: 'Main') -> None:
     if next_due is None:
         return
     delay = max(250, int(next_due - now))
-    # Cancel any existing timer and schedule a retry processing pass
-    if app.queue_timer_id:
-        try:
-            app.root.after_cancel(app.queue_timer_id)
-        except Exception:
-            pass
-    app.queue_timer_id = app.root.after(delay, lambda: process_move_queue(app))
+    # Replaces any pending queue timer (batch window or earlier retry)
+    app.queue_timer_id = app.debounce("queue", delay, lambda: process_move_queue(app))
 
 
 def _is_empty_file(file_path):
@@ -168,7 +179,7 @@ def _is_part_file(file_path):
 def _should_process_firefox_temp_files(app: 'Main', file_path):
     """Returns True if file should be processed, False if it should be skipped."""
     # Check if temp files should be ignored
-    if not app.ignore_firefox_temp_files_var.get():
+    if not app.funnel_config.ignore_firefox_temp_files:
         return True
     # Get relative path for logging
     rel_path = os.path.relpath(file_path, app.funnel_dir)
@@ -186,7 +197,7 @@ def _enqueue_file_if_allowed(app: 'Main', file_path: str, rel_path: str = None)
     """Apply temp-file filters and queue the file if eligible."""
     if not _should_process_firefox_temp_files(app, file_path):
         return False
-    if app.ignore_temp_files_var.get() and _is_temp_file(app, file_path):
+    if app.funnel_config.ignore_temp_files and _is_temp_file(app, file_path):
         return False
     if file_path in app.move_queue:
         return False
@@ -201,20 +212,18 @@ def _enqueue_file_if_allowed(app: 'Main', file_path: str, rel_path: str = None)
     return True
 
 
-def _update_queue_progress(app: 'Main'):
-    """Update the queue progress bar."""
+def _sample_queue_progress(app: 'Main') -> Optional[float]:
+    """Current queue timer progress (0-100), or None once the timer has run out or the queue is idle."""
     if not app.queue_start_time or not app.move_queue:
-        app.queue_progressbar['value'] = 0
-        return
-    current_time = time.time() * 1000
-    elapsed = current_time - app.queue_start_time
-    progress = (elapsed / app.move_queue_length_var.get()) * 100
-    if progress <= 100:
-        app.queue_progressbar['value'] = progress
-        # Update every 50ms
-        app.root.after(50, lambda: _update_queue_progress(app))
-    else:
-        app.queue_progressbar['value'] = 100
+        return None
+    elapsed = time.time() * 1000 - app.queue_start_time
+    progress = (elapsed / max(1, app.funnel_config.move_queue_length)) * 100
+    return progress if progress < 100 else None
+
+
+def _finish_queue_progress(app: 'Main'):
+    """Leave the bar full while the batch runs; empty it when nothing is queued."""
+    app.set_queue_progress(100 if app.queue_start_time and app.move_queue else 0)
 
 
 def _get_unique_filename(file_path):
@@ -252,15 +261,19 @@ def _extract_zip(app: 'Main', zip_path, extract_dir):
         # Create the extraction directory if it doesn't exist
         os.makedirs(extract_dir, exist_ok=True)
         # Extract the zip file
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        with metrics.timer("extract_zip") as t, zipfile.ZipFile(zip_path, 'r') as zip_ref:
             # Extract all contents, overwriting existing files
             zip_ref.extractall(path=extract_dir)
+            if metrics.enabled:
+                members = zip_ref.infolist()
+                t.items = len(members)
+                t.nbytes = sum(info.file_size for info in members)
         # Log the extraction
-        rel_path = os.path.relpath(zip_path, app.source_dir_var.get())
-        rel_extract = os.path.relpath(extract_dir, app.source_dir_var.get())
+        rel_path = os.path.relpath(zip_path, app.funnel_config.source_dir)
+        rel_extract = os.path.relpath(extract_dir, app.funnel_config.source_dir)
         app.log(f"Extracted ZIP: {rel_path} → {rel_extract}", mode="info", verbose=1)
         # Remove the original ZIP file if enabled
-        if app.auto_delete_zip_var.get():
+        if app.funnel_config.auto_delete_zip:
             os.remove(zip_path)
             app.log(f"Deleted ZIP after extraction: {rel_path}", mode="info", verbose=2)
         return True
@@ -278,7 +291,7 @@ def _handle_new_folder(app: 'Main', source_path):
     try:
         # Get relative path from watch folder
         rel_path = os.path.relpath(source_path, app.funnel_dir)
-        dest_path = os.path.join(app.source_dir_var.get(), rel_path)
+        dest_path = os.path.join(app.funnel_config.source_dir, rel_path)
         # Create folder structure in both locations
         os.makedirs(dest_path, exist_ok=True)
         app.log(f"Created folder: {rel_path}", mode="info", verbose=2)
@@ -290,7 +303,7 @@ def _handle_new_folder(app: 'Main', source_path):
             for dirname in dirnames:
                 rel_dir = os.path.join(rel_path, rel_dirpath, dirname)
                 funnel_dir = os.path.join(app.funnel_dir, rel_dir)
-                dest_dir = os.path.join(app.source_dir_var.get(), rel_dir)
+                dest_dir = os.path.join(app.funnel_config.source_dir, rel_dir)
                 os.makedirs(funnel_dir, exist_ok=True)
                 os.makedirs(dest_dir, exist_ok=True)
                 app.log(f"Created subfolder: {rel_dir}", mode="info", verbose=3)
@@ -303,66 +316,53 @@ def _handle_new_folder(app: 'Main', source_path):
         app.log(f"Error handling new folder {source_path}: {str(e)}", mode="error", verbose=1)
 
 
-def _handle_possible_duplicate_file(app: 'Main', source_path, dest_path, rel_path):
+def _partial_hash_settings(app: 'Main') -> Tuple[int, str]:
+    """Return (partial_hash_size, partial_mode) for duplicate checks; size 0 = partial hashing disabled."""
+    config = app.funnel_config
+    partial_hash_size = config.dupe_partial_hash_size if config.dupe_use_partial_hash else 0
+    return partial_hash_size, duplicate_handler.partial_hash_mode(config.dupe_partial_hash_mode, config.dupe_partial_hash_samples)
+
+
+def _ingest_hash_kinds(app: 'Main') -> List[Tuple[int, str]]:
+    """Hash kinds carried across a move: the full hash plus the configured partial hash."""
+    partial_hash_size, partial_mode = _partial_hash_settings(app)
+    kinds = [(0, "full")]
+    if partial_hash_size > 0:
+        kinds.append((partial_hash_size, partial_mode))
+    return kinds
+
+
+def _hash_on_ingest(app: 'Main', source_path: str, kinds: List[Tuple[int, str]]) -> None:
+    """Hash a file while it is still hot so later checks against it cost no reads."""
+    for partial_size, partial_mode in kinds:
+        try:
+            duplicate_handler.get_md5(source_path, partial_size=partial_size, partial_mode=partial_mode)
+        except duplicate_handler.FileNotReadyError as exc:
+            raise RetryableMoveError(str(exc)) from exc
+
+
+def _handle_possible_duplicate_file(app: 'Main', source_path, dest_path, rel_path, prefetched: Optional['_Prefetched'] = None):
     """Handle a file that might be a duplicate."""
-    # Get partial hash size (0 = disabled, otherwise bytes to read)
-    partial_hash_size = app.dupe_partial_hash_size_var.get() if app.dupe_use_partial_hash_var.get() else 0
+    # Get partial hash size (0 = disabled, otherwise bytes to read) and mode
+    partial_hash_size, partial_mode = _partial_hash_settings(app)
+    # Global mode falls back to a Similar check of the target folder while the content index builds
+    check_mode = "Similar" if app.funnel_config.dupe_check_mode == "Global" else app.funnel_config.dupe_check_mode
     try:
-        is_duplicate, matching_file_path = duplicate_handler.are_files_identical(
+        verdict = prefetched.pipeline.reusable_verdict(prefetched, dest_path) if prefetched else None
+        is_duplicate, matching_file_path = verdict if verdict else duplicate_handler.are_files_identical(
             file1=source_path,
             file2=dest_path,
-            check_mode=app.dupe_check_mode_var.get(),
-            method=app.dupe_filter_mode_var.get(),
-            max_files=app.dupe_max_files_var.get(),
+            check_mode=check_mode,
+            method=app.funnel_config.dupe_filter_mode,
+            max_files=app.funnel_config.dupe_max_files,
             partial_hash_size=partial_hash_size,
+            partial_mode=partial_mode,
             app=app
         )
     except duplicate_handler.FileNotReadyError as exc:
         raise RetryableMoveError(str(exc)) from exc
     if is_duplicate:
-        # Files are identical, handle based on dupe_handle_mode
-        filename = os.path.basename(source_path)
-        duplicate_path = source_path
-        dupe_action = "Duplicate deleted"
-        if app.dupe_handle_mode_var.get() == "Delete":
-            # Delete the duplicate file
-            try:
-                os.remove(source_path)
-            except (PermissionError, OSError) as exc:
-                raise RetryableMoveError(str(exc)) from exc
-            app.log(f"Duplicate deleted: {rel_path}", mode="info", verbose=1)
-        else:  # "Move" mode
-            dupe_action = "Duplicate moved"
-            if not app.duplicate_storage_path:
-                duplicate_handler.create_duplicate_storage_folder(app)
-            # Ensure the directory structure exists in the duplicate folder
-            rel_dir = os.path.dirname(rel_path)
-            dup_dir_path = os.path.join(app.duplicate_storage_path, rel_dir)
-            os.makedirs(dup_dir_path, exist_ok=True)
-            # Calculate destination path in duplicate storage
-            dup_file_path = os.path.join(app.duplicate_storage_path, rel_path)
-            # Handle if file already exists in duplicate storage - use get_unique_filename
-            dup_file_path = _get_unique_filename(dup_file_path)
-            # Move the duplicate file
-            try:
-                shutil.move(source_path, dup_file_path)
-            except (PermissionError, OSError) as exc:
-                raise RetryableMoveError(str(exc)) from exc
-            app.log(f"Duplicate moved: {rel_path} -> {os.path.relpath(dup_file_path, app.duplicate_storage_path)}", mode="info", verbose=1)
-            duplicate_path = dup_file_path
-        # Record the duplicate file, using the matching file path as source
-        original_path = matching_file_path if matching_file_path else dest_path
-        if hasattr(app, "add_history_duplicate"):
-            app.add_history_duplicate(rel_path=rel_path, source_path=original_path, duplicate_path=duplicate_path, action=dupe_action)
-        app.duplicate_count += 1
-        app.grand_duplicate_count += 1
-        app.update_duplicate_count()
-        # Keep legacy dict populated for safety
-        try:
-            app.history_order_counter += 1
-            app.duplicate_history_items[filename] = {"source": original_path, "duplicate": duplicate_path, "order": app.history_order_counter}
-        except Exception:
-            pass
+        _dispose_duplicate(app, source_path, rel_path, matching_file_path if matching_file_path else dest_path)
         return True, None
     else:
         # Not a duplicate, find new name
@@ -370,45 +370,131 @@ def _handle_possible_duplicate_file(app: 'Main', source_path, dest_path, rel_pat
         return False, new_dest_path
 
 
-def _move_file(app: 'Main', source_path):
+def _find_global_duplicate(app: 'Main', source_path) -> Tuple[bool, Optional[str]]:
+    """Look the file up in the content index: (index_ready, matching library file or None)."""
+    content_index = getattr(app, "content_index", None)
+    if content_index is None or not content_index.is_ready:
+        return False, None
+    try:
+        return True, content_index.find(source_path)
+    except duplicate_handler.FileNotReadyError as exc:
+        raise RetryableMoveError(str(exc)) from exc
+
+
+def _dispose_duplicate(app: 'Main', source_path, rel_path, original_path):
+    """Delete or store an incoming duplicate and record it; original_path is the file it matched."""
+    # Files are identical, handle based on dupe_handle_mode
+    filename = os.path.basename(source_path)
+    duplicate_path = source_path
+    dupe_action = "Duplicate deleted"
+    if app.funnel_config.dupe_handle_mode == "Delete":
+        # Delete the duplicate file (to the trash unless disabled: a same-volume rename)
+        try:
+            trashed_path = trash.remove(source_path, use_trash=app.funnel_config.delete_to_trash)
+        except (PermissionError, OSError) as exc:
+            raise RetryableMoveError(str(exc)) from exc
+        duplicate_handler.forget_hashes([source_path])
+        if trashed_path:
+            duplicate_path = trashed_path
+            app.log(f"Duplicate deleted (to trash): {rel_path}", mode="info", verbose=1)
+        else:
+            app.log(f"Duplicate deleted: {rel_path}", mode="info", verbose=1)
+    else:  # "Move" mode
+        dupe_action = "Duplicate moved"
+        if not app.duplicate_storage_path:
+            duplicate_handler.create_duplicate_storage_folder(app)
+        # Ensure the directory structure exists in the duplicate folder
+        rel_dir = os.path.dirname(rel_path)
+        dup_dir_path = os.path.join(app.duplicate_storage_path, rel_dir)
+        os.makedirs(dup_dir_path, exist_ok=True)
+        # Calculate destination path in duplicate storage
+        dup_file_path = os.path.join(app.duplicate_storage_path, rel_path)
+        # Handle if file already exists in duplicate storage - use get_unique_filename
+        dup_file_path = _get_unique_filename(dup_file_path)
+        # Move the duplicate file
+        try:
+            shutil.move(source_path, dup_file_path)
+        except (PermissionError, OSError) as exc:
+            raise RetryableMoveError(str(exc)) from exc
+        duplicate_handler.forget_hashes([source_path])
+        app.log(f"Duplicate moved: {rel_path} -> {os.path.relpath(dup_file_path, app.duplicate_storage_path)}", mode="info", verbose=1)
+        duplicate_path = dup_file_path
+    # Record the duplicate file, using the matching file path as source
+    if hasattr(app, "add_history_duplicate"):
+        app.add_history_duplicate(rel_path=rel_path, source_path=original_path, duplicate_path=duplicate_path, action=dupe_action)
+    app.duplicate_count += 1
+    app.grand_duplicate_count += 1
+    app.update_duplicate_count()
+    # Keep legacy dict populated for safety
+    try:
+        app.history_order_counter += 1
+        app.duplicate_history_items[filename] = {"source": original_path, "duplicate": duplicate_path, "order": app.history_order_counter}
+    except Exception:
+        pass
+
+
+def _move_file(app: 'Main', source_path, prefetched: Optional['_Prefetched'] = None):
     """Internal method to move a file when the queue is ready."""
     try:
         # If the file is still changing, wait for a later pass to avoid hashing/moving partial files.
-        if not _is_file_stable(app, source_path):
+        if not _is_file_stable(app, source_path, prefetched.stat_key if prefetched else None):
             raise RetryableMoveError("file still being written")
 
         # Get the relative path from the watch folder
         rel_path = os.path.relpath(source_path, app.funnel_dir)
         # Calculate the destination path in the source folder
-        dest_path = os.path.join(app.source_dir_var.get(), rel_path)
+        dest_path = os.path.join(app.funnel_config.source_dir, rel_path)
         # Ensure the destination directory exists
         os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        # Global mode: one content-index lookup covers the whole source tree
+        index_ready = False
+        if app.funnel_config.dupe_check_mode == "Global" and not app.funnel_config.overwrite_on_conflict:
+            index_ready, matching_file_path = _find_global_duplicate(app, source_path)
+            if matching_file_path:
+                _dispose_duplicate(app, source_path, rel_path, matching_file_path)
+                _clear_retry(app, source_path)
+                return True
         # If file exists, handle based on settings
         if os.path.exists(dest_path):
             # If overwrite is enabled, skip duplicate checking
-            if app.overwrite_on_conflict_var.get():
+            if app.funnel_config.overwrite_on_conflict:
                 app.log(f"Overwriting existing file: {rel_path}", mode="warning", verbose=2)
+            elif index_ready:
+                # No identical content anywhere in the library; only the name conflicts
+                dest_path = _get_unique_filename(dest_path)
             else:
                 # Check for duplicates and get unique name if needed
-                is_duplicate, new_dest_path = _handle_possible_duplicate_file(app, source_path, dest_path, rel_path)
+                is_duplicate, new_dest_path = _handle_possible_duplicate_file(app, source_path, dest_path, rel_path, prefetched)
                 if is_duplicate:
                     _clear_retry(app, source_path)
                     return True
                 if new_dest_path:
                     dest_path = new_dest_path
+        # Known hashes follow the file across the move (keyed by its new path and stat)
+        kinds = _ingest_hash_kinds(app)
+        if app.funnel_config.dupe_hash_on_ingest:
+            _hash_on_ingest(app, source_path, kinds)
+        carried = duplicate_handler.take_hashes(source_path, kinds)
         # Move the file
         try:
             shutil.move(source_path, dest_path)
         except (PermissionError, OSError) as exc:
             raise RetryableMoveError(str(exc)) from exc
+        duplicate_handler.carry_hashes(source_path, dest_path, carried)
+        if getattr(app, "content_index", None) is not None:
+            app.content_index.add(dest_path)
         action = "Moved"
         app.log(f"Moved: {rel_path}", mode="info", verbose=1)
+        if prefetched:
+            prefetched.pipeline.record_commit(dest_path, _last_known_size(app, source_path))
         # Handle ZIP extraction if enabled
-        if app.auto_extract_zip_var.get() and _is_zip_file(dest_path):
+        if app.funnel_config.auto_extract_zip and _is_zip_file(dest_path):
             # Create extraction directory named after the zip file (without extension)
             zip_name = os.path.splitext(os.path.basename(dest_path))[0]
             extract_dir = os.path.join(os.path.dirname(dest_path), zip_name)
             _extract_zip(app, dest_path, extract_dir)
+            if prefetched:
+                prefetched.pipeline.record_commit(extract_dir, None)
         # Update history list with the new filename and full path
         if hasattr(app, "add_history_moved"):
             app.add_history_moved(dest_path=dest_path, rel_path=rel_path, action=action)
@@ -417,7 +503,7 @@ def _move_file(app: 'Main', source_path):
         # Update counts
         app.move_count += 1
         app.grand_move_count += 1
-        app.movecount_var.set(f"Moved: {ntk.number_commas(app.move_count)}")
+        app.update_move_count()
         # Note: count_folders_and_files is called once after batch processing completes
         _clear_retry(app, source_path)
         return True
@@ -429,29 +515,162 @@ def _move_file(app: 'Main', source_path):
         return False
 
 
+#endregion
+#region - Verification Pipeline
+
+
+# Read-only verification (stat + duplicate check) runs ahead on a shared pool while moves are
+# committed one by one, in queue order, on the engine thread. A prefetched verdict is reused unless
+# something it depended on changed: the destination file, the matched file, or a file of the same
+# size committed to the same folder earlier in this batch. Otherwise the commit repeats the check,
+# which is then mostly hash-cache hits.
+_VERIFY_WORKERS = min(8, (os.cpu_count() or 2) + 2)
+_VERIFY_LOOKAHEAD = _VERIFY_WORKERS * 4
+_verify_pool: Optional[ThreadPoolExecutor] = None
+_verify_pool_lock = threading.Lock()
+
+
+class _Prefetched(NamedTuple):
+    pipeline: '_VerificationPipeline'
+    stat_key: Optional[Tuple[int, float]]  # Source (size, mtime) for the stability check
+    verdict: Optional[Tuple[bool, Optional[str]]] = None  # are_files_identical() result, if computed
+    commit_seq: int = 0  # Commits already applied when the verdict was computed
+    dest_key: Optional[tuple] = None
+    match_key: Optional[tuple] = None
+
+
+def _get_verify_pool() -> ThreadPoolExecutor:
+    global _verify_pool
+    with _verify_pool_lock:
+        if _verify_pool is None:
+            _verify_pool = ThreadPoolExecutor(max_workers=_VERIFY_WORKERS, thread_name_prefix="funnel-verify")
+        return _verify_pool
+
+
+def _prefetch_verification(pipeline: '_VerificationPipeline', source_path: str, prev_stat: Optional[Tuple[int, float]]) -> _Prefetched:
+    """Worker thread, read-only: stat the file and, if it will need one, run its duplicate check.
+
+    The check only runs when the file already looks stable (same stat as the previous pass) and its
+    destination exists, i.e. when the commit pass would run it too.
+    """
+    app = pipeline.app
+    stat_key = _stat_key(source_path)
+    if stat_key is None or stat_key != prev_stat or app.funnel_config.overwrite_on_conflict:
+        return _Prefetched(pipeline, stat_key)
+    try:
+        content_index = getattr(app, "content_index", None)
+        if app.funnel_config.dupe_check_mode == "Global" and content_index is not None and content_index.is_ready:
+            # Warm the hashes the content-index lookup will need; the lookup itself runs at commit time
+            content_index.prefetch(source_path)
+            return _Prefetched(pipeline, stat_key)
+        commit_seq = pipeline.commit_seq
+        dest_path = os.path.join(app.funnel_config.source_dir, os.path.relpath(source_path, app.funnel_dir))
+        dest_key = duplicate_handler.get_file_key(dest_path)
+        if dest_key is None:
+            return _Prefetched(pipeline, stat_key)
+        partial_hash_size, partial_mode = _partial_hash_settings(app)
+        with metrics.timer("verify.prefetch"):
+            verdict = duplicate_handler.are_files_identical(
+                file1=source_path,
+                file2=dest_path,
+                check_mode=app.funnel_config.dupe_check_mode,
+                method=app.funnel_config.dupe_filter_mode,
+                max_files=app.funnel_config.dupe_max_files,
+                partial_hash_size=partial_hash_size,
+                partial_mode=partial_mode,
+            )
+        match_key = duplicate_handler.get_file_key(verdict[1]) if verdict[0] and verdict[1] else None
+        return _Prefetched(pipeline, stat_key, verdict, commit_seq, dest_key, match_key)
+    except Exception:
+        return _Prefetched(pipeline, stat_key)  # The commit pass repeats the check and reports errors
+
+
+class _VerificationPipeline:
+    """Keeps up to _VERIFY_LOOKAHEAD prefetches in flight ahead of the in-order commit loop."""
+    def __init__(self, app: 'Main', paths: List[str]):
+        _, _, last_stat = _retry_state(app)
+        self.app = app
+        self.commit_seq = 0
+        self._commits: List[Tuple[str, Optional[int]]] = []  # (dest folder, size or None = whole subtree changed)
+        self._waiting: Deque[Tuple[str, Optional[Tuple[int, float]]]] = deque((p, last_stat.get(p)) for p in paths)
+        self._futures: Dict[str, Future] = {}
+        self._fill()
+
+
+    def _fill(self) -> None:
+        pool = _get_verify_pool()
+        while self._waiting and len(self._futures) < _VERIFY_LOOKAHEAD:
+            path, prev_stat = self._waiting.popleft()
+            if path not in self._futures:
+                self._futures[path] = pool.submit(_prefetch_verification, self, path, prev_stat)
+
+
+    def take(self, path: str) -> Optional[_Prefetched]:
+        """Wait for path's prefetch (if any) and return it; refills the window."""
+        future = self._futures.pop(path, None)
+        self._fill()
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+
+    def record_commit(self, path: str, size: Optional[int]) -> None:
+        """Note a file (size) or a whole folder (size=None) added to the destination tree."""
+        folder = os.path.normcase(path if size is None else os.path.dirname(path))
+        self._commits.append((folder, size))
+        self.commit_seq += 1
+
+
+    def reusable_verdict(self, prefetched: _Prefetched, dest_path: str) -> Optional[Tuple[bool, Optional[str]]]:
+        """Return the prefetched verdict if nothing it depended on has changed since, else None."""
+        if prefetched.verdict is None:
+            return None
+        dest_dir = os.path.normcase(os.path.dirname(dest_path))
+        size = prefetched.stat_key[0] if prefetched.stat_key else None
+        for folder, committed_size in self._commits[prefetched.commit_seq:]:
+            if committed_size is None and (dest_dir == folder or dest_dir.startswith(folder + os.sep)):
+                return None
+            if folder == dest_dir and committed_size == size:
+                return None  # Possibly an identical file moved in earlier in this batch
+        if duplicate_handler.get_file_key(dest_path) != prefetched.dest_key:
+            return None
+        is_duplicate, matching_file_path = prefetched.verdict
+        if is_duplicate and matching_file_path and duplicate_handler.get_file_key(matching_file_path) != prefetched.match_key:
+            return None
+        metrics.count("verify.reused")
+        return prefetched.verdict
+
+
+    def cancel(self) -> None:
+        self._waiting.clear()
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+
+
 #endregion
 #region - Queue Management
 
 
 def start_queue(app: 'Main'):
     """Start/restart the queue timer and progress bar updates."""
-    # Cancel any existing timer
-    if app.queue_timer_id:
-        app.root.after_cancel(app.queue_timer_id)
-    # Start new timer
+    # Restart the batching window (replaces any pending timer)
     app.queue_start_time = time.time() * 1000
-    app.queue_progressbar['value'] = 0
-    _update_queue_progress(app)
-    app.queue_timer_id = app.root.after(app.move_queue_length_var.get(), lambda: process_move_queue(app))
+    app.set_queue_progress(0)
+    app.animate_progress("queue", lambda: _sample_queue_progress(app), on_done=lambda: _finish_queue_progress(app))
+    app.queue_timer_id = app.debounce("queue", app.funnel_config.move_queue_length, lambda: process_move_queue(app))
 
 
 def stop_queue(app: 'Main'):
     """Stop the queue timer and reset progress bar."""
-    if app.queue_timer_id:
-        app.root.after_cancel(app.queue_timer_id)
+    app.cancel_debounce("queue")
+    app.stop_progress("queue")
     app.queue_timer_id = None  # Reset timer ID
     app.queue_start_time = None  # Reset start time
-    app.queue_progressbar['value'] = 0  # Reset progress bar
+    app.set_queue_progress(0)  # Reset progress bar
 
 
 def queue_move_file(app: 'Main', source_path):
@@ -478,26 +697,36 @@ def process_move_queue(app: 'Main'):
     batch_total = len(pending)
     start_moved = int(getattr(app, "move_count", 0) or 0)
     start_dupes = int(getattr(app, "duplicate_count", 0) or 0)
-    app.log(f"Processing {ntk.number_commas(len(app.move_queue))} queued file{'s' if len(app.move_queue) != 1 else ''}...", mode="info", verbose=2)
+    app.log(f"Processing {len(app.move_queue):,} queued file{'s' if len(app.move_queue) != 1 else ''}...", mode="info", verbose=2)
     success_count = 0
     failed_paths = []
-    for source_path in pending:
-        if not os.path.exists(source_path):
-            _clear_retry(app, source_path)
-            app.log(f"File not found, skipping: {source_path}", mode="warning", verbose=2)
-            continue
-        if not _is_due(app, source_path):
-            failed_paths.append(source_path)
-            continue
-        try:
-            if _move_file(app, source_path):
-                success_count += 1
-            else:
+    due_paths = [p for p in pending if _is_due(app, p)]
+    pipeline = _VerificationPipeline(app, due_paths) if len(due_paths) > 1 else None
+    try:
+        for source_path in pending:
+            prefetched = pipeline.take(source_path) if pipeline else None
+            if not os.path.exists(source_path):
                 _clear_retry(app, source_path)
-        except RetryableMoveError as exc:
-            delay = _mark_retry(app, source_path, reason=str(exc))
-            if delay is not None:
+                app.log(f"File not found, skipping: {source_path}", mode="warning", verbose=2)
+                continue
+            if not _is_due(app, source_path):
                 failed_paths.append(source_path)
+                continue
+            try:
+                with metrics.timer("move_file") as t:
+                    t.nbytes = _last_known_size(app, source_path)
+                    moved = _move_file(app, source_path, prefetched)
+                if moved:
+                    success_count += 1
+                else:
+                    _clear_retry(app, source_path)
+            except RetryableMoveError as exc:
+                delay = _mark_retry(app, source_path, reason=str(exc))
+                if delay is not None:
+                    failed_paths.append(source_path)
+    finally:
+        if pipeline:
+            pipeline.cancel()
 
     # Replace queue with failures for retry; successes are removed.
     app.move_queue = failed_paths
@@ -505,16 +734,17 @@ def process_move_queue(app: 'Main'):
 
     if batch_total == 1:
         app.log(
-            f"Move pass complete: {ntk.number_commas(success_count)}/1 file ({ntk.number_commas(len(failed_paths))} pending)\n",
+            f"Move pass complete: {success_count:,}/1 file ({len(failed_paths):,} pending)\n",
             mode="info",
             verbose=1,
         )
     else:
         app.log(
-            f"Batch pass complete: {ntk.number_commas(success_count)}/{ntk.number_commas(batch_total)} files ({ntk.number_commas(len(failed_paths))} pending)\n",
+            f"Batch pass complete: {success_count:,}/{batch_total:,} files ({len(failed_paths):,} pending)\n",
             mode="info",
             verbose=1,
         )
+    app.batch_complete()
 
     # Desktop notification (independent of minimize-to-tray)
     # Only notify when the queue fully clears to avoid notification spam on retry passes.
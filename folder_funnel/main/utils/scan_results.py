@@ -0,0 +1,259 @@
+"""
+Save and load Duplicate Scanner results.
+
+A scan result is written one row per file (group number, group key, path, size,
+mtime, hash, hard link flag) as JSONL, CSV or SQLite, chosen by file extension.
+The hash is the one the pipeline's last hash stage computed (full, partial or
+sampled MD5); which kind it is, with its parameters, is recorded in the metadata. Rows are streamed from the scan's FileTable
+straight to the file, so exporting millions of files never builds the whole
+output in memory; the file is written under a temporary name and renamed into
+place when complete.
+
+Importing rebuilds a FileTable plus row groups, so a loaded result can be shown,
+acted on, reviewed and exported again exactly like a fresh scan. Files that were
+removed or changed since the export are dropped, and groups left with a single
+file disappear.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import os
+import csv
+import json
+import time
+import sqlite3
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Set, Tuple
+
+# Custom
+from .file_table import FileTable
+
+
+#endregion
+#region - Records
+
+
+FORMAT_NAME = "folder-funnel-scan"
+FORMAT_VERSION = 1
+FIELDS = ("group", "key", "path", "size", "mtime", "hash", "hard_link")
+EXTENSIONS = {".jsonl": "jsonl", ".csv": "csv", ".sqlite": "sqlite", ".db": "sqlite"}
+HASH_COLUMN = "md5"  # FileTable column of full-file hashes (FullMD5Stage); the default hash kind
+
+# (group, key, path, size, mtime, hash, hard_link); key is the group key as JSON text
+Row = Tuple[int, str, str, int, float, str, bool]
+
+
+class GroupSummary(NamedTuple):
+    """Display data for one duplicate group, computed from the file table (no stat calls)."""
+    key: tuple  # Key into duplicate_groups
+    size: int  # Size of one copy
+    count: int  # Paths in the group, extra hard links included
+    wasted: int  # Bytes freed by keeping one copy (extra hard links share storage and waste nothing)
+
+
+class LoadedScan(NamedTuple):
+    table: FileTable
+    group_rows: Dict[tuple, array]  # Group key -> table rows, extra hard links included
+    hardlink_paths: Set[str]
+    summaries: List[GroupSummary]  # Largest waste first
+    meta: dict  # root, created, pipeline, total_files, same_folder, hash
+    stale: int  # Files dropped because they are gone or changed since the export
+
+
+def format_of(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXTENSIONS:
+        raise ValueError(f"Unsupported scan result format: {ext or path} (use .jsonl, .csv or .sqlite)")
+    return EXTENSIONS[ext]
+
+
+def summarize(key: tuple, table: FileTable, rows, hardlink_count: int = 0) -> GroupSummary:
+    size = table.sizes[int(rows[0])]
+    return GroupSummary(key, size, len(rows), size * max(0, len(rows) - hardlink_count - 1))
+
+
+def hash_meta(column: str, partial_size: int, partial_mode: str) -> dict:
+    """Metadata describing the hash kind in the rows: the FileTable column and how it was computed."""
+    return {"column": column, "partial_size": int(partial_size), "mode": partial_mode if partial_size > 0 else "full"}
+
+
+def iter_rows(table: FileTable, group_rows: Dict[tuple, array], hardlink_paths: Set[str], hash_column: str = HASH_COLUMN) -> Iterator[Row]:
+    """Result rows in group order, resolved lazily from the table; hashes come from hash_column."""
+    for number, (key, rows) in enumerate(group_rows.items(), start=1):
+        key_text = json.dumps(list(key), ensure_ascii=False)
+        for i in rows:
+            path = table.path(i)
+            digest = table.get_hash(hash_column, i)
+            yield (number, key_text, path, table.sizes[i], table.mtimes[i], digest.hex() if digest else "", path in hardlink_paths)
+
+
+#endregion
+#region - Export
+
+
+def export_results(path: str, rows: Iterator[Row], meta: dict) -> int:
+    """Stream rows to path (format from its extension); returns the number of rows written."""
+    fmt = format_of(path)
+    meta = dict(meta, format=FORMAT_NAME, version=FORMAT_VERSION, created=meta.get("created", time.time()))
+    temp = f"{path}.partial"
+    try:
+        if fmt == "jsonl":
+            count = _write_jsonl(temp, rows, meta)
+        elif fmt == "csv":
+            count = _write_csv(temp, rows, meta)
+        else:
+            count = _write_sqlite(temp, rows, meta)
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def _write_jsonl(path: str, rows: Iterator[Row], meta: dict) -> int:
+    count = 0
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(encode(meta) + "\n")
+        for row in rows:
+            f.write(encode(dict(zip(FIELDS, row))) + "\n")
+            count += 1
+    return count
+
+
+def _write_csv(path: str, rows: Iterator[Row], meta: dict) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("#" + json.dumps(meta, ensure_ascii=False) + "\n")  # Metadata line, skipped on import
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for group, key, file_path, size, mtime, digest, hard_link in rows:
+            writer.writerow((group, key, file_path, size, repr(mtime), digest, int(hard_link)))
+            count += 1
+    return count
+
+
+def _write_sqlite(path: str, rows: Iterator[Row], meta: dict) -> int:
+    counter = [0]
+    def counted():
+        for row in rows:
+            counter[0] += 1
+            yield row
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("CREATE TABLE files (group_id INTEGER, key TEXT, path TEXT, size INTEGER, mtime REAL, hash TEXT, hard_link INTEGER)")
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", ((name, json.dumps(value)) for name, value in meta.items()))
+        conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", counted())
+        conn.execute("CREATE INDEX files_group ON files (group_id)")
+        conn.commit()
+    finally:
+        conn.close()
+    return counter[0]
+
+
+#endregion
+#region - Import
+
+
+def import_results(path: str, verify: bool = True) -> LoadedScan:
+    """Load an exported result. With verify, files missing or changed on disk are dropped."""
+    fmt = format_of(path)
+    if fmt == "jsonl":
+        meta, rows = _read_jsonl(path)
+    elif fmt == "csv":
+        meta, rows = _read_csv(path)
+    else:
+        meta, rows = _read_sqlite(path)
+    if meta.get("format", FORMAT_NAME) != FORMAT_NAME:
+        raise ValueError(f"Not a Folder-Funnel scan result: {os.path.basename(path)}")
+    hash_column = (meta.get("hash") or {}).get("column") or HASH_COLUMN
+    table = FileTable()
+    group_rows: Dict[tuple, array] = {}
+    link_counts: Dict[tuple, int] = {}
+    hardlink_paths: Set[str] = set()
+    stale = 0
+    for _group, key_text, file_path, size, mtime, digest, hard_link in rows:
+        if verify and not _unchanged(file_path, size, mtime):
+            stale += 1
+            continue
+        key = tuple(json.loads(key_text))
+        i = table.append_path(file_path, size, mtime)
+        if digest:
+            table.set_hash(hash_column, i, digest)
+        group_rows.setdefault(key, array("I")).append(i)
+        if hard_link:
+            hardlink_paths.add(file_path)
+            link_counts[key] = link_counts.get(key, 0) + 1
+    # Groups need two independent copies left to still be duplicates
+    for key in [key for key, members in group_rows.items() if len(members) - link_counts.get(key, 0) < 2]:
+        for i in group_rows.pop(key):
+            hardlink_paths.discard(table.path(i))
+    summaries = [summarize(key, table, members, link_counts.get(key, 0)) for key, members in group_rows.items()]
+    summaries.sort(key=lambda summary: summary.wasted, reverse=True)
+    return LoadedScan(table, group_rows, hardlink_paths, summaries, meta, stale)
+
+
+def _unchanged(path: str, size: int, mtime: float) -> bool:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_size == size and (not mtime or st.st_mtime == mtime)
+
+
+def _read_jsonl(path: str) -> Tuple[dict, Iterator[Row]]:
+    f = open(path, "r", encoding="utf-8")
+    try:
+        meta = json.loads(f.readline() or "{}")
+    except ValueError:
+        f.close()
+        raise
+    def rows():
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line of an interrupted write
+                yield tuple(record.get(name) for name in FIELDS)
+    return meta, rows()
+
+
+def _read_csv(path: str) -> Tuple[dict, Iterator[Row]]:
+    f = open(path, "r", encoding="utf-8", newline="")
+    first = f.readline()
+    meta = {}
+    if first.startswith("#"):
+        meta = json.loads(first[1:])
+    else:
+        f.seek(0)
+    def rows():
+        with f:
+            for record in csv.DictReader(f):
+                yield (int(record["group"]), record["key"], record["path"], int(record["size"]),
+                       float(record["mtime"] or 0), record["hash"], record["hard_link"] in ("1", "True", "true"))
+    return meta, rows()
+
+
+def _read_sqlite(path: str) -> Tuple[dict, Iterator[Row]]:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    meta = {name: json.loads(value) for name, value in conn.execute("SELECT name, value FROM meta")}
+    def rows():
+        try:
+            for group, key, file_path, size, mtime, digest, hard_link in conn.execute("SELECT group_id, key, path, size, mtime, hash, hard_link FROM files ORDER BY rowid"):
+                yield (group, key, file_path, size, mtime, digest or "", bool(hard_link))
+        finally:
+            conn.close()
+    return meta, rows()
+
+
+#endregion
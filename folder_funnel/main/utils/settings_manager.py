@@ -39,6 +39,7 @@ def save_settings(app: 'Main'):
         'fast_discovery_enabled': str(bool(getattr(app, 'fast_discovery_enabled_var', None).get()) if hasattr(app, 'fast_discovery_enabled_var') else (sys.platform == 'win32')),
         'log_prefix_filter': str(app.log_prefix_filter_var.get()),
         'history_image_preview': str(app.history_image_preview_var.get()),
+        'metrics_enabled': str(app.metrics_enabled_var.get()),
     }
     # Layout
     cfg['Layout'] = {}
@@ -86,6 +87,10 @@ def save_settings(app: 'Main'):
         'max_files': str(app.dupe_max_files_var.get()),
         'use_partial_hash': str(app.dupe_use_partial_hash_var.get()),
         'partial_hash_size': str(app.dupe_partial_hash_size_var.get()),
+        'partial_hash_mode': app.dupe_partial_hash_mode_var.get(),
+        'partial_hash_samples': str(app.dupe_partial_hash_samples_var.get()),
+        'hash_on_ingest': str(app.dupe_hash_on_ingest_var.get()),
+        'delete_to_trash': str(app.delete_to_trash_var.get()),
     }
     # Queue settings
     cfg['Queue'] = {
@@ -174,6 +179,11 @@ def load_settings(app: 'Main'):
                 app.log_prefix_filter_var.set(cfg.getboolean('General', 'log_prefix_filter'))
             if 'history_image_preview' in cfg['General']:
                 app.history_image_preview_var.set(cfg.getboolean('General', 'history_image_preview'))
+            if 'metrics_enabled' in cfg['General']:
+                try:
+                    app.metrics_enabled_var.set(cfg.getboolean('General', 'metrics_enabled'))
+                except Exception:
+                    pass
             if 'fast_discovery_enabled' in cfg['General']:
                 try:
                     app.fast_discovery_enabled_var.set(cfg.getboolean('General', 'fast_discovery_enabled'))
@@ -232,6 +242,14 @@ def load_settings(app: 'Main'):
                 app.dupe_use_partial_hash_var.set(cfg.getboolean('Duplicates', 'use_partial_hash'))
             if 'partial_hash_size' in cfg['Duplicates']:
                 app.dupe_partial_hash_size_var.set(int(cfg['Duplicates']['partial_hash_size']))
+            if 'partial_hash_mode' in cfg['Duplicates']:
+                app.dupe_partial_hash_mode_var.set(cfg['Duplicates']['partial_hash_mode'])
+            if 'partial_hash_samples' in cfg['Duplicates']:
+                app.dupe_partial_hash_samples_var.set(int(cfg['Duplicates']['partial_hash_samples']))
+            if 'hash_on_ingest' in cfg['Duplicates']:
+                app.dupe_hash_on_ingest_var.set(cfg.getboolean('Duplicates', 'hash_on_ingest'))
+            if 'delete_to_trash' in cfg['Duplicates']:
+                app.delete_to_trash_var.set(cfg.getboolean('Duplicates', 'delete_to_trash'))
         # Queue
         if 'Queue' in cfg and 'queue_length' in cfg['Queue']:
             app.move_queue_length_var.set(int(cfg['Queue']['queue_length']))
@@ -385,6 +403,7 @@ def reset_settings(app: 'Main'):
         app.minimize_to_tray_var.set(True)
         app.log_prefix_filter_var.set(True)
         app.history_image_preview_var.set(True)
+        app.metrics_enabled_var.set(False)
         try:
             app.notifications_enabled_var.set(True)
         except Exception:
@@ -422,6 +441,10 @@ def reset_settings(app: 'Main'):
         app.dupe_max_files_var.set(75)
         app.dupe_use_partial_hash_var.set(True)
         app.dupe_partial_hash_size_var.set(4096)
+        app.dupe_partial_hash_mode_var.set("head_tail")
+        app.dupe_partial_hash_samples_var.set(8)
+        app.dupe_hash_on_ingest_var.set(False)
+        app.delete_to_trash_var.set(True)
         # Queue
         app.move_queue_length_var.set(1000)
         # File handling
@@ -0,0 +1,249 @@
+"""
+Decoded thumbnail cache with background decoding.
+
+Thumbnails are kept as small PIL images in an LRU bounded by decoded bytes and
+keyed by (path, mtime, size, width, height), so an edited file or a different
+preview size never returns a stale image. Decoding runs on a few worker threads:
+requests for images on screen are served before prefetches, and a new prefetch
+round drops the ones still queued from the last round, so paging quickly through
+groups never builds a backlog.
+
+JPEGs are decoded with `Image.draft`, which lets the decoder scale down by up to
+8x while decoding: a 20 MP photo becomes a preview-sized thumbnail without ever
+being expanded to full resolution. When the on-disk `thumbnail_store` is open,
+decoded thumbnails are saved there and later loads skip decoding the source.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import os
+import heapq
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Tuple
+
+# Third-party
+from PIL import Image, ImageOps
+
+# Custom
+from . import metrics
+from . import thumbnail_store
+
+
+#endregion
+#region - ThumbnailCache
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_WORKERS = 2
+
+_VISIBLE = 0  # Request priorities: images on screen first
+_PREFETCH = 1
+
+ThumbKey = Tuple[str, float, int, int, int]  # (path, mtime, size, width, height)
+
+
+def thumb_key(path: str, width: int, height: int) -> Optional[ThumbKey]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (path, st.st_mtime, st.st_size, width, height)
+
+
+def decode_thumbnail(path: str, width: int, height: int) -> Optional[Image.Image]:
+    """Decode path scaled to fit (width, height), honoring EXIF orientation; None if unreadable."""
+    try:
+        with Image.open(path) as img:
+            img.draft("RGB", (width, height))  # JPEG: scale while decoding (no-op for other formats)
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ("RGB", "RGBA", "L"):
+                img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+            img.thumbnail((width, height), Image.Resampling.LANCZOS)
+            img.load()
+            return img
+    except Exception:
+        return None
+
+
+def load_thumbnail(path: str, width: int, height: int) -> Optional[Image.Image]:
+    """Thumbnail from the disk store if present, else decoded from the source (and stored)."""
+    store = thumbnail_store.get_store()
+    key = thumbnail_store.image_key(path, width, height) if store else None
+    if key:
+        image = store.get_image(key)
+        if image is not None:
+            return image
+    image = decode_thumbnail(path, width, height)
+    if image is not None and key:
+        store.put_image(key, image)
+    return image
+
+
+class ThumbnailCache:
+    """LRU of decoded thumbnails plus a small prioritized decode pool."""
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, workers: int = DEFAULT_WORKERS):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._cache: 'OrderedDict[ThumbKey, Image.Image]' = OrderedDict()
+        self._bytes = 0
+        self._queue = []  # heap of (priority, seq, generation, key, callbacks)
+        self._pending = {}  # key -> callbacks of the queued or running decode
+        self._running = set()  # Keys being decoded right now
+        self._seq = itertools.count()
+        self._generation = 0  # Bumped by each prefetch round; older queued prefetches are dropped
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._threads = [threading.Thread(target=self._work, name=f"funnel-thumbs-{n}", daemon=True) for n in range(max(1, workers))]
+        for thread in self._threads:
+            thread.start()
+
+
+    def get(self, path: str, width: int, height: int) -> Optional[Image.Image]:
+        """Cached thumbnail or None (never decodes)."""
+        key = thumb_key(path, width, height)
+        if key is None:
+            return None
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+        metrics.hit("thumbnail_cache", image is not None)
+        return image
+
+
+    def request(self, path: str, width: int, height: int, callback: Callable[[Optional[Image.Image]], None]) -> None:
+        """Decode in the background (ahead of prefetches) and call callback(image) on a worker thread.
+
+        A cache hit calls back immediately on the calling thread.
+        """
+        key = thumb_key(path, width, height)
+        if key is None:
+            callback(None)
+            return
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+        if image is not None:
+            metrics.hit("thumbnail_cache", True)
+            callback(image)
+            return
+        metrics.hit("thumbnail_cache", False)
+        self._submit(key, _VISIBLE, callback)
+
+
+    def prefetch(self, items: Iterable[Tuple[str, int, int]]) -> None:
+        """Decode (path, width, height) items at low priority, replacing the previous prefetch round."""
+        with self._lock:
+            self._generation += 1
+        for path, width, height in items:
+            key = thumb_key(path, width, height)
+            if key is None:
+                continue
+            with self._lock:
+                if key in self._cache:
+                    continue
+            self._submit(key, _PREFETCH, None)
+
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._queue.clear()
+            self._pending.clear()
+            self._running.clear()
+            self._cache.clear()
+            self._bytes = 0
+            self._wakeup.notify_all()
+
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+
+#endregion
+#region - Workers
+
+
+    def _submit(self, key: ThumbKey, priority: int, callback) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            image = self._cache.get(key)  # Decoded since the caller's cache check
+            if image is None:
+                callbacks = self._pending.get(key)
+                if callbacks is not None:
+                    # Already queued or running: attach; a visible request re-queues a queued one ahead of prefetches
+                    if callback is not None:
+                        callbacks.append(callback)
+                    if priority == _VISIBLE and key not in self._running:
+                        heapq.heappush(self._queue, (priority, next(self._seq), self._generation, key, callbacks))
+                        self._wakeup.notify()
+                    return
+                callbacks = [callback] if callback is not None else []
+                self._pending[key] = callbacks
+                heapq.heappush(self._queue, (priority, next(self._seq), self._generation, key, callbacks))
+                self._wakeup.notify()
+                return
+        if callback is not None:
+            callback(image)
+
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+                priority, _seq, generation, key, callbacks = heapq.heappop(self._queue)
+                if self._pending.get(key) is not callbacks or key in self._running:
+                    continue  # Duplicate heap entry of a decode that already ran or is running
+                if priority == _PREFETCH and generation != self._generation and not callbacks:
+                    del self._pending[key]  # Stale prefetch nobody is waiting for
+                    continue
+                self._running.add(key)  # Stays in _pending so later requests attach to this decode
+            image = None
+            try:
+                with metrics.timer("thumbnail.decode"):
+                    image = load_thumbnail(key[0], key[3], key[4])
+                if image is not None:
+                    self._store(key, image)
+            finally:
+                with self._lock:
+                    self._running.discard(key)
+                    if self._pending.get(key) is callbacks:
+                        del self._pending[key]
+                    callbacks = list(callbacks)
+            for callback in callbacks:
+                try:
+                    callback(image)
+                except Exception:
+                    pass
+
+
+    def _store(self, key: ThumbKey, image: Image.Image) -> None:
+        cost = image.width * image.height * len(image.getbands())
+        with self._lock:
+            if self._closed or key in self._cache:
+                return
+            self._cache[key] = image
+            self._bytes += cost
+            while self._bytes > self.max_bytes and len(self._cache) > 1:
+                _old_key, old = self._cache.popitem(last=False)
+                self._bytes -= old.width * old.height * len(old.getbands())
+
+
+#endregion
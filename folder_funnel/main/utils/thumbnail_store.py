@@ -0,0 +1,307 @@
+"""
+Persistent on-disk thumbnail store.
+
+Encoded thumbnails (JPEG, or PNG when they have transparency) are stored under
+a key derived from the source path, its mtime and size, and the thumbnail
+parameters, so a changed file simply misses. Files live in 256 shard folders
+(`ab/abcdef...`), keeping directories small at any store size.
+
+Writes go through one background writer (atomic rename into place), and a
+background maintainer loads the size index at startup and evicts least recently
+used entries once the store grows past its cap. Reads refresh an entry's mtime,
+which is what orders eviction across restarts.
+
+Shared by video thumbnails, the history hover preview and the duplicate review
+dialog, so previews survive restarts without decoding images or running ffmpeg
+again.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import io
+import os
+import time
+import queue
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+# Third-party
+from PIL import Image
+
+# Custom
+from . import metrics
+
+
+#endregion
+#region - Keys
+
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_EVICT_TO = 0.9  # Evict down to this fraction of the cap, so eviction doesn't run on every write
+
+
+def store_key(path: str, mtime: float, size: int, width: int, extra: float, version: str) -> str:
+    """Content key of a thumbnail: the source file's identity plus what was rendered from it."""
+    payload = f"{version}|{path}|{mtime}|{size}|{width}|{extra}".encode("utf-8", errors="ignore")
+    return hashlib.md5(payload).hexdigest()
+
+
+def image_key(path: str, width: int, height: int) -> Optional[str]:
+    """Key of an image thumbnail fitted into (width, height), or None if path can't be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return store_key(path, st.st_mtime, st.st_size, width, height, version="img1")
+
+
+def encode_image(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    if image.mode in ("RGBA", "LA", "P"):
+        image.save(buffer, format="PNG", optimize=False)
+    else:
+        image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def decode_image(data: bytes) -> Optional[Image.Image]:
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+            return img.copy()
+    except Exception:
+        return None
+
+
+#endregion
+#region - ThumbnailStore
+
+
+class ThumbnailStore:
+    """Sharded folder of encoded thumbnails with a size cap and LRU eviction."""
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: Dict[str, Tuple[int, float]] = {}  # key -> (bytes, last used)
+        self._total = 0
+        self._pending: Dict[str, bytes] = {}  # Written soon; readable already
+        self._writes: 'queue.SimpleQueue' = queue.SimpleQueue()
+        self._evict = threading.Event()
+        self._closed = threading.Event()
+        os.makedirs(root, exist_ok=True)
+        self._writer = threading.Thread(target=self._write_loop, name="funnel-thumb-writer", daemon=True)
+        self._maintainer = threading.Thread(target=self._maintain_loop, name="funnel-thumb-evict", daemon=True)
+        self._writer.start()
+        self._maintainer.start()
+
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._pending.get(key)
+        if data is None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    data = f.read()
+            except OSError:
+                data = None
+        metrics.hit("thumbnail_store", data is not None)
+        if data is not None:
+            now = time.time()
+            with self._lock:
+                if key in self._index:
+                    self._index[key] = (self._index[key][0], now)
+            try:
+                os.utime(self._path(key), (now, now))
+            except OSError:
+                pass  # Still pending, or evicted meanwhile
+        return data
+
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store data under key; the file is written by the background writer."""
+        if self._closed.is_set() or not data:
+            return
+        with self._lock:
+            self._pending[key] = data
+        self._writes.put(key)
+
+
+    def get_image(self, key: str) -> Optional[Image.Image]:
+        data = self.get(key)
+        return decode_image(data) if data else None
+
+
+    def put_image(self, key: str, image: Image.Image) -> None:
+        try:
+            self.put(key, encode_image(image))
+        except Exception:
+            pass
+
+
+    def close(self) -> None:
+        """Finish queued writes and stop the background threads."""
+        self._closed.set()
+        self._writes.put(None)
+        self._evict.set()
+        self._writer.join(timeout=5.0)
+        self._maintainer.join(timeout=1.0)
+
+
+    @property
+    def nbytes(self) -> int:
+        return self._total
+
+
+#endregion
+#region - Background
+
+
+    def _write_loop(self) -> None:
+        while True:
+            key = self._writes.get()
+            if key is None:
+                return
+            with self._lock:
+                data = self._pending.get(key)
+            if data is None:
+                continue
+            path = self._path(key)
+            temp = f"{path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(temp, "wb") as f:
+                    f.write(data)
+                os.replace(temp, path)
+                written = True
+            except OSError:
+                written = False
+                try:
+                    os.remove(temp)
+                except OSError:
+                    pass
+            with self._lock:
+                if self._pending.get(key) is data:
+                    del self._pending[key]
+                if not written:
+                    continue
+                old = self._index.get(key)
+                self._index[key] = (len(data), time.time())
+                self._total += len(data) - (old[0] if old else 0)
+                over = self._total > self.max_bytes
+            if over:
+                self._evict.set()
+
+
+    def _maintain_loop(self) -> None:
+        self._load_index()
+        while not self._closed.is_set():
+            self._evict.wait()
+            self._evict.clear()
+            if not self._closed.is_set():
+                self._evict_lru()
+
+
+    def _load_index(self) -> None:
+        """Index what earlier runs stored (entries written since startup are already indexed)."""
+        found = {}
+        try:
+            shards = [entry.path for entry in os.scandir(self.root) if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return
+        for shard in shards:
+            if self._closed.is_set():
+                return
+            try:
+                with os.scandir(shard) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".tmp"):
+                            try:
+                                os.remove(entry.path)  # Left by a crash mid-write
+                            except OSError:
+                                pass
+                            continue
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        found[entry.name] = (st.st_size, st.st_mtime)
+            except OSError:
+                continue
+        with self._lock:
+            for key, value in found.items():
+                if key not in self._index:
+                    self._index[key] = value
+                    self._total += value[0]
+            over = self._total > self.max_bytes
+        if over:
+            self._evict.set()
+
+
+    def _evict_lru(self) -> None:
+        with self._lock:
+            if self._total <= self.max_bytes:
+                return
+            target = self.max_bytes * _EVICT_TO
+            victims = []
+            excess = self._total - target
+            for key, (size, _used) in sorted(self._index.items(), key=lambda item: item[1][1]):
+                if excess <= 0:
+                    break
+                victims.append(key)
+                excess -= size
+        with metrics.timer("thumbnail_store.evict") as t:
+            t.items = len(victims)
+            for key in victims:
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue
+                with self._lock:
+                    entry = self._index.pop(key, None)
+                    if entry is not None:
+                        self._total -= entry[0]
+
+
+#endregion
+#region - Module API
+
+
+_store: Optional[ThumbnailStore] = None
+_store_lock = threading.Lock()
+
+
+def open_store(root: str, max_bytes: int = DEFAULT_MAX_BYTES) -> ThumbnailStore:
+    """Open the process-wide thumbnail store (replacing any previous one)."""
+    global _store
+    close_store()
+    store = ThumbnailStore(root, max_bytes)
+    with _store_lock:
+        _store = store
+    return store
+
+
+def close_store() -> None:
+    global _store
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None:
+        store.close()
+
+
+def get_store() -> Optional[ThumbnailStore]:
+    """The open store, or None when previews are only cached in memory."""
+    return _store
+
+
+#endregion
@@ -0,0 +1,405 @@
+"""
+Send-to-trash deletes with an undo journal and a size/age purger.
+
+Deleted files are renamed into a trash folder on their own volume, so a delete
+costs one metadata operation and can be undone. On Linux and other XDG desktops
+this is the freedesktop.org trash (`~/.local/share/Trash` or `$topdir/.Trash-$uid`,
+with `.trashinfo` files, so file managers can restore them too). Elsewhere, or when
+those can't be used, a `.folder-funnel-trash` folder with the same layout is made
+at the highest writable folder of the volume. Only when none of these work is the
+file copied to the app-data trash.
+
+Every trashed file is appended to a compact JSONL journal (batch id, original
+path, trashed path, size, time). Batches can be restored, and the purger only
+deletes items this app put in the trash, oldest first, once they are past the age
+limit or the trash holds more than the size limit.
+
+All methods are thread-safe.
+"""
+
+
+#region - Imports
+
+
+# Standard
+import os
+import sys
+import json
+import time
+import shutil
+import threading
+from urllib.parse import quote
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+#endregion
+#region - Trash
+
+
+APP_TRASH_NAME = ".folder-funnel-trash"
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3  # 10 GB
+DEFAULT_MAX_AGE_DAYS = 30
+
+_USE_XDG = os.name == "posix" and sys.platform != "darwin"
+
+# Journal entry: {"batch", "path", "trashed", "size", "time"}
+Entry = Dict[str, object]
+
+
+def _mount_point(path: str) -> str:
+    path = os.path.abspath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def _usable_trash(trash_dir: str) -> bool:
+    """Create trash_dir/files and trash_dir/info if needed; True if both are writable."""
+    try:
+        for sub in ("files", "info"):
+            os.makedirs(os.path.join(trash_dir, sub), mode=0o700, exist_ok=True)
+        return os.access(os.path.join(trash_dir, "files"), os.W_OK) and os.access(os.path.join(trash_dir, "info"), os.W_OK)
+    except OSError:
+        return False
+
+
+class Trash:
+    """Trash folders per volume, a journal of what was trashed, and a purger."""
+    def __init__(self, journal_path: Optional[str] = None, fallback_dir: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        self.journal_path = journal_path
+        self.fallback_dir = fallback_dir  # App-data trash; only used across volumes (a copy)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self._lock = threading.RLock()
+        self._dirs: Dict[int, Tuple[str, Optional[str]]] = {}  # st_dev -> (trash dir, XDG topdir or None)
+        self._journal = None
+        self._purger: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        if journal_path:
+            os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+            self._journal = open(journal_path, "a", encoding="utf-8")
+
+
+    def close(self) -> None:
+        self.stop_purger()
+        with self._lock:
+            journal, self._journal = self._journal, None
+        if journal is not None:
+            journal.close()
+
+
+    @staticmethod
+    def new_batch() -> str:
+        return f"{time.time():.6f}-{os.getpid()}"
+
+
+#endregion
+#region - Trash folders
+
+
+    def _trash_dir_for(self, path: str, dev: int) -> Tuple[str, Optional[str]]:
+        """(trash dir, XDG topdir) on the same volume as path; topdir is None for the home trash and app trashes."""
+        with self._lock:
+            cached = self._dirs.get(dev)
+        if cached is not None:
+            return cached
+        found = None
+        if _USE_XDG:
+            home_trash = os.path.join(os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"), "Trash")
+            try:
+                home_dev = os.stat(os.path.dirname(home_trash)).st_dev
+            except OSError:
+                home_dev = None
+            if home_dev == dev and _usable_trash(home_trash):
+                found = (home_trash, None)
+            else:
+                topdir = _mount_point(path)
+                candidate = os.path.join(topdir, f".Trash-{os.getuid()}")
+                if _usable_trash(candidate):
+                    found = (candidate, topdir)
+        if found is None:
+            # Highest writable folder on the same volume
+            directory = os.path.dirname(os.path.abspath(path))
+            best = None
+            while True:
+                if os.access(directory, os.W_OK):
+                    best = directory
+                parent = os.path.dirname(directory)
+                try:
+                    if parent == directory or os.stat(parent).st_dev != dev:
+                        break
+                except OSError:
+                    break
+                directory = parent
+            if best is not None and _usable_trash(os.path.join(best, APP_TRASH_NAME)):
+                found = (os.path.join(best, APP_TRASH_NAME), None)
+        if found is None:
+            if not self.fallback_dir or not _usable_trash(self.fallback_dir):
+                raise OSError(f"No usable trash folder for {path}")
+            found = (self.fallback_dir, None)
+        with self._lock:
+            self._dirs[dev] = found
+        return found
+
+
+    def _reserve(self, trash_dir: str, name: str) -> Tuple[str, str]:
+        """Claim a free name in trash_dir by creating its .trashinfo exclusively; returns (name, info path)."""
+        stem, ext = os.path.splitext(name)
+        for n in range(1, 10000):
+            candidate = name if n == 1 else f"{stem}.{n}{ext}"
+            info_path = os.path.join(trash_dir, "info", candidate + ".trashinfo")
+            try:
+                fd = os.open(info_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            if not os.path.lexists(os.path.join(trash_dir, "files", candidate)):
+                return candidate, info_path
+            os.remove(info_path)
+        raise FileExistsError(f"No free trash name for {name}")
+
+
+#endregion
+#region - Send / Restore
+
+
+    def send(self, path: str, batch: Optional[str] = None) -> str:
+        """Move path into the trash; returns where it went."""
+        path = os.path.abspath(path)
+        st = os.lstat(path)
+        trash_dir, topdir = self._trash_dir_for(path, st.st_dev)
+        name, info_path = self._reserve(trash_dir, os.path.basename(path))
+        trashed = os.path.join(trash_dir, "files", name)
+        try:
+            shown = os.path.relpath(path, topdir) if topdir else path
+            with open(info_path, "w", encoding="utf-8") as f:
+                f.write(f"[Trash Info]\nPath={quote(shown)}\nDeletionDate={time.strftime('%Y-%m-%dT%H:%M:%S')}\n")
+            if trash_dir == self.fallback_dir:
+                shutil.move(path, trashed)
+            else:
+                os.rename(path, trashed)
+        except OSError:
+            try:
+                os.remove(info_path)
+            except OSError:
+                pass
+            raise
+        self._append({"batch": batch, "path": path, "trashed": trashed, "size": st.st_size, "time": time.time()})
+        return trashed
+
+
+    def restore(self, trashed: str, original: str, update_journal: bool = True) -> None:
+        """Put a trashed file back; refuses to overwrite a file now at the original path.
+
+        Bulk restores pass update_journal=False and call forget() once at the end.
+        """
+        self._restore_file(trashed, original)
+        if update_journal:
+            self._drop_entries({trashed})
+
+
+    def forget(self, trashed: Iterable[str]) -> None:
+        """Drop items from the journal (they were restored or removed)."""
+        self._drop_entries(trashed)
+
+
+    def _restore_file(self, trashed: str, original: str) -> None:
+        if os.path.lexists(original):
+            raise FileExistsError(f"Original path is taken: {original}")
+        os.makedirs(os.path.dirname(original), exist_ok=True)
+        try:
+            os.rename(trashed, original)
+        except OSError:
+            shutil.move(trashed, original)
+        self._remove_info(trashed)
+
+
+    def restore_batch(self, batch: str) -> Tuple[int, List[Tuple[str, str]]]:
+        """Restore every file of a batch; returns (restored, [(path, error)])."""
+        done = set()
+        errors = []
+        for entry in reversed(self.entries()):
+            if entry.get("batch") != batch:
+                continue
+            try:
+                self._restore_file(entry["trashed"], entry["path"])
+                done.add(entry["trashed"])
+            except OSError as e:
+                errors.append((entry["path"], str(e)))
+        self._drop_entries(done)
+        return len(done), errors
+
+
+    def _remove_info(self, trashed: str) -> None:
+        trash_dir = os.path.dirname(os.path.dirname(trashed))
+        try:
+            os.remove(os.path.join(trash_dir, "info", os.path.basename(trashed) + ".trashinfo"))
+        except OSError:
+            pass
+
+
+#endregion
+#region - Journal
+
+
+    def _append(self, entry: Entry) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self._journal.flush()
+
+
+    def entries(self) -> List[Entry]:
+        """Journal entries, oldest first (a torn last line from a crash is ignored)."""
+        if not self.journal_path:
+            return []
+        with self._lock:
+            try:
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    lines = f.readlines()
+            except OSError:
+                return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries
+
+
+    def _drop_entries(self, trashed: Iterable[str]) -> None:
+        """Rewrite the journal without the given items (restored, purged or gone)."""
+        trashed = set(trashed)
+        if not trashed or not self.journal_path:
+            return
+        with self._lock:
+            keep = [entry for entry in self.entries() if entry.get("trashed") not in trashed]
+            temp = self.journal_path + ".tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                for entry in keep:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            if self._journal is not None:
+                self._journal.close()
+            os.replace(temp, self.journal_path)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+
+#endregion
+#region - Purger
+
+
+    def purge(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """Permanently delete journaled items past the age limit, then the oldest until under the size limit.
+
+        Returns (files removed, bytes freed). Items already gone (emptied by the
+        user, restored elsewhere) just leave the journal.
+        """
+        now = time.time() if now is None else now
+        max_age = self.max_age_days * 86400
+        live = []
+        gone = set()
+        for entry in self.entries():
+            if os.path.lexists(entry["trashed"]):
+                live.append(entry)
+            else:
+                gone.add(entry["trashed"])
+        total = sum(int(entry.get("size") or 0) for entry in live)
+        removed = 0
+        freed = 0
+        for entry in live:  # Oldest first
+            if now - float(entry.get("time") or 0) <= max_age and total <= self.max_bytes:
+                break
+            try:
+                if os.path.isdir(entry["trashed"]) and not os.path.islink(entry["trashed"]):
+                    shutil.rmtree(entry["trashed"])
+                else:
+                    os.remove(entry["trashed"])
+            except OSError:
+                continue
+            self._remove_info(entry["trashed"])
+            gone.add(entry["trashed"])
+            size = int(entry.get("size") or 0)
+            total -= size
+            freed += size
+            removed += 1
+        self._drop_entries(gone)
+        return removed, freed
+
+
+    def start_purger(self, interval: float = 3600.0) -> None:
+        """Purge now and then every interval seconds on a daemon thread."""
+        if self._purger is not None:
+            return
+        self._stop.clear()
+
+        def _loop():
+            while True:
+                try:
+                    self.purge()
+                except Exception:
+                    pass
+                if self._stop.wait(interval):
+                    return
+
+        self._purger = threading.Thread(target=_loop, name="funnel-trash-purger", daemon=True)
+        self._purger.start()
+
+
+    def stop_purger(self) -> None:
+        self._stop.set()
+        purger, self._purger = self._purger, None
+        if purger is not None and purger is not threading.current_thread():
+            purger.join(timeout=2.0)
+
+
+#endregion
+#region - Module API
+
+
+_trash: Optional[Trash] = None
+_trash_lock = threading.Lock()
+
+
+def open_trash(journal_path: str, fallback_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+               max_age_days: float = DEFAULT_MAX_AGE_DAYS, purge_interval: float = 3600.0) -> Trash:
+    """Open the process-wide trash journal and start its purger (replacing any previous one)."""
+    global _trash
+    close_trash()
+    trash = Trash(journal_path, fallback_dir, max_bytes, max_age_days)
+    trash.start_purger(purge_interval)
+    with _trash_lock:
+        _trash = trash
+    return trash
+
+
+def close_trash() -> None:
+    global _trash
+    with _trash_lock:
+        trash, _trash = _trash, None
+    if trash is not None:
+        trash.close()
+
+
+def get_trash() -> Trash:
+    """The open trash, or a journal-less one (files still go to the trash, batches can't be undone)."""
+    global _trash
+    with _trash_lock:
+        if _trash is None:
+            _trash = Trash()
+        return _trash
+
+
+def remove(path: str, use_trash: bool = True, batch: Optional[str] = None) -> Optional[str]:
+    """Delete path: to the trash (returns where it went) or permanently (returns None)."""
+    if use_trash:
+        return get_trash().send(path, batch)
+    os.remove(path)
+    return None
+
+
+#endregion
@@ -1,11 +1,16 @@
 #region - Imports
 
 # Standard
-import hashlib
 import os
+import time
 import shutil
+import threading
 import subprocess
-from typing import Optional, TYPE_CHECKING
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+# Custom
+from . import thumbnail_store
 
 if TYPE_CHECKING:
     from app import Main
@@ -40,8 +45,7 @@ def _thumb_key(
     timestamp_s: float,
     version: str = "v2",
 ) -> str:
-    payload = f"{version}|{video_path}|{mtime}|{size}|{width}|{timestamp_s}".encode("utf-8", errors="ignore")
-    return hashlib.md5(payload).hexdigest()
+    return thumbnail_store.store_key(video_path, mtime, size, width, timestamp_s, version)
 
 
 def _cache_get(app: 'Main', key: str) -> Optional[bytes]:
@@ -91,28 +95,62 @@ def _stat_key(video_path: str, width: int, timestamp_s: float) -> Optional[str]:
         return None
 
 
+def get_cached_thumbnail(app: 'Main', video_path: str, width: int = 400, timestamp_s: float = 1.0) -> Optional[bytes]:
+    """JPEG bytes from the memory cache or thumbnail store; never runs ffmpeg."""
+    key = _stat_key(video_path, width=width, timestamp_s=timestamp_s)
+    if not key:
+        return None
+    cached = _cache_get(app, key)
+    if cached:
+        return bytes(cached)
+    store = thumbnail_store.get_store()
+    stored = store.get(key) if store else None
+    if stored:
+        _cache_set(app, key, stored)
+    return stored
+
+
+def _run_ffmpeg(cmd: List[str], timeout_s: float, cancelled: Optional[Callable[[], bool]]) -> Optional[bytes]:
+    """Run ffmpeg and return its stdout; the process is killed on timeout or once cancelled() is true."""
+    creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, creationflags=creationflags)
+    deadline = time.monotonic() + timeout_s
+    while True:
+        try:
+            data, _ = proc.communicate(timeout=0.1)
+            return data
+        except subprocess.TimeoutExpired:
+            if time.monotonic() > deadline or (cancelled is not None and cancelled()):
+                proc.kill()
+                proc.communicate()
+                return None
+
+
 def get_video_thumbnail_jpeg_bytes(
     app: 'Main',
     video_path: str,
     width: int = 400,
     timestamp_s: float = 1.0,
     timeout_s: float = 15.0,
+    cancelled: Optional[Callable[[], bool]] = None,
 ) -> Optional[bytes]:
-    """Return JPEG thumbnail bytes for a video file, cached in memory.
+    """Return JPEG thumbnail bytes for a video file, cached in memory and in the thumbnail store.
 
-    Uses ffmpeg if available. Returns None on failure.
+    Uses ffmpeg if available; cancelled() is polled while it runs. Returns None on failure.
+    On the UI thread use request_thumbnail instead, which runs ffmpeg on the shared pool.
     """
     if not video_path or not os.path.isfile(video_path):
         return None
     ffmpeg = _ffmpeg_path(app)
     if not ffmpeg:
         return None
+    stored = get_cached_thumbnail(app, video_path, width=width, timestamp_s=timestamp_s)
+    if stored:
+        return stored
     key = _stat_key(video_path, width=width, timestamp_s=timestamp_s)
     if not key:
         return None
-    cached = _cache_get(app, key)
-    if cached:
-        return bytes(cached)
+    store = thumbnail_store.get_store()
     # Use a small offset so we don't commonly hit a black first frame.
     ts = max(0.0, float(timestamp_s))
     ts_str = f"{ts:.3f}"
@@ -141,16 +179,167 @@ def get_video_thumbnail_jpeg_bytes(
         "pipe:1",
     ]
     try:
-        creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
-        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False, timeout=timeout_s, creationflags=creationflags)
-        data = proc.stdout or b""
+        data = _run_ffmpeg(cmd, timeout_s, cancelled) or b""
     except Exception:
         return None
     # Basic sanity check: JPEG starts with 0xFFD8
     if not data or not data.startswith(b"\xff\xd8"):
         return None
     _cache_set(app, key, data)
+    if store:
+        store.put(key, data)
     return data
 
 
 #endregion
+
+
+#region - Worker Pool
+
+
+class _Job:
+    __slots__ = ("path", "callbacks", "hover", "cancelled", "preempted")
+
+    def __init__(self, path: str, hover: bool):
+        self.path = path
+        self.callbacks: List[Callable[[Optional[bytes]], None]] = []
+        self.hover = hover
+        self.cancelled = False
+        self.preempted = False  # Background job stopped for a hover; goes back on the queue
+
+
+class VideoThumbWorker:
+    """Bounded ffmpeg pool for video thumbnails.
+
+    Hover requests go on a LIFO stack, so the latest hover is served first, and only the newest
+    few are kept: sweeping the mouse over a list of videos runs a couple of ffmpeg processes, not
+    one per row. A running hover job is killed once newer hovers are waiting for it, and each file
+    is only ever in one job. Background jobs (prefetch) run only while no hover is waiting; one
+    stopped for a hover is queued again at the front of the background queue.
+    """
+    def __init__(self, app: 'Main', workers: int = 2, max_hover_jobs: int = 4):
+        self.app = app
+        self.max_hover_jobs = max(1, max_hover_jobs)
+        self._lock = threading.Condition()
+        self._hover: List[_Job] = []  # Stack: newest last
+        self._background: deque = deque()
+        self._jobs: Dict[str, _Job] = {}  # path -> queued or running job
+        self._latest = ""  # Most recent hover request
+        self._closed = False
+        self._threads = [threading.Thread(target=self._work, name=f"funnel-ffmpeg-{n}", daemon=True) for n in range(max(1, workers))]
+        for thread in self._threads:
+            thread.start()
+
+
+    def request(self, video_path: str, callback: Callable[[Optional[bytes]], None]) -> None:
+        """Hover request: callback(jpeg bytes or None) is called on a worker thread, unless the job goes stale first."""
+        with self._lock:
+            self._latest = video_path
+            job = self._jobs.get(video_path)
+            if job is None:
+                job = _Job(video_path, hover=True)
+                self._jobs[video_path] = job
+            elif job in self._hover:
+                self._hover.remove(job)
+            elif job not in self._background:
+                job.hover = True  # Already running; a hover no longer lets newer hovers cancel it
+                job.callbacks.append(callback)
+                return
+            else:
+                self._background.remove(job)
+                job.hover = True
+            job.callbacks.append(callback)
+            self._hover.append(job)
+            while len(self._hover) > self.max_hover_jobs:
+                stale = self._hover.pop(0)
+                stale.cancelled = True
+                self._jobs.pop(stale.path, None)
+            self._lock.notify()
+
+
+    def prefetch(self, video_paths: Iterable[str]) -> None:
+        """Queue thumbnails at low priority (no callback); files already cached are skipped by the job."""
+        with self._lock:
+            for path in video_paths:
+                if path not in self._jobs:
+                    job = _Job(path, hover=False)
+                    self._jobs[path] = job
+                    self._background.append(job)
+            self._lock.notify_all()
+
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for job in self._jobs.values():
+                job.cancelled = True
+            self._hover.clear()
+            self._background.clear()
+            self._jobs.clear()
+            self._lock.notify_all()
+
+
+    def _is_stale(self, job: _Job) -> bool:
+        with self._lock:
+            if job.cancelled or self._closed:
+                return True
+            if job.hover:
+                return bool(self._hover) and job.path != self._latest
+            job.preempted = bool(self._hover)  # Background work yields to any waiting hover
+            return job.preempted
+
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                while not self._hover and not self._background and not self._closed:
+                    self._lock.wait()
+                if self._closed:
+                    return
+                job = self._hover.pop() if self._hover else self._background.popleft()
+            data = None
+            try:
+                data = get_video_thumbnail_jpeg_bytes(self.app, job.path, cancelled=lambda: self._is_stale(job))
+            except Exception:
+                data = None
+            with self._lock:
+                if job.preempted and not job.hover and data is None and not job.cancelled and not self._closed:
+                    job.preempted = False
+                    self._background.appendleft(job)  # Still in _jobs: resumes once hovers are served
+                    continue
+                if self._jobs.get(job.path) is job:
+                    del self._jobs[job.path]
+                callbacks = list(job.callbacks)
+            for callback in callbacks:
+                try:
+                    callback(data)
+                except Exception:
+                    pass
+
+
+def _worker(app: 'Main') -> VideoThumbWorker:
+    worker = getattr(app, "_video_thumb_worker", None)
+    if not isinstance(worker, VideoThumbWorker):
+        worker = VideoThumbWorker(app)
+        app._video_thumb_worker = worker
+    return worker
+
+
+def request_thumbnail(app: 'Main', video_path: str, callback: Callable[[Optional[bytes]], None]) -> None:
+    """Generate a hover thumbnail on the shared pool (latest request first)."""
+    _worker(app).request(video_path, callback)
+
+
+def prefetch_thumbnails(app: 'Main', video_paths: Iterable[str]) -> None:
+    """Generate thumbnails in the background while nothing is hovered."""
+    _worker(app).prefetch(video_paths)
+
+
+def shutdown_worker(app: 'Main') -> None:
+    worker = getattr(app, "_video_thumb_worker", None)
+    if isinstance(worker, VideoThumbWorker):
+        worker.close()
+        app._video_thumb_worker = None
+
+
+#endregion